@@ -0,0 +1 @@
+"""Benchmarks for georss-client library."""
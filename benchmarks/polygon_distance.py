@@ -0,0 +1,87 @@
+"""Benchmark the distance from home coordinates to large polygons.
+
+Compares the distance to the closest vertex, calculated with one `haversine`
+call per vertex, with the exact distance of the geometry engine, with and
+without NumPy. The engine prepares each polygon once, so both the first and
+repeated calculations are measured.
+
+Run with: python -m benchmarks.polygon_distance
+"""
+
+import math
+import sys
+import timeit
+
+from haversine import haversine
+
+from georss_client import geometry_engine
+from georss_client.geometry_engine import PreparedPolygon, prepare_polygon
+from georss_client.xml_parser.geometry import Polygon
+
+HOME_COORDINATES = (-31.0, 150.0)
+POLYGON_SIZES = (10, 100, 1000, 10000)
+
+
+def _polygon(number_of_points: int) -> Polygon:
+    """Create a polygon with the given number of points."""
+    coordinates = []
+    for i in range(number_of_points):
+        angle = 2 * math.pi * i / number_of_points
+        coordinates.extend((-30.0 + math.sin(angle), 151.0 + math.cos(angle)))
+    return Polygon.from_coordinates(coordinates)
+
+
+def _vertex_distance(home_coordinates, polygon: Polygon) -> float:
+    """Calculate the distance to the closest vertex, one haversine per vertex."""
+    distance = float("inf")
+    for point in polygon.points:
+        distance = min(
+            distance, haversine((point.latitude, point.longitude), home_coordinates)
+        )
+    return distance
+
+
+def _prepared_distance(home_coordinates, polygon: Polygon) -> float:
+    """Prepare the polygon and calculate the distance."""
+    return PreparedPolygon(polygon).distance(*home_coordinates)
+
+
+def _cached_distance(home_coordinates, polygon: Polygon) -> float:
+    """Calculate the distance with the cached prepared polygon."""
+    return prepare_polygon(polygon).distance(*home_coordinates)
+
+
+def _time(function, polygon: Polygon) -> float:
+    """Return the time per call in microseconds."""
+    number, total = timeit.Timer(
+        lambda: function(HOME_COORDINATES, polygon)
+    ).autorange()
+    return total / number * 1e6
+
+
+def main():
+    """Run the benchmark."""
+    numpy = geometry_engine.np
+    sys.stdout.write(
+        f"{'points':>8} {'vertices [us]':>14} {'prepare [us]':>14} "
+        f"{'python [us]':>12} {'numpy [us]':>12}\n"
+    )
+    for size in POLYGON_SIZES:
+        polygon = _polygon(size)
+        vertices = _time(_vertex_distance, polygon)
+        prepare = _time(_prepared_distance, polygon)
+        geometry_engine.np = None
+        python = _time(_cached_distance, polygon)
+        geometry_engine.np = numpy
+        vectorized = (
+            f"{_time(_cached_distance, polygon):12.1f}"
+            if numpy is not None
+            else f"{'n/a':>12}"
+        )
+        sys.stdout.write(
+            f"{size:>8} {vertices:14.1f} {prepare:14.1f} {python:12.1f} {vectorized}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Asynchronous GeoRSS Feed.
+
+Requires the optional `aiohttp` dependency (`pip install georss-client[async]`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+import logging
+
+import aiohttp
+
+from .consts import UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
+from .feed import GeoRssFeed
+from .response_validators import ResponseValidators
+from .xml_parser import STREAMING_CHUNK_SIZE, Feed
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REQUEST_TIMEOUT = 10
+
+
+class AsyncGeoRssFeed(GeoRssFeed):
+    """Asynchronous GeoRSS feed base class.
+
+    Fetching is non-blocking, while parsing, filtering and the creation of
+    entries is shared with `GeoRssFeed`. Concrete feeds can reuse their
+    synchronous implementation by inheriting from both classes, for example
+    `class MyAsyncFeed(AsyncGeoRssFeed, MyFeed)`.
+    """
+
+    def __init__(
+        self,
+        *args,
+        websession: aiohttp.ClientSession | None = None,
+        parse_in_executor: bool = False,
+        **kwargs,
+    ):
+        """Initialise this service.
+
+        All other arguments are passed on unchanged to the next class, so
+        that a concrete feed combined with this class keeps its own
+        constructor arguments, for example a fixed URL. Without a concrete
+        feed these are the arguments of `GeoRssFeed`.
+
+        A `websession` can be shared by many feeds. If no session is provided,
+        the feed creates and owns one. If `parse_in_executor` is enabled,
+        parsing runs in the default executor of the event loop so that large
+        feeds do not block the loop. Streaming is not supported, but the
+        `max_body_size` is enforced while the body is downloaded.
+        """
+        super().__init__(*args, **kwargs)
+        if self._stream:
+            raise ValueError("stream is not supported by asynchronous feeds")
+        self._websession: aiohttp.ClientSession | None = websession
+        self._owns_websession: bool = websession is None
+        self._parse_in_executor: bool = parse_in_executor
+
+    @property
+    def websession(self) -> aiohttp.ClientSession:
+        """Return the session used to fetch this feed."""
+        if self._websession is None:
+            self._websession = aiohttp.ClientSession()
+        return self._websession
+
+    async def async_close(self):
+        """Close the sessions that are owned by this feed."""
+        if self._owns_websession and self._websession is not None:
+            await self._websession.close()
+            self._websession = None
+        self.close()
+
+    async def update(self):
+        """Update from external source and return filtered entries."""
+        status, data = await self._fetch(self._feed_validators)
+        return self._process_feed_data(status, data)
+
+    async def update_subscriptions(self):
+        """Update from external source once and filter for each subscription."""
+        status, data = await self._fetch(self._subscription_validators)
+        return self._process_subscriptions(status, data)
+
+    async def _fetch(self, validators: ResponseValidators) -> tuple[str, Feed | None]:
+        """Fetch GeoRSS data from external source, unless unchanged."""
+        try:
+            async with self.websession.get(
+                self._url,
+                headers=validators.conditional_headers(),
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT),
+            ) as response:
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    _LOGGER.debug("Feed %s has not been modified", self._url)
+                    self._store_cache_lifetime(response)
+                    return UPDATE_OK_NO_DATA, None
+                if not response.ok:
+                    _LOGGER.warning(
+                        "Fetching data from %s failed with status %s",
+                        self._url,
+                        response.status,
+                    )
+                    return UPDATE_ERROR, None
+                self._store_cache_lifetime(response)
+                if response.content_length is not None and self._exceeds_max_body_size(
+                    response.content_length
+                ):
+                    return UPDATE_ERROR, None
+                # Raw bytes let the XML parser decode the body, or determine
+                # the encoding itself, including any byte order mark.
+                encoding = self._body_encoding(response)
+                chunks: list[bytes] = []
+                body_size = 0
+                async for chunk in response.content.iter_chunked(STREAMING_CHUNK_SIZE):
+                    body_size += len(chunk)
+                    if self._exceeds_max_body_size(body_size):
+                        return UPDATE_ERROR, None
+                    chunks.append(chunk)
+                content = b"".join(chunks)
+                self._record_transfer(response, body_size)
+        except (aiohttp.ClientError, TimeoutError) as client_ex:
+            _LOGGER.warning(
+                "Fetching data from %s failed with %s", self._url, client_ex
+            )
+            return UPDATE_ERROR, None
+        digest = self._body_digest(content)
+        if self._body_unchanged(validators, digest):
+            validators.store(response, digest)
+            return UPDATE_OK_NO_DATA, None
+        if self._parse_in_executor:
+            feed_data = await asyncio.get_running_loop().run_in_executor(
+                None, self._parse, content, encoding
+            )
+        else:
+            feed_data = self._parse(content, encoding)
+        validators.store(response, digest)
+        return UPDATE_OK, feed_data
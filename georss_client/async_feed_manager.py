@@ -0,0 +1,78 @@
+"""Base class for the asynchronous feed manager.
+
+Requires the optional `aiohttp` dependency (`pip install georss-client[async]`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import time
+
+from .async_feed import AsyncGeoRssFeed
+from .consts import UPDATE_ERROR
+from .feed_manager import FeedManagerBase, FeedManagerUpdate
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 50
+
+
+class AsyncFeedManagerBase(FeedManagerBase):
+    """Generic asynchronous feed manager.
+
+    The callbacks are plain functions and are called from the event loop
+    in the same order as in `FeedManagerBase`.
+    """
+
+    _feed: AsyncGeoRssFeed
+
+    async def update(self):
+        """Update the feed and then update connected entities."""
+        status, feed_entries = await self._feed.update()
+        self.process_update(status, feed_entries)
+
+
+async def _fetch(
+    feed_manager: AsyncFeedManagerBase, semaphore: asyncio.Semaphore
+) -> tuple[str, list | None, float]:
+    """Update the feed of the feed manager and measure the duration."""
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            status, feed_entries = await feed_manager.feed.update()
+        except Exception:
+            _LOGGER.exception("Updating %s failed", feed_manager.feed)
+            status, feed_entries = UPDATE_ERROR, None
+        return status, feed_entries, time.perf_counter() - start
+
+
+async def update_feed_managers(
+    feed_managers: Iterable[AsyncFeedManagerBase],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[FeedManagerUpdate]:
+    """Update many feed managers, with at most `max_concurrency` at a time.
+
+    A feed that fails to update is logged and counts as an error, without
+    affecting the other feeds. Once all feeds are fetched, the callbacks of
+    the feed managers are called one feed manager at a time in the given
+    order.
+    """
+    feed_managers = list(feed_managers)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    fetched = await asyncio.gather(
+        *(_fetch(feed_manager, semaphore) for feed_manager in feed_managers)
+    )
+    results: list[FeedManagerUpdate] = []
+    for feed_manager, (status, feed_entries, fetch_duration) in zip(
+        feed_managers, fetched, strict=True
+    ):
+        start = time.perf_counter()
+        feed_manager.process_update(status, feed_entries)
+        results.append(
+            FeedManagerUpdate(
+                feed_manager, status, fetch_duration, time.perf_counter() - start
+            )
+        )
+    return results
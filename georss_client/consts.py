@@ -10,6 +10,18 @@ from typing import Final
 ATTR_ATTRIBUTION: Final = "attribution"
 CUSTOM_ATTRIBUTE: Final = "custom_attribute"
 
+HEADER_ACCEPT_ENCODING: Final = "Accept-Encoding"
+HEADER_CACHE_CONTROL: Final = "Cache-Control"
+HEADER_CONTENT_ENCODING: Final = "Content-Encoding"
+HEADER_CONTENT_LENGTH: Final = "Content-Length"
+HEADER_CONTENT_TYPE: Final = "Content-Type"
+HEADER_DATE: Final = "Date"
+HEADER_ETAG: Final = "ETag"
+HEADER_EXPIRES: Final = "Expires"
+HEADER_IF_MODIFIED_SINCE: Final = "If-Modified-Since"
+HEADER_IF_NONE_MATCH: Final = "If-None-Match"
+HEADER_LAST_MODIFIED: Final = "Last-Modified"
+
 XML_ATTR_HREF: Final = "@href"
 XML_ATTR_TERM: Final = "@term"
 
@@ -2,19 +2,52 @@
 
 from __future__ import annotations
 
-import codecs
-from datetime import datetime
+from collections.abc import Collection, Hashable, Mapping
+from datetime import UTC, datetime
+from email.message import Message
+from email.utils import parsedate_to_datetime
+import hashlib
+from http import HTTPStatus
 import logging
 
 import requests
+from urllib3.response import HTTPResponse
 
-from .consts import ATTR_ATTRIBUTION, UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
-from .xml_parser import Feed, XmlParser
+from .consts import (
+    ATTR_ATTRIBUTION,
+    HEADER_ACCEPT_ENCODING,
+    HEADER_CACHE_CONTROL,
+    HEADER_CONTENT_ENCODING,
+    HEADER_CONTENT_LENGTH,
+    HEADER_CONTENT_TYPE,
+    HEADER_DATE,
+    HEADER_EXPIRES,
+    UPDATE_ERROR,
+    UPDATE_OK,
+    UPDATE_OK_NO_DATA,
+    XML_TAG_CATEGORY,
+)
+from .feed_entry import FeedEntry
+from .feed_subscription import FeedSubscription
+from .geo_rss_distance_helper import GeoRssDistanceHelper
+from .response_validators import ResponseValidators
+from .session import ACCEPT_ENCODING, create_session
+from .transfer_statistics import TransferStatistics
+from .xml_parser import STREAMING_CHUNK_SIZE, Feed, XmlParser, shared_parser
 from .xml_parser.feed_item import FeedItem
+from .xml_parser.process_parser import ProcessPoolParser
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _content_length(response) -> int | None:
+    """Return the content length of the response, if provided."""
+    content_length = response.headers.get(HEADER_CONTENT_LENGTH)
+    if isinstance(content_length, str) and content_length.isdigit():
+        return int(content_length)
+    return None
+
+
 class GeoRssFeed:
     """GeoRSS feed base class."""
 
@@ -24,14 +57,46 @@ class GeoRssFeed:
         url: str,
         filter_radius: float | None = None,
         filter_categories: list[str] | None = None,
+        session: requests.Session | None = None,
+        *,
+        process_parser: ProcessPoolParser | None = None,
+        stream: bool = False,
+        max_body_size: int | None = None,
+        max_items: int | None = None,
     ):
-        """Initialise this service."""
+        """Initialise this service.
+
+        A `session` can be shared by many feeds to reuse connections to the
+        same hosts. If no session is provided, the feed creates and owns one.
+        With a `process_parser` the feed is parsed in a worker process.
+
+        With `stream` enabled, the feed is parsed while it is downloaded,
+        instead of in a worker process. The update fails if the body exceeds
+        `max_body_size` bytes, and only the first `max_items` items are
+        parsed. When streaming, the download stops at either limit.
+        """
         self._home_coordinates: tuple[float, float] = home_coordinates
         self._filter_radius: float | None = filter_radius
         self._filter_categories: list[str] | None = filter_categories
         self._url: str = url
-        self._request = requests.Request(method="GET", url=url).prepare()
+        self._request = requests.Request(
+            method="GET", url=url, headers={HEADER_ACCEPT_ENCODING: ACCEPT_ENCODING}
+        ).prepare()
         self._last_timestamp: datetime | None = None
+        # The last responses of updates of the feed and of its subscriptions
+        # are kept apart, so that each receives the data of a changed body.
+        self._feed_validators: ResponseValidators = ResponseValidators()
+        self._subscription_validators: ResponseValidators = ResponseValidators()
+        self._cache_lifetime: float | None = None
+        self._ttl: int | None = None
+        self._session: requests.Session | None = session
+        self._owns_session: bool = session is None
+        self._process_parser: ProcessPoolParser | None = process_parser
+        self._stream: bool = stream
+        self._max_body_size: int | None = max_body_size
+        self._max_items: int | None = max_items
+        self._subscriptions: dict[Hashable, FeedSubscription] = {}
+        self._transfer_statistics: TransferStatistics = TransferStatistics()
 
     def __repr__(self):
         """Return string representation of this feed."""
@@ -48,11 +113,41 @@ class GeoRssFeed:
     def _additional_namespaces(self):
         """Provide additional namespaces, relevant for this feed."""
 
+    def _fields(self) -> Collection[str] | None:
+        """Provide the fields of feed items used by this feed.
+
+        Other fields are skipped while parsing, apart from the identifiers,
+        titles, dates and geometries of the feed items, and the categories
+        if filtered by category. None parses all fields.
+        """
+        return None
+
+    def _parsed_fields(self) -> Collection[str] | None:
+        """Return the fields of feed items to parse, including for filtering."""
+        fields = self._fields()
+        if fields is None:
+            return None
+        if self._filter_categories or any(
+            subscription.filter_categories
+            for subscription in self._subscriptions.values()
+        ):
+            return {*fields, XML_TAG_CATEGORY}
+        return fields
+
+    def _xml_parser(self) -> XmlParser:
+        """Return the XML parser shared by all feeds of this type."""
+        return shared_parser(self._additional_namespaces(), self._parsed_fields())
+
     def update(self):
         """Update from external source and return filtered entries."""
-        status, data = self._fetch()
+        status, data = self._fetch(self._feed_validators)
+        return self._process_feed_data(status, data)
+
+    def _process_feed_data(self, status: str, data: Feed | None):
+        """Turn fetched feed data into filtered entries."""
         if status == UPDATE_OK:
             if data:
+                self._store_ttl(data)
                 global_data = self._extract_from_feed(data)
                 # Extract data from feed entries.
                 entries: list = [
@@ -69,44 +164,379 @@ class GeoRssFeed:
             return UPDATE_OK_NO_DATA, None
         # Error happened while fetching the feed.
         self._last_timestamp = None
+        # Make sure that the next request fetches the full feed again.
+        self._forget_last_response()
+        self._cache_lifetime = None
         return UPDATE_ERROR, None
 
-    def _fetch(self) -> tuple[str, Feed | None]:
-        """Fetch GeoRSS data from external source."""
+    @property
+    def subscriptions(self) -> Mapping[Hashable, FeedSubscription]:
+        """Return the subscriptions of this feed by key."""
+        return self._subscriptions
+
+    def subscribe(
+        self,
+        key: Hashable,
+        home_coordinates: tuple[float, float],
+        filter_radius: float | None = None,
+        filter_categories: list[str] | None = None,
+    ) -> FeedSubscription:
+        """Add or replace the subscription with the key."""
+        subscription = FeedSubscription(
+            home_coordinates, filter_radius, filter_categories
+        )
+        self._subscriptions[key] = subscription
+        # The next update must provide data for the new subscription.
+        self._subscription_validators.forget()
+        return subscription
+
+    def unsubscribe(self, key: Hashable):
+        """Remove the subscription with the key, if present."""
+        self._subscriptions.pop(key, None)
+
+    def update_subscriptions(self) -> dict[Hashable, tuple[str, list | None]]:
+        """Update from external source once and filter for each subscription.
+
+        Returns the status and filtered entries for each subscription key.
+        """
+        status, data = self._fetch(self._subscription_validators)
+        return self._process_subscriptions(status, data)
+
+    def _process_subscriptions(
+        self, status: str, data: Feed | None
+    ) -> dict[Hashable, tuple[str, list | None]]:
+        """Turn fetched feed data into filtered entries for each subscription."""
+        if status != UPDATE_OK or not data:
+            status, _ = self._process_feed_data(status, None)
+            if status == UPDATE_ERROR:
+                for subscription in self._subscriptions.values():
+                    subscription.record_last_timestamp(None)
+            return dict.fromkeys(self._subscriptions, (status, None))
+        self._store_ttl(data)
+        global_data = self._extract_from_feed(data)
+        # Extract the feed items once; their geometries are cached and
+        # shared by the entries of all subscriptions.
+        rss_entries = data.entries
+        results: dict[Hashable, tuple[str, list | None]] = {}
+        for key, subscription in self._subscriptions.items():
+            home_coordinates = subscription.home_coordinates
+            entries: list = [
+                self._new_entry(home_coordinates, rss_entry, global_data)
+                for rss_entry in rss_entries
+            ]
+            filtered_entries = self._apply_filters(
+                entries,
+                home_coordinates,
+                subscription.filter_radius,
+                subscription.filter_categories,
+            )
+            subscription.record_last_timestamp(
+                self._extract_last_timestamp(filtered_entries)
+            )
+            results[key] = (UPDATE_OK, filtered_entries)
+        return results
+
+    def _fetch(self, validators: ResponseValidators) -> tuple[str, Feed | None]:
+        """Fetch GeoRSS data from external source, unless unchanged."""
         try:
-            with requests.Session() as session:
-                response = session.send(self._request, timeout=10)
-                if response.ok:
-                    self._pre_process_response(response)
-                    parser = XmlParser(self._additional_namespaces())
-                    feed_data = parser.parse(response.text)
-                    self.parser = parser
-                    self.feed_data = feed_data
-                    return UPDATE_OK, feed_data
-                _LOGGER.warning(
-                    "Fetching data from %s failed with status %s",
-                    self._request.url,
-                    response.status_code,
+            response = self.session.send(
+                self._conditional_request(validators), timeout=10, stream=self._stream
+            )
+        except requests.exceptions.RequestException as request_ex:
+            _LOGGER.warning(
+                "Fetching data from %s failed with %s", self._request.url, request_ex
+            )
+            return UPDATE_ERROR, None
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            _LOGGER.debug("Feed %s has not been modified", self._request.url)
+            self._store_cache_lifetime(response)
+            response.close()
+            return UPDATE_OK_NO_DATA, None
+        if response.ok:
+            self._store_cache_lifetime(response)
+            if self._stream:
+                return self._parse_stream(
+                    response, validators, self._body_encoding(response)
                 )
+            self._record_transfer(response, len(response.content))
+            if self._exceeds_max_body_size(len(response.content)):
                 return UPDATE_ERROR, None
+            digest = self._body_digest(response.content)
+            if self._body_unchanged(validators, digest):
+                validators.store(response, digest)
+                return UPDATE_OK_NO_DATA, None
+            encoding = self._body_encoding(response)
+            # Raw bytes let the XML parser decode the body, or determine the
+            # encoding itself, without decoding the whole body first.
+            feed_data = self._parse(response.content, encoding)
+            validators.store(response, digest)
+            return UPDATE_OK, feed_data
+        _LOGGER.warning(
+            "Fetching data from %s failed with status %s",
+            self._request.url,
+            response.status_code,
+        )
+        response.close()
+        return UPDATE_ERROR, None
+
+    def _body_encoding(self, response) -> str | None:
+        """Pre-process the response and return the encoding of its body.
+
+        The encoding set by `_pre_process_response` takes precedence over the
+        charset of the `Content-Type` header. Without either, the XML parser
+        determines the encoding from the document itself.
+        """
+        header_encoding = getattr(response, "encoding", None)
+        self._pre_process_response(response)
+        encoding = getattr(response, "encoding", None)
+        if isinstance(encoding, str) and encoding != header_encoding:
+            return encoding
+        return self._content_type_charset(response)
+
+    @staticmethod
+    def _content_type_charset(response) -> str | None:
+        """Return the charset of the Content-Type header, if provided."""
+        content_type = response.headers.get(HEADER_CONTENT_TYPE)
+        if not isinstance(content_type, str):
+            return None
+        message = Message()
+        message[HEADER_CONTENT_TYPE] = content_type
+        return message.get_content_charset()
+
+    def _parse(self, xml: str | bytes, encoding: str | None = None) -> Feed | None:
+        """Parse the fetched XML document, with the encoding if known."""
+        if self._process_parser is not None:
+            feed_data = self._process_parser.parse(
+                xml,
+                self._additional_namespaces(),
+                fields=self._parsed_fields(),
+                encoding=encoding,
+                max_items=self._max_items,
+            )
+            self.parser = None
+            self.feed_data = feed_data
+            return feed_data
+        parser = self._xml_parser()
+        feed_data = parser.parse(xml, encoding=encoding, max_items=self._max_items)
+        self.parser = parser
+        self.feed_data = feed_data
+        return feed_data
+
+    def _parse_stream(
+        self,
+        response: requests.Response,
+        validators: ResponseValidators,
+        encoding: str | None = None,
+    ) -> tuple[str, Feed | None]:
+        """Parse the XML document while it is downloaded."""
+        parser = self._xml_parser()
+        streaming_parser = parser.streaming_parser(
+            retain_items=True, max_items=self._max_items, encoding=encoding
+        )
+        digest = hashlib.blake2b(digest_size=16)
+        body_size = 0
+        try:
+            content_length = _content_length(response)
+            if content_length is not None and self._exceeds_max_body_size(
+                content_length
+            ):
+                return UPDATE_ERROR, None
+            for chunk in response.iter_content(STREAMING_CHUNK_SIZE):
+                body_size += len(chunk)
+                if self._exceeds_max_body_size(body_size):
+                    return UPDATE_ERROR, None
+                digest.update(chunk)
+                streaming_parser.feed(chunk)
+                if streaming_parser.max_items_reached:
+                    _LOGGER.debug(
+                        "Stopped reading feed %s after %d items",
+                        self._url,
+                        streaming_parser.item_count,
+                    )
+                    feed_data = streaming_parser.abort()
+                    break
+            else:
+                feed_data = streaming_parser.close()
+            self._record_transfer(response, body_size)
         except requests.exceptions.RequestException as request_ex:
             _LOGGER.warning(
                 "Fetching data from %s failed with %s", self._request.url, request_ex
             )
             return UPDATE_ERROR, None
+        finally:
+            response.close()
+        # The digest only covers the body up to the last item read, which
+        # is enough to tell if these items have changed. It is only stored
+        # now that the body has been parsed successfully.
+        body_digest = digest.digest()
+        unchanged = self._body_unchanged(validators, body_digest)
+        validators.store(response, body_digest)
+        if unchanged:
+            return UPDATE_OK_NO_DATA, None
+        self.parser = parser
+        self.feed_data = feed_data
+        return UPDATE_OK, feed_data
+
+    def _record_transfer(self, response, body_size: int):
+        """Record the transferred and decompressed size of the response body."""
+        content_encoding = response.headers.get(HEADER_CONTENT_ENCODING)
+        raw = getattr(response, "raw", None)
+        if isinstance(raw, HTTPResponse):
+            # Number of bytes read from the connection, before decompression.
+            transferred_size = raw.tell()
+        elif content_encoding:
+            transferred_size = _content_length(response)
+        else:
+            transferred_size = body_size
+        if transferred_size is None:
+            return
+        self._transfer_statistics.record(content_encoding, transferred_size, body_size)
+        _LOGGER.debug(
+            "Feed %s transferred %d bytes for %d bytes with encoding %s",
+            self._url,
+            transferred_size,
+            body_size,
+            content_encoding,
+        )
+
+    @property
+    def transfer_statistics(self) -> TransferStatistics:
+        """Return the sizes of the response bodies of this feed."""
+        return self._transfer_statistics
+
+    def _exceeds_max_body_size(self, body_size: int) -> bool:
+        """Return if the body size exceeds the maximum size."""
+        if self._max_body_size is not None and body_size > self._max_body_size:
+            _LOGGER.warning(
+                "Feed %s exceeds the maximum size of %d bytes",
+                self._url,
+                self._max_body_size,
+            )
+            return True
+        return False
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the session used to fetch this feed."""
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    def close(self):
+        """Close the session if it is owned by this feed."""
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _conditional_request(
+        self, validators: ResponseValidators
+    ) -> requests.PreparedRequest:
+        """Return the request, with validators from the last response."""
+        headers = validators.conditional_headers()
+        if not headers:
+            return self._request
+        request = self._request.copy()
+        request.headers.update(headers)
+        return request
+
+    def _forget_last_response(self):
+        """Forget the last responses, so that the next update parses again."""
+        self._feed_validators.forget()
+        self._subscription_validators.forget()
+
+    @staticmethod
+    def _body_digest(content: bytes) -> bytes:
+        """Return the digest of the body."""
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def _body_unchanged(self, validators: ResponseValidators, digest: bytes) -> bool:
+        """Return if the body digest is the same as for the last response.
+
+        Only the responses that were parsed successfully are stored, so that
+        a body that fails to parse is fetched and parsed again next time.
+        """
+        if validators.body_unchanged(digest):
+            _LOGGER.debug("Feed %s has not changed", self._url)
+            return True
+        return False
+
+    def _store_cache_lifetime(self, response):
+        """Remember how long the response may be cached, in seconds."""
+        self._cache_lifetime = None
+        cache_control = response.headers.get(HEADER_CACHE_CONTROL)
+        if cache_control:
+            directives = [
+                directive.strip().lower() for directive in cache_control.split(",")
+            ]
+            if "no-cache" in directives or "no-store" in directives:
+                return
+            for directive in directives:
+                if directive.startswith("max-age="):
+                    try:
+                        self._cache_lifetime = max(0.0, float(directive[8:]))
+                    except ValueError:
+                        _LOGGER.debug("Invalid cache control %s", cache_control)
+                    else:
+                        return
+        expires = response.headers.get(HEADER_EXPIRES)
+        if expires:
+            try:
+                expires_date = parsedate_to_datetime(expires)
+                date = response.headers.get(HEADER_DATE)
+                now = parsedate_to_datetime(date) if date else datetime.now(UTC)
+            except (TypeError, ValueError):
+                _LOGGER.debug("Invalid expiry date %s", expires)
+                return
+            if expires_date.tzinfo is None or now.tzinfo is None:
+                return
+            self._cache_lifetime = max(0.0, (expires_date - now).total_seconds())
+
+    def _store_ttl(self, feed: Feed):
+        """Remember the time to live of the feed, in minutes."""
+        ttl = feed.ttl
+        self._ttl = ttl if isinstance(ttl, int) and ttl > 0 else None
+
+    @property
+    def update_interval(self) -> float | None:
+        """Return the suggested interval in seconds until the next update.
+
+        Based on the `Cache-Control` or `Expires` headers of the last
+        response, or otherwise the time to live of the feed.
+        """
+        if self._cache_lifetime is not None:
+            return self._cache_lifetime
+        if self._ttl is not None:
+            return self._ttl * 60.0
+        return None
+
+    @property
+    def url(self) -> str:
+        """Return the URL of this feed."""
+        return self._url
 
     def _pre_process_response(self, response):
-        """Pre-process the response."""
-        if response:
-            _LOGGER.debug("Response encoding %s", response.encoding)
-            if response.content.startswith(codecs.BOM_UTF8):
-                _LOGGER.debug(
-                    "UTF8 byte order mark detected, " "setting encoding to 'utf-8-sig'"
-                )
-                response.encoding = "utf-8-sig"
+        """Pre-process the response.
+
+        Setting `response.encoding` overrides the encoding of the body.
+        """
 
     def _filter_entries(self, entries):
         """Filter the provided entries."""
+        return self._apply_filters(
+            entries,
+            self._home_coordinates,
+            self._filter_radius,
+            self._filter_categories,
+        )
+
+    @staticmethod
+    def _apply_filters(
+        entries,
+        home_coordinates: tuple[float, float],
+        filter_radius: float | None,
+        filter_categories: list[str] | None,
+    ):
+        """Filter the provided entries by distance and category."""
         filtered_entries = entries
         _LOGGER.debug("Entries before filtering %s", filtered_entries)
         # Always remove entries without geometry
@@ -114,21 +544,31 @@ class GeoRssFeed:
             filter(lambda entry: entry.geometry is not None, filtered_entries)
         )
         # Filter by distance.
-        if self._filter_radius:
-            filtered_entries = list(
-                filter(
-                    lambda entry: entry.distance_to_home <= self._filter_radius,
-                    filtered_entries,
-                )
+        if filter_radius:
+            # Discard entries outside the bounding box of the radius without
+            # calculating their distance.
+            bounding_box = GeoRssDistanceHelper.bounding_box(
+                home_coordinates, filter_radius
             )
+            filtered_entries = [
+                entry
+                for entry in filtered_entries
+                if not entry.outside_bounding_box(bounding_box)
+            ]
+            # Calculate all remaining distances in one batch.
+            FeedEntry.calculate_distances_to_home(filtered_entries)
+            filtered_entries = [
+                entry
+                for entry in filtered_entries
+                if entry.distance_to_home <= filter_radius
+            ]
         # Filter by category.
-        if self._filter_categories:
+        if filter_categories:
             filtered_entries = list(
                 filter(
-                    lambda entry: len(
-                        {entry.category}.intersection(self._filter_categories)
-                    )
-                    > 0,
+                    lambda entry: (
+                        len({entry.category}.intersection(filter_categories)) > 0
+                    ),
                     filtered_entries,
                 )
             )
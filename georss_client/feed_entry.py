@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime
 import re
 
 from .consts import CUSTOM_ATTRIBUTE
 from .geo_rss_distance_helper import GeoRssDistanceHelper
 from .xml_parser.feed_item import FeedItem
-from .xml_parser.geometry import Geometry
+from .xml_parser.geometry import BoundingBox, Geometry
 
 
 class FeedEntry:
     """Feed entry base class."""
 
+    _distance_to_home: float | None = None
+
     def __init__(self, home_coordinates: tuple[float, float], rss_entry: FeedItem):
         """Initialise this feed entry."""
         self._home_coordinates: tuple[float, float] = home_coordinates
@@ -90,12 +93,63 @@ class FeedEntry:
         """Return the attribution of this entry."""
         return None
 
+    @property
+    def home_coordinates(self) -> tuple[float, float]:
+        """Return the home coordinates of this entry."""
+        return self._home_coordinates
+
     @property
     def distance_to_home(self) -> float:
         """Return the distance in km of this entry to the home coordinates."""
-        return GeoRssDistanceHelper.distance_to_geometry(
-            self._home_coordinates, self.geometry
-        )
+        if self._distance_to_home is None:
+            self._distance_to_home = GeoRssDistanceHelper.distance_to_geometry(
+                self._home_coordinates, self.geometry
+            )
+        return self._distance_to_home
+
+    def set_distance_to_home(self, distance: float):
+        """Set the distance in km of this entry, calculated in a batch."""
+        self._distance_to_home = distance
+
+    def outside_bounding_box(self, bounding_box: BoundingBox) -> bool:
+        """Return if this entry lies completely outside the bounding box.
+
+        This is a cheap check before calculating the distance to home, and
+        is only conclusive for entries using the default distance calculation.
+        """
+        if type(self).distance_to_home is not FeedEntry.distance_to_home:
+            return False
+        return GeoRssDistanceHelper.outside_bounding_box(self.geometry, bounding_box)
+
+    @staticmethod
+    def calculate_distances_to_home(entries: Iterable[FeedEntry]):
+        """Calculate the distances of many entries in one batch.
+
+        The distances are cached in each entry. Entries that provide their
+        own implementation of `distance_to_home` are skipped.
+        """
+        entries_by_home: dict[tuple[float, float], list[FeedEntry]] = {}
+        for entry in entries:
+            if type(entry).distance_to_home is FeedEntry.distance_to_home:
+                entries_by_home.setdefault(tuple(entry.home_coordinates), []).append(
+                    entry
+                )
+        for home_coordinates, home_entries in entries_by_home.items():
+            distances = GeoRssDistanceHelper.distances_to_geometries(
+                home_coordinates, [entry.geometry for entry in home_entries]
+            )
+            for entry, distance in zip(home_entries, distances, strict=True):
+                entry.set_distance_to_home(distance)
+
+    @property
+    def fingerprint(self) -> int | None:
+        """Return a fingerprint of the content of this entry.
+
+        Entries with the same fingerprint are considered unchanged.
+        """
+        if self._rss_entry:
+            return self._rss_entry.fingerprint
+        return None
 
     @property
     def description(self) -> str | None:
@@ -5,15 +5,24 @@ This allows managing feeds and their entries throughout their life-cycle.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
+import time
 from typing import Callable
 
 from . import GeoRssFeed
-from .consts import UPDATE_OK, UPDATE_OK_NO_DATA
+from .consts import UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
+from .feed_entry import FeedEntry
+from .geo_rss_distance_helper import GeoRssDistanceHelper
+from .spatial_index import SpatialIndex
+from .xml_parser.geometry import BoundingBox
 
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_MAX_WORKERS = 10
+
 
 class FeedManagerBase:
     """Generic Feed manager."""
@@ -21,18 +30,47 @@ class FeedManagerBase:
     def __init__(
         self,
         feed: GeoRssFeed,
-        generate_callback: Callable[[str], None],
-        update_callback: Callable[[str], None],
-        remove_callback: Callable[[str], None],
+        generate_callback: Callable[[str], None] | None,
+        update_callback: Callable[[str], None] | None,
+        remove_callback: Callable[[str], None] | None,
+        *,
+        skip_unchanged: bool = False,
+        generate_batch_callback: Callable[[dict], None] | None = None,
+        update_batch_callback: Callable[[dict], None] | None = None,
+        remove_batch_callback: Callable[[dict], None] | None = None,
     ):
-        """Initialise feed manager."""
+        """Initialise feed manager.
+
+        With `skip_unchanged` the update callback is only called for entries
+        whose fingerprint has changed since the previous update.
+
+        A batch callback receives all external ids and their entries of one
+        update in a single call, as dict in the order of the feed, and
+        replaces the corresponding per-id callback. Batch callbacks are only
+        called with at least one entry.
+        """
         self._feed: GeoRssFeed = feed
         self.feed_entries: dict = {}
+        self._spatial_index: SpatialIndex = SpatialIndex()
+        # Geometry of each indexed entry, to only index changed geometries.
+        self._indexed_geometries: dict = {}
+        self._spatial_index_outdated: bool = False
         self._managed_external_ids = set()
+        self._skip_unchanged: bool = skip_unchanged
+        self._fingerprints: dict = {}
         self._last_update: datetime | None = None
         self._generate_callback: Callable[[str], None] = generate_callback
         self._update_callback: Callable[[str], None] = update_callback
         self._remove_callback: Callable[[str], None] = remove_callback
+        self._generate_batch_callback: Callable[[dict], None] | None = (
+            generate_batch_callback
+        )
+        self._update_batch_callback: Callable[[dict], None] | None = (
+            update_batch_callback
+        )
+        self._remove_batch_callback: Callable[[dict], None] | None = (
+            remove_batch_callback
+        )
 
     def __repr__(self):
         """Return string representation of this feed."""
@@ -41,25 +79,49 @@ class FeedManagerBase:
     def update(self):
         """Update the feed and then update connected entities."""
         status, feed_entries = self._feed.update()
+        self.process_update(status, feed_entries)
+
+    def process_update(self, status: str, feed_entries: list | None):
+        """Update connected entities from the status and entries of a feed update.
+
+        Called by `update`, or with the result of a feed update fetched
+        elsewhere, like by `update_feed_managers`.
+        """
         if status == UPDATE_OK:
             _LOGGER.debug("Data retrieved %s", feed_entries)
+            previous_entries = self.feed_entries
             # Keep a copy of all feed entries for future lookups by entities.
             self.feed_entries = {entry.external_id: entry for entry in feed_entries}
             # Record current time of update.
             self._last_update = datetime.now()
             # For entity management the external ids from the feed are used.
             feed_external_ids = set(self.feed_entries)
-            remove_external_ids = self._managed_external_ids.difference(
-                feed_external_ids
-            )
-            self._remove_entities(remove_external_ids)
-            update_external_ids = self._managed_external_ids.intersection(
-                feed_external_ids
-            )
+            # The spatial index is only updated once it is queried.
+            self._spatial_index_outdated = True
+            # Entities are removed in the order of the previous update, and
+            # updated and generated in the order of this update.
+            remove_external_ids = [
+                external_id
+                for external_id in dict.fromkeys(
+                    [*previous_entries, *self._managed_external_ids]
+                )
+                if external_id in self._managed_external_ids
+                and external_id not in feed_external_ids
+            ]
+            self._remove_entities(remove_external_ids, previous_entries)
+            update_external_ids = [
+                external_id
+                for external_id in self.feed_entries
+                if external_id in self._managed_external_ids
+            ]
+            if self._skip_unchanged:
+                update_external_ids = self._changed_external_ids(update_external_ids)
             self._update_entities(update_external_ids)
-            create_external_ids = feed_external_ids.difference(
-                self._managed_external_ids
-            )
+            create_external_ids = [
+                external_id
+                for external_id in self.feed_entries
+                if external_id not in self._managed_external_ids
+            ]
             self._generate_new_entities(create_external_ids)
         elif status == UPDATE_OK_NO_DATA:
             _LOGGER.debug("Update successful, but no data received from %s", self._feed)
@@ -67,14 +129,55 @@ class FeedManagerBase:
             _LOGGER.warning(
                 "Update not successful, no data received from %s", self._feed
             )
-            # Remove all entities.
-            self._remove_entities(self._managed_external_ids.copy())
+            # Remove all entities, in the order of the previous update.
+            self._remove_entities(
+                [
+                    external_id
+                    for external_id in dict.fromkeys(
+                        [*self.feed_entries, *self._managed_external_ids]
+                    )
+                    if external_id in self._managed_external_ids
+                ]
+            )
             # Remove all feed entries and managed external ids.
             self.feed_entries.clear()
             self._managed_external_ids.clear()
+            self._spatial_index.clear()
+            self._indexed_geometries.clear()
+            self._spatial_index_outdated = False
+            self._fingerprints.clear()
+
+    def _changed_external_ids(self, external_ids: list) -> list:
+        """Return the external ids of entries that changed since the last update."""
+        previous_fingerprints = self._fingerprints
+        self._fingerprints = {
+            external_id: entry.fingerprint
+            for external_id, entry in self.feed_entries.items()
+        }
+        changed_external_ids = []
+        for external_id in external_ids:
+            if (
+                previous_fingerprints.get(external_id)
+                == self._fingerprints[external_id]
+            ):
+                _LOGGER.debug("Entity unchanged %s", external_id)
+            else:
+                changed_external_ids.append(external_id)
+        return changed_external_ids
 
     def _generate_new_entities(self, external_ids):
         """Generate new entities for events."""
+        if self._generate_batch_callback is not None:
+            if external_ids:
+                self._generate_batch_callback(
+                    {
+                        external_id: self.feed_entries.get(external_id)
+                        for external_id in external_ids
+                    }
+                )
+                _LOGGER.debug("%s new entities added", len(external_ids))
+                self._managed_external_ids.update(external_ids)
+            return
         for external_id in external_ids:
             self._generate_callback(external_id)
             _LOGGER.debug("New entity added %s", external_id)
@@ -82,17 +185,88 @@ class FeedManagerBase:
 
     def _update_entities(self, external_ids):
         """Update entities."""
+        if self._update_batch_callback is not None:
+            if external_ids:
+                _LOGGER.debug("%s existing entities found", len(external_ids))
+                self._update_batch_callback(
+                    {
+                        external_id: self.feed_entries.get(external_id)
+                        for external_id in external_ids
+                    }
+                )
+            return
         for external_id in external_ids:
             _LOGGER.debug("Existing entity found %s", external_id)
             self._update_callback(external_id)
 
-    def _remove_entities(self, external_ids):
+    def _remove_entities(self, external_ids, previous_entries: dict | None = None):
         """Remove entities."""
+        if self._remove_batch_callback is not None:
+            if external_ids:
+                if previous_entries is None:
+                    previous_entries = self.feed_entries
+                _LOGGER.debug("%s entities not current anymore", len(external_ids))
+                self._managed_external_ids.difference_update(external_ids)
+                self._remove_batch_callback(
+                    {
+                        external_id: previous_entries.get(external_id)
+                        for external_id in external_ids
+                    }
+                )
+            return
         for external_id in external_ids:
             _LOGGER.debug("Entity not current anymore %s", external_id)
             self._managed_external_ids.remove(external_id)
             self._remove_callback(external_id)
 
+    def _update_spatial_index(self):
+        """Update the spatial index with the current feed entries.
+
+        Only entries with a new or changed geometry are indexed again, so
+        that their bounding boxes are not calculated on every update.
+        """
+        for external_id in set(self._indexed_geometries).difference(self.feed_entries):
+            self._spatial_index.remove(external_id)
+            del self._indexed_geometries[external_id]
+        for external_id, entry in self.feed_entries.items():
+            geometry = entry.geometry
+            if (
+                external_id in self._indexed_geometries
+                and self._indexed_geometries[external_id] == geometry
+            ):
+                continue
+            self._spatial_index.insert(
+                external_id, geometry.bounding_box if geometry else None
+            )
+            self._indexed_geometries[external_id] = geometry
+        self._spatial_index_outdated = False
+
+    def entries_within_bounding_box(self, bounding_box: BoundingBox) -> list[FeedEntry]:
+        """Return the feed entries overlapping the bounding box."""
+        if self._spatial_index_outdated:
+            self._update_spatial_index()
+        return [
+            self.feed_entries[external_id]
+            for external_id in self._spatial_index.query(bounding_box)
+        ]
+
+    def entries_within_radius(
+        self, coordinates: tuple[float, float], radius: float
+    ) -> list[FeedEntry]:
+        """Return the feed entries within the radius in km around the coordinates."""
+        bounding_box = GeoRssDistanceHelper.bounding_box(coordinates, radius)
+        return [
+            entry
+            for entry in self.entries_within_bounding_box(bounding_box)
+            if GeoRssDistanceHelper.distance_to_geometry(coordinates, entry.geometry)
+            <= radius
+        ]
+
+    @property
+    def feed(self) -> GeoRssFeed:
+        """Return the feed of this feed manager."""
+        return self._feed
+
     @property
     def last_timestamp(self) -> datetime | None:
         """Return the last timestamp extracted from this feed."""
@@ -102,3 +276,83 @@ class FeedManagerBase:
     def last_update(self) -> datetime | None:
         """Return the last successful update of this feed."""
         return self._last_update
+
+
+class FeedManagerUpdate:
+    """Outcome of updating one feed manager as part of many."""
+
+    def __init__(
+        self,
+        feed_manager: FeedManagerBase,
+        status: str,
+        fetch_duration: float,
+        process_duration: float,
+    ):
+        """Initialise this outcome."""
+        self._feed_manager: FeedManagerBase = feed_manager
+        self._status: str = status
+        self._fetch_duration: float = fetch_duration
+        self._process_duration: float = process_duration
+
+    def __repr__(self):
+        """Return string representation of this outcome."""
+        return f"<{self.__class__.__name__}(feed_manager={self._feed_manager}, status={self._status}, fetch_duration={self._fetch_duration:.3f}, process_duration={self._process_duration:.3f})>"
+
+    @property
+    def feed_manager(self) -> FeedManagerBase:
+        """Return the updated feed manager."""
+        return self._feed_manager
+
+    @property
+    def status(self) -> str:
+        """Return the status of the feed update."""
+        return self._status
+
+    @property
+    def fetch_duration(self) -> float:
+        """Return the seconds taken to fetch, parse and filter the feed."""
+        return self._fetch_duration
+
+    @property
+    def process_duration(self) -> float:
+        """Return the seconds taken to update the connected entities."""
+        return self._process_duration
+
+
+def _fetch(feed_manager: FeedManagerBase) -> tuple[str, list | None, float]:
+    """Update the feed of the feed manager and measure the duration."""
+    start = time.perf_counter()
+    try:
+        status, feed_entries = feed_manager.feed.update()
+    except Exception:
+        _LOGGER.exception("Updating %s failed", feed_manager.feed)
+        status, feed_entries = UPDATE_ERROR, None
+    return status, feed_entries, time.perf_counter() - start
+
+
+def update_feed_managers(
+    feed_managers: Iterable[FeedManagerBase],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[FeedManagerUpdate]:
+    """Update many feed managers, fetching up to `max_workers` feeds at a time.
+
+    The feeds are fetched concurrently on a thread pool, but the callbacks
+    of the feed managers are called from the calling thread, one feed
+    manager at a time in the given order.
+    """
+    feed_managers = list(feed_managers)
+    results: list[FeedManagerUpdate] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_fetch, feed_manager) for feed_manager in feed_managers
+        ]
+        for feed_manager, future in zip(feed_managers, futures, strict=True):
+            status, feed_entries, fetch_duration = future.result()
+            start = time.perf_counter()
+            feed_manager.process_update(status, feed_entries)
+            results.append(
+                FeedManagerUpdate(
+                    feed_manager, status, fetch_duration, time.perf_counter() - start
+                )
+            )
+    return results
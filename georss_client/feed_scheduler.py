@@ -0,0 +1,192 @@
+"""Feed scheduler.
+
+Polls many feed managers on a thread pool, each at the interval suggested
+by its feed, spread out with jitter and limited per host.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .feed_manager import FeedManagerBase
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_UPDATE_INTERVAL = 300.0
+DEFAULT_MIN_UPDATE_INTERVAL = 30.0
+DEFAULT_MAX_UPDATE_INTERVAL = 3600.0
+DEFAULT_JITTER = 0.1
+DEFAULT_MAX_WORKERS = 10
+DEFAULT_MAX_PER_HOST = 2
+
+
+# Next update of a feed manager: due time, sequence number (to keep the
+# order of equal due times), feed manager and host.
+_ScheduledUpdate = tuple[float, int, FeedManagerBase, str]
+
+
+class FeedScheduler:
+    """Scheduler updating many feed managers in the background.
+
+    The interval of each feed comes from its `Cache-Control` or `Expires`
+    headers or its time to live, or otherwise the default interval, and is
+    varied randomly by the jitter fraction.
+    """
+
+    def __init__(
+        self,
+        default_interval: float = DEFAULT_UPDATE_INTERVAL,
+        *,
+        min_interval: float = DEFAULT_MIN_UPDATE_INTERVAL,
+        max_interval: float = DEFAULT_MAX_UPDATE_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+    ):
+        """Initialise the scheduler."""
+        self._default_interval: float = default_interval
+        self._min_interval: float = min_interval
+        self._max_interval: float = max_interval
+        self._jitter: float = jitter
+        self._max_workers: int = max_workers
+        self._max_per_host: int = max_per_host
+        self._condition = threading.Condition()
+        self._queue: list[_ScheduledUpdate] = []
+        self._waiting: dict[str, deque[_ScheduledUpdate]] = {}
+        self._running: dict[str, int] = {}
+        # Sequence number of the current scheduled update of each feed manager.
+        self._feed_managers: dict[FeedManagerBase, int] = {}
+        self._sequence = itertools.count()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped: bool = True
+
+    def __repr__(self):
+        """Return string representation of this scheduler."""
+        return f"<{self.__class__.__name__}(feeds={len(self._feed_managers)}, default_interval={self._default_interval})>"
+
+    def add(self, feed_manager: FeedManagerBase):
+        """Schedule the feed manager, with its first update within the jitter."""
+        with self._condition:
+            if feed_manager in self._feed_managers:
+                return
+            # Spread the first updates to avoid a burst on start.
+            delay = random.uniform(0.0, self._jitter * self._default_interval)
+            self._schedule(feed_manager, delay)
+
+    def remove(self, feed_manager: FeedManagerBase):
+        """Stop updating the feed manager."""
+        with self._condition:
+            self._feed_managers.pop(feed_manager, None)
+
+    def start(self):
+        """Start updating the scheduled feed managers in the background."""
+        with self._condition:
+            if not self._stopped:
+                return
+            self._stopped = False
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="FeedScheduler"
+            )
+            self._thread = threading.Thread(
+                target=self._run, name="FeedScheduler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop updating, optionally waiting for running updates to finish."""
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
+        self._thread = None
+        self._executor = None
+
+    def _host(self, feed_manager: FeedManagerBase) -> str:
+        """Return the host of the feed of the feed manager."""
+        return urlsplit(feed_manager.feed.url or "").hostname or ""
+
+    def _schedule(self, feed_manager: FeedManagerBase, delay: float):
+        """Add the next update of the feed manager to the queue."""
+        sequence = next(self._sequence)
+        self._feed_managers[feed_manager] = sequence
+        heapq.heappush(
+            self._queue,
+            (
+                time.monotonic() + delay,
+                sequence,
+                feed_manager,
+                self._host(feed_manager),
+            ),
+        )
+        self._condition.notify_all()
+
+    def _interval(self, feed_manager: FeedManagerBase) -> float:
+        """Return the interval until the next update of the feed manager."""
+        interval = feed_manager.feed.update_interval
+        if interval is None:
+            interval = self._default_interval
+        interval = min(self._max_interval, max(self._min_interval, interval))
+        return interval * random.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+
+    def _run(self):
+        """Dispatch due updates until stopped."""
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._queue and self._queue[0][0] <= now:
+                    scheduled_update = heapq.heappop(self._queue)
+                    if not self._is_current(scheduled_update):
+                        continue
+                    host = scheduled_update[3]
+                    if self._running.get(host, 0) >= self._max_per_host:
+                        # Dispatched as soon as an update of this host finishes.
+                        self._waiting.setdefault(host, deque()).append(scheduled_update)
+                        continue
+                    self._dispatch(scheduled_update)
+                timeout = self._queue[0][0] - now if self._queue else None
+                self._condition.wait(timeout)
+
+    def _is_current(self, scheduled_update: _ScheduledUpdate) -> bool:
+        """Return if the update is still scheduled for its feed manager."""
+        _, sequence, feed_manager, _ = scheduled_update
+        return self._feed_managers.get(feed_manager) == sequence
+
+    def _dispatch(self, scheduled_update: _ScheduledUpdate):
+        """Submit the update to the thread pool."""
+        host = scheduled_update[3]
+        self._running[host] = self._running.get(host, 0) + 1
+        self._executor.submit(self._update, scheduled_update)
+
+    def _update(self, scheduled_update: _ScheduledUpdate):
+        """Update the feed manager and schedule its next update."""
+        _, _, feed_manager, host = scheduled_update
+        try:
+            feed_manager.update()
+        except Exception:
+            _LOGGER.exception("Updating %s failed", feed_manager)
+        with self._condition:
+            self._running[host] -= 1
+            if not self._running[host]:
+                del self._running[host]
+            if self._is_current(scheduled_update):
+                self._schedule(feed_manager, self._interval(feed_manager))
+            waiting = self._waiting.get(host)
+            while waiting and not self._stopped:
+                waiting_update = waiting.popleft()
+                if self._is_current(waiting_update):
+                    self._dispatch(waiting_update)
+                    break
+            if not waiting:
+                self._waiting.pop(host, None)
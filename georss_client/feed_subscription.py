@@ -0,0 +1,49 @@
+"""Feed Subscription."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+
+class FeedSubscription:
+    """Home coordinates and filters of one consumer of a shared feed."""
+
+    def __init__(
+        self,
+        home_coordinates: tuple[float, float],
+        filter_radius: float | None = None,
+        filter_categories: list[str] | None = None,
+    ):
+        """Initialise this subscription."""
+        self._home_coordinates: tuple[float, float] = home_coordinates
+        self._filter_radius: float | None = filter_radius
+        self._filter_categories: list[str] | None = filter_categories
+        self._last_timestamp: datetime | None = None
+
+    def __repr__(self):
+        """Return string representation of this subscription."""
+        return f"<{self.__class__.__name__}(home={self._home_coordinates}, radius={self._filter_radius}, categories={self._filter_categories})>"
+
+    @property
+    def home_coordinates(self) -> tuple[float, float]:
+        """Return the home coordinates of this subscription."""
+        return self._home_coordinates
+
+    @property
+    def filter_radius(self) -> float | None:
+        """Return the filter radius in km of this subscription."""
+        return self._filter_radius
+
+    @property
+    def filter_categories(self) -> list[str] | None:
+        """Return the filter categories of this subscription."""
+        return self._filter_categories
+
+    @property
+    def last_timestamp(self) -> datetime | None:
+        """Return the last timestamp of the entries of this subscription."""
+        return self._last_timestamp
+
+    def record_last_timestamp(self, last_timestamp: datetime | None):
+        """Record the last timestamp of the entries of the latest update."""
+        self._last_timestamp = last_timestamp
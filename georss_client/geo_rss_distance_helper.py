@@ -2,14 +2,29 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 import logging
+from math import asin, cos, degrees, pi, radians, sin, sqrt
 
-from haversine import haversine
+from haversine import Unit, haversine
+from haversine.haversine import get_avg_earth_radius
 
-from .xml_parser.geometry import Geometry, Point, Polygon
+from .geometry_engine import prepare_polygon
+from .xml_parser.geometry import BoundingBox, Geometry, Point, Polygon
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 _LOGGER = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM: float = get_avg_earth_radius(Unit.KILOMETERS)
+# Below this number of coordinates the pure Python implementation is faster.
+NUMPY_MIN_COORDINATES = 64
+# Widen bounding boxes slightly to compensate for rounding errors.
+BOUNDING_BOX_MARGIN_DEGREES = 1e-6
+
 
 class GeoRssDistanceHelper:
     """Helper to calculate distances between GeoRSS geometries."""
@@ -29,6 +44,40 @@ class GeoRssDistanceHelper:
             _LOGGER.debug("Not implemented: %s", type(geometry))
         return latitude, longitude
 
+    @staticmethod
+    def bounding_box(
+        home_coordinates: tuple[float, float], radius: float
+    ) -> BoundingBox:
+        """Return the bounding box of all coordinates within the radius in km.
+
+        The box covers all longitudes if it includes a pole, and crosses the
+        antimeridian if required.
+        """
+        latitude, longitude = home_coordinates
+        angular_radius = radius / EARTH_RADIUS_KM
+        delta_latitude = degrees(angular_radius) + BOUNDING_BOX_MARGIN_DEGREES
+        south, north = latitude - delta_latitude, latitude + delta_latitude
+        if south <= -90.0 or north >= 90.0:
+            return BoundingBox(max(south, -90.0), -180.0, min(north, 90.0), 180.0)
+        # Maximum longitude difference of points on the circle.
+        ratio = sin(angular_radius) / cos(radians(latitude))
+        if angular_radius >= 0.5 * pi or ratio >= 1.0:
+            return BoundingBox(south, -180.0, north, 180.0)
+        delta_longitude = degrees(asin(ratio)) + BOUNDING_BOX_MARGIN_DEGREES
+        west = (longitude - delta_longitude + 180.0) % 360.0 - 180.0
+        east = (longitude + delta_longitude + 180.0) % 360.0 - 180.0
+        return BoundingBox(south, west, north, east)
+
+    @staticmethod
+    def outside_bounding_box(geometry: Geometry, bounding_box: BoundingBox) -> bool:
+        """Return if the geometry lies completely outside the bounding box."""
+        if not isinstance(geometry, Geometry):
+            return False
+        geometry_bounding_box = geometry.bounding_box
+        if geometry_bounding_box is None:
+            return False
+        return not bounding_box.intersects(geometry_bounding_box)
+
     @staticmethod
     def distance_to_geometry(
         home_coordinates: tuple[float, float], geometry: Geometry
@@ -47,6 +96,34 @@ class GeoRssDistanceHelper:
             _LOGGER.debug("Not implemented: %s", type(geometry))
         return distance
 
+    @staticmethod
+    def distances_to_geometries(
+        home_coordinates: tuple[float, float], geometries: Sequence[Geometry]
+    ) -> list[float]:
+        """Calculate the distances between home coordinates and many geometries.
+
+        The distances to all points are calculated in one batch.
+        """
+        distances: list[float] = [float("inf")] * len(geometries)
+        point_indices: list[int] = []
+        point_coordinates: list[float] = []
+        for index, geometry in enumerate(geometries):
+            if isinstance(geometry, Point):
+                point_indices.append(index)
+                point_coordinates.append(geometry.latitude)
+                point_coordinates.append(geometry.longitude)
+            else:
+                distances[index] = GeoRssDistanceHelper.distance_to_geometry(
+                    home_coordinates, geometry
+                )
+        if point_indices:
+            point_distances = GeoRssDistanceHelper.distances_to_coordinates(
+                home_coordinates, point_coordinates
+            )
+            for index, distance in zip(point_indices, point_distances, strict=True):
+                distances[index] = distance
+        return distances
+
     @staticmethod
     def _distance_to_point(
         home_coordinates: tuple[float, float], point: Point
@@ -61,19 +138,58 @@ class GeoRssDistanceHelper:
     def _distance_to_polygon(
         home_coordinates: tuple[float, float], polygon: Polygon
     ) -> float:
-        """Calculate the distance between home coordinates and the polygon."""
-        distance = float("inf")
-        # Calculate distance from polygon by calculating the distance
-        # to each point of the polygon but not to each edge of the
-        # polygon; should be good enough
-        for point in polygon.points:
-            distance = min(
-                distance,
-                GeoRssDistanceHelper._distance_to_coordinates(
-                    home_coordinates, (point.latitude, point.longitude)
-                ),
+        """Calculate the distance between home coordinates and the polygon.
+
+        The distance is 0 if home is inside the polygon, and otherwise the
+        distance to the closest point on any edge of the polygon.
+        """
+        return EARTH_RADIUS_KM * prepare_polygon(polygon).distance(
+            home_coordinates[0], home_coordinates[1]
+        )
+
+    @staticmethod
+    def distances_to_coordinates(
+        home_coordinates: tuple[float, float], coordinates: Sequence[float]
+    ) -> list[float]:
+        """Calculate the distances between home coordinates and many coordinates.
+
+        The coordinates are provided as flat latitude/longitude pairs, and all
+        distances are calculated in one batch, using NumPy if available.
+        """
+        haversines = GeoRssDistanceHelper._haversines(home_coordinates, coordinates)
+        if np is not None and isinstance(haversines, np.ndarray):
+            return (
+                2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(haversines)))
+            ).tolist()
+        return [
+            2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(value))) for value in haversines
+        ]
+
+    @staticmethod
+    def _haversines(
+        home_coordinates: tuple[float, float], coordinates: Sequence[float]
+    ) -> Sequence[float]:
+        """Calculate the haversines between home coordinates and flat coordinates."""
+        home_latitude = radians(home_coordinates[0])
+        home_longitude = radians(home_coordinates[1])
+        cos_home_latitude = cos(home_latitude)
+        if np is not None and len(coordinates) >= NUMPY_MIN_COORDINATES:
+            values = np.radians(np.asarray(coordinates, dtype=float).reshape(-1, 2))
+            latitudes, longitudes = values[:, 0], values[:, 1]
+            return (
+                np.sin((latitudes - home_latitude) * 0.5) ** 2
+                + cos_home_latitude
+                * np.cos(latitudes)
+                * np.sin((longitudes - home_longitude) * 0.5) ** 2
             )
-        return distance
+        values = iter(coordinates)
+        return [
+            sin((radians(latitude) - home_latitude) * 0.5) ** 2
+            + cos_home_latitude
+            * cos(radians(latitude))
+            * sin((radians(longitude) - home_longitude) * 0.5) ** 2
+            for latitude, longitude in zip(values, values, strict=True)
+        ]
 
     @staticmethod
     def _distance_to_coordinates(
@@ -0,0 +1,158 @@
+"""Geometry engine.
+
+Exact distances between coordinates and polygons on a sphere, based on
+per-polygon data that is prepared once and then cached.
+"""
+
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+from math import asin, sqrt
+
+from .xml_parser.geometry import BoundingBox, Polygon, unit_vector
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Number of prepared polygons kept in the cache.
+PREPARED_POLYGON_CACHE_SIZE = 1024
+# Below this number of edges the pure Python implementation is faster.
+NUMPY_MIN_EDGES = 32
+# Edges shorter than this (as sine of the angle) are treated as points.
+MIN_EDGE_LENGTH = 1e-12
+
+
+class PreparedPolygon:
+    """Polygon with precomputed edges for repeated distance calculations."""
+
+    __slots__ = ("_bounding_box", "_edge_longitudes", "_edges", "_vertices")
+
+    def __init__(self, polygon: Polygon):
+        """Prepare the polygon."""
+        coordinates = polygon.coordinates
+        self._bounding_box: BoundingBox | None = polygon.bounding_box
+        latitudes, longitudes = coordinates[0::2], coordinates[1::2]
+        # Unit vectors of all vertices, flattened as x, y, z.
+        self._vertices: array = array("d")
+        for latitude, longitude in zip(latitudes, longitudes, strict=True):
+            self._vertices.extend(unit_vector(latitude, longitude))
+        # Per edge: start vertex, end vertex and normal of its great circle,
+        # flattened as 9 values, and the longitudes of both vertices.
+        self._edges: array = array("d")
+        self._edge_longitudes: array = array("d")
+        number_of_vertices = len(latitudes)
+        for i in range(number_of_vertices):
+            j = (i + 1) % number_of_vertices
+            ax, ay, az = self._vertices[3 * i : 3 * i + 3]
+            bx, by, bz = self._vertices[3 * j : 3 * j + 3]
+            nx, ny, nz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+            length = sqrt(nx * nx + ny * ny + nz * nz)
+            if length < MIN_EDGE_LENGTH:
+                # Duplicate vertices, or the closing edge of a closed ring.
+                continue
+            self._edges.extend(
+                (ax, ay, az, bx, by, bz, nx / length, ny / length, nz / length)
+            )
+            self._edge_longitudes.extend((longitudes[i], longitudes[j]))
+
+    @property
+    def number_of_edges(self) -> int:
+        """Return the number of edges of this polygon."""
+        return len(self._edges) // 9
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """Return if the coordinates are inside this polygon.
+
+        Casts a ray along the meridian towards the north pole and counts the
+        great-circle edges it crosses.
+        """
+        if self._bounding_box is None or not self._bounding_box.contains(
+            latitude, longitude
+        ):
+            return False
+        px, py, pz = unit_vector(latitude, longitude)
+        edges, edge_longitudes = self._edges, self._edge_longitudes
+        inside = False
+        for i in range(self.number_of_edges):
+            # Longitudes of the end points relative to the meridian.
+            start = (edge_longitudes[2 * i] - longitude + 180.0) % 360.0 - 180.0
+            end = (edge_longitudes[2 * i + 1] - longitude + 180.0) % 360.0 - 180.0
+            # Skip edges that do not cross the meridian, or only cross it on
+            # the opposite side of the pole.
+            if (start > 0.0) == (end > 0.0) or abs(end - start) >= 180.0:
+                continue
+            nx, ny, nz = edges[9 * i + 6 : 9 * i + 9]
+            side = nx * px + ny * py + nz * pz
+            # The normal of an edge heading east points north of the edge.
+            if (side < 0.0) if end > start else (side > 0.0):
+                inside = not inside
+        return inside
+
+    def distance(self, latitude: float, longitude: float) -> float:
+        """Return the angular distance in radians to the polygon.
+
+        The distance is 0 for coordinates inside the polygon, and otherwise
+        the distance to the closest point on any of its edges.
+        """
+        if not self._vertices:
+            return float("inf")
+        if self.contains(latitude, longitude):
+            return 0.0
+        point = unit_vector(latitude, longitude)
+        if np is not None and self.number_of_edges >= NUMPY_MIN_EDGES:
+            return self._distance_numpy(point)
+        return self._distance_python(point)
+
+    def _distance_python(self, point: tuple[float, float, float]) -> float:
+        """Return the angular distance, calculated in pure Python."""
+        px, py, pz = point
+        # Closest vertex, from the chord length between unit vectors.
+        vertices = iter(self._vertices)
+        min_chord = min(
+            (x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2
+            for x, y, z in zip(vertices, vertices, vertices, strict=True)
+        )
+        distance = 2 * asin(min(1.0, sqrt(min_chord) / 2))
+        edges = self._edges
+        for i in range(0, len(edges), 9):
+            ax, ay, az, bx, by, bz, nx, ny, nz = edges[i : i + 9]
+            # The closest point on the great circle lies within the edge if
+            # the point is on the inner side of both end points.
+            if (
+                nx * (ay * pz - az * py)
+                + ny * (az * px - ax * pz)
+                + nz * (ax * py - ay * px)
+            ) >= 0 and (
+                nx * (py * bz - pz * by)
+                + ny * (pz * bx - px * bz)
+                + nz * (px * by - py * bx)
+            ) >= 0:
+                distance = min(
+                    distance, asin(min(1.0, abs(nx * px + ny * py + nz * pz)))
+                )
+        return distance
+
+    def _distance_numpy(self, point: tuple[float, float, float]) -> float:
+        """Return the angular distance, calculated with NumPy."""
+        p = np.asarray(point)
+        vertices = np.asarray(self._vertices).reshape(-1, 3)
+        min_chord = float(np.min(np.sum((vertices - p) ** 2, axis=1)))
+        distance = 2 * asin(min(1.0, sqrt(min_chord) / 2))
+        edges = np.asarray(self._edges).reshape(-1, 9)
+        a, b, n = edges[:, 0:3], edges[:, 3:6], edges[:, 6:9]
+        within = (np.einsum("ij,ij->i", np.cross(a, p), n) >= 0) & (
+            np.einsum("ij,ij->i", np.cross(p, b), n) >= 0
+        )
+        if within.any():
+            cross_track = np.abs(n[within] @ p).min()
+            distance = min(distance, asin(min(1.0, float(cross_track))))
+        return distance
+
+
+@lru_cache(maxsize=PREPARED_POLYGON_CACHE_SIZE)
+def prepare_polygon(polygon: Polygon) -> PreparedPolygon:
+    """Return the prepared polygon, cached across equal polygons."""
+    return PreparedPolygon(polygon)
@@ -0,0 +1,49 @@
+"""Response Validators."""
+
+from __future__ import annotations
+
+from .consts import (
+    HEADER_ETAG,
+    HEADER_IF_MODIFIED_SINCE,
+    HEADER_IF_NONE_MATCH,
+    HEADER_LAST_MODIFIED,
+)
+
+
+class ResponseValidators:
+    """Validators and body digest of the last response that was parsed."""
+
+    def __init__(self):
+        """Initialise without a last response."""
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._body_digest: bytes | None = None
+
+    def __repr__(self):
+        """Return string representation of these validators."""
+        return f"<{self.__class__.__name__}(etag={self._etag}, last_modified={self._last_modified})>"
+
+    def store(self, response, body_digest: bytes):
+        """Remember the validators and body digest of the response."""
+        self._etag = response.headers.get(HEADER_ETAG)
+        self._last_modified = response.headers.get(HEADER_LAST_MODIFIED)
+        self._body_digest = body_digest
+
+    def forget(self):
+        """Forget the last response, so that the next body is parsed again."""
+        self._etag = None
+        self._last_modified = None
+        self._body_digest = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the headers of a request conditional on the last response."""
+        headers: dict[str, str] = {}
+        if self._etag:
+            headers[HEADER_IF_NONE_MATCH] = self._etag
+        if self._last_modified:
+            headers[HEADER_IF_MODIFIED_SINCE] = self._last_modified
+        return headers
+
+    def body_unchanged(self, body_digest: bytes) -> bool:
+        """Return if the body digest is the same as for the last response."""
+        return body_digest == self._body_digest
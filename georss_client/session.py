@@ -0,0 +1,52 @@
+"""HTTP session.
+
+Sessions keep connections to the feed servers alive between updates and can
+be shared by many feeds that are hosted on the same servers.
+"""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+# Content encodings that can be decompressed: gzip and deflate, plus brotli
+# and zstd if their optional libraries are installed.
+ACCEPT_ENCODING = URLLIB3_ACCEPT_ENCODING
+
+
+class CloseConnectionAdapter(HTTPAdapter):
+    """Adapter asking the server to close the connection after each request.
+
+    The header is added by the adapter, because feeds send prepared requests
+    which do not include the default headers of the session.
+    """
+
+    def add_headers(self, request: requests.PreparedRequest, **kwargs):
+        """Add the header closing the connection to the request."""
+        request.headers["Connection"] = "close"
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """Create a session with a connection pool suitable for polling feeds.
+
+    `pool_connections` is the number of hosts to keep connection pools for,
+    and `pool_maxsize` is the maximum number of connections kept per host.
+    If `keep_alive` is disabled, connections are closed after each request.
+    """
+    session = requests.Session()
+    adapter_class = HTTPAdapter if keep_alive else CloseConnectionAdapter
+    adapter = adapter_class(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
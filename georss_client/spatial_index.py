@@ -0,0 +1,127 @@
+"""Spatial index.
+
+Grid of fixed size cells mapping locations to keys, used to find the keys
+of all bounding boxes near a location without scanning all of them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterator
+from math import floor
+
+from .xml_parser.geometry import BoundingBox
+
+# Size of each grid cell in degrees.
+DEFAULT_CELL_SIZE_DEGREES = 1.0
+# Bounding boxes covering more cells are kept in a list checked on each query.
+MAX_CELLS_PER_ENTRY = 256
+
+
+class SpatialIndex:
+    """Grid index of bounding boxes by key."""
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE_DEGREES):
+        """Initialise the spatial index."""
+        self._cell_size: float = cell_size
+        self._rows: int = max(1, int(180.0 // cell_size))
+        self._columns: int = max(1, int(360.0 // cell_size))
+        self._bounding_boxes: dict[Hashable, BoundingBox] = {}
+        self._cells: dict[tuple[int, int], set[Hashable]] = {}
+        self._oversized: set[Hashable] = set()
+
+    def __repr__(self):
+        """Return string representation of this spatial index."""
+        return f"<{self.__class__.__name__}(entries={len(self)}, cell_size={self._cell_size})>"
+
+    def __len__(self) -> int:
+        """Return the number of indexed keys."""
+        return len(self._bounding_boxes)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Iterate over the indexed keys."""
+        return iter(self._bounding_boxes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return if the key is indexed."""
+        return key in self._bounding_boxes
+
+    def _row(self, latitude: float) -> int:
+        """Return the row of the latitude."""
+        return min(self._rows - 1, max(0, floor((latitude + 90.0) / self._cell_size)))
+
+    def _column(self, longitude: float) -> int:
+        """Return the column of the longitude."""
+        return min(
+            self._columns - 1, max(0, floor((longitude + 180.0) / self._cell_size))
+        )
+
+    def _cells_of(self, bounding_box: BoundingBox) -> Iterator[tuple[int, int]]:
+        """Return all cells overlapping the bounding box."""
+        rows = range(self._row(bounding_box.south), self._row(bounding_box.north) + 1)
+        for west, east in bounding_box.longitude_ranges():
+            columns = range(self._column(west), self._column(east) + 1)
+            for row in rows:
+                for column in columns:
+                    yield row, column
+
+    def _number_of_cells(self, bounding_box: BoundingBox) -> int:
+        """Return the number of cells overlapping the bounding box."""
+        rows = self._row(bounding_box.north) - self._row(bounding_box.south) + 1
+        columns = sum(
+            self._column(east) - self._column(west) + 1
+            for west, east in bounding_box.longitude_ranges()
+        )
+        return rows * columns
+
+    def insert(self, key: Hashable, bounding_box: BoundingBox | None):
+        """Add or replace the bounding box of the key."""
+        existing = self._bounding_boxes.get(key)
+        if existing is not None and existing == bounding_box:
+            return
+        self.remove(key)
+        if bounding_box is None:
+            return
+        self._bounding_boxes[key] = bounding_box
+        if self._number_of_cells(bounding_box) > MAX_CELLS_PER_ENTRY:
+            self._oversized.add(key)
+            return
+        for cell in self._cells_of(bounding_box):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove the key, if indexed."""
+        bounding_box = self._bounding_boxes.pop(key, None)
+        if bounding_box is None:
+            return
+        if key in self._oversized:
+            self._oversized.discard(key)
+            return
+        for cell in self._cells_of(bounding_box):
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+
+    def clear(self):
+        """Remove all keys."""
+        self._bounding_boxes.clear()
+        self._cells.clear()
+        self._oversized.clear()
+
+    def query(self, bounding_box: BoundingBox) -> set[Hashable]:
+        """Return the keys of all bounding boxes intersecting the bounding box."""
+        if self._number_of_cells(bounding_box) > len(self._cells):
+            # Cheaper to check every key than to look up every covered cell.
+            candidates = set(self._bounding_boxes)
+        else:
+            candidates = set(self._oversized)
+            for cell in self._cells_of(bounding_box):
+                keys = self._cells.get(cell)
+                if keys:
+                    candidates.update(keys)
+        return {
+            key
+            for key in candidates
+            if self._bounding_boxes[key].intersects(bounding_box)
+        }
@@ -0,0 +1,54 @@
+"""Transfer Statistics."""
+
+from __future__ import annotations
+
+
+class TransferStatistics:
+    """Sizes of the response bodies of a feed, as transferred and decoded."""
+
+    def __init__(self):
+        """Initialise empty statistics."""
+        self._responses: int = 0
+        self._transferred_size: int = 0
+        self._body_size: int = 0
+        self._content_encoding: str | None = None
+
+    def __repr__(self):
+        """Return string representation of these statistics."""
+        return f"<{self.__class__.__name__}(responses={self._responses}, transferred={self._transferred_size}, body={self._body_size})>"
+
+    def record(
+        self, content_encoding: str | None, transferred_size: int, body_size: int
+    ):
+        """Record the sizes of one response body."""
+        self._responses += 1
+        self._transferred_size += transferred_size
+        self._body_size += body_size
+        self._content_encoding = content_encoding
+
+    @property
+    def responses(self) -> int:
+        """Return the number of recorded response bodies."""
+        return self._responses
+
+    @property
+    def transferred_size(self) -> int:
+        """Return the total number of bytes transferred."""
+        return self._transferred_size
+
+    @property
+    def body_size(self) -> int:
+        """Return the total number of bytes after decompression."""
+        return self._body_size
+
+    @property
+    def content_encoding(self) -> str | None:
+        """Return the content encoding of the last response body."""
+        return self._content_encoding
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Return the ratio of decompressed to transferred bytes."""
+        if self._transferred_size:
+            return self._body_size / self._transferred_size
+        return None
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from functools import lru_cache
 import logging
+from types import MappingProxyType
+from typing import IO
 
-import dateutil
 import xmltodict
 
 from georss_client.consts import (
@@ -14,105 +16,151 @@ from georss_client.consts import (
     XML_TAG_FEED,
     XML_TAG_GEO_LAT,
     XML_TAG_GEO_LONG,
+    XML_TAG_GEO_POINT,
     XML_TAG_GEORSS_POINT,
     XML_TAG_GEORSS_POLYGON,
-    XML_TAG_GML_POS,
-    XML_TAG_GML_POS_LIST,
-    XML_TAG_HEIGHT,
+    XML_TAG_GEORSS_WHERE,
+    XML_TAG_GUID,
+    XML_TAG_ID,
     XML_TAG_LAST_BUILD_DATE,
     XML_TAG_PUB_DATE,
     XML_TAG_PUBLISHED,
     XML_TAG_RSS,
-    XML_TAG_TTL,
+    XML_TAG_TITLE,
     XML_TAG_UPDATED,
-    XML_TAG_WIDTH,
+)
+from georss_client.xml_parser.conversion import (  # noqa: F401
+    KEYS_DATE,
+    KEYS_FLOAT,
+    KEYS_FLOAT_LIST,
+    KEYS_INT,
+    convert_value,
 )
 from georss_client.xml_parser.feed import Feed
+from georss_client.xml_parser.feed_item import FeedItem
+from georss_client.xml_parser.streaming_parser import (
+    EXPAT_ENCODINGS,
+    StreamingParser,
+    detect_encoding,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-DEFAULT_NAMESPACES = {
-    "http://www.w3.org/2005/Atom": None,
-    "https://www.w3.org/2005/Atom": None,
-    "http://purl.org/dc/elements/1.1/": "dc",
-    "https://purl.org/dc/elements/1.1/": "dc",
-    "http://www.georss.org/georss": "georss",
-    "https://www.georss.org/georss": "georss",
-    "http://www.ogc.org/standard/georss/": "georss",
-    "https://www.ogc.org/standard/georss/": "georss",
-    "http://www.w3.org/2003/01/geo/wgs84_pos#": "geo",
-    "https://www.w3.org/2003/01/geo/wgs84_pos#": "geo",
-    "http://www.w3.org/2003/01/geo/": "geo",
-    "https://www.w3.org/2003/01/geo/": "geo",
-    "http://www.opengis.net/gml": "gml",
-    "https://www.opengis.net/gml": "gml",
-    "http://www.gdacs.org/": "gdacs",
-    "https://www.gdacs.org/": "gdacs",
-}
-KEYS_DATE = [
-    XML_TAG_DC_DATE,
-    XML_TAG_LAST_BUILD_DATE,
-    XML_TAG_PUB_DATE,
-    XML_TAG_PUBLISHED,
-    XML_TAG_UPDATED,
-]
-KEYS_FLOAT = [XML_TAG_GEO_LAT, XML_TAG_GEO_LONG]
-KEYS_FLOAT_LIST = [
-    XML_TAG_GEORSS_POLYGON,
-    XML_TAG_GML_POS_LIST,
-    XML_TAG_GML_POS,
-    XML_TAG_GEORSS_POINT,
-]
-KEYS_INT = [XML_TAG_HEIGHT, XML_TAG_TTL, XML_TAG_WIDTH]
+DEFAULT_NAMESPACES: Mapping[str, str | None] = MappingProxyType(
+    {
+        "http://www.w3.org/2005/Atom": None,
+        "https://www.w3.org/2005/Atom": None,
+        "http://purl.org/dc/elements/1.1/": "dc",
+        "https://purl.org/dc/elements/1.1/": "dc",
+        "http://www.georss.org/georss": "georss",
+        "https://www.georss.org/georss": "georss",
+        "http://www.ogc.org/standard/georss/": "georss",
+        "https://www.ogc.org/standard/georss/": "georss",
+        "http://www.w3.org/2003/01/geo/wgs84_pos#": "geo",
+        "https://www.w3.org/2003/01/geo/wgs84_pos#": "geo",
+        "http://www.w3.org/2003/01/geo/": "geo",
+        "https://www.w3.org/2003/01/geo/": "geo",
+        "http://www.opengis.net/gml": "gml",
+        "https://www.opengis.net/gml": "gml",
+        "http://www.gdacs.org/": "gdacs",
+        "https://www.gdacs.org/": "gdacs",
+    }
+)
+# Fields of feed items that are always parsed, even with a projection: the
+# identifiers, with the title as fallback, the dates and the geometries.
+REQUIRED_FIELDS = frozenset(
+    {
+        XML_TAG_DC_DATE,
+        XML_TAG_GEO_LAT,
+        XML_TAG_GEO_LONG,
+        XML_TAG_GEO_POINT,
+        XML_TAG_GEORSS_POINT,
+        XML_TAG_GEORSS_POLYGON,
+        XML_TAG_GEORSS_WHERE,
+        XML_TAG_GUID,
+        XML_TAG_ID,
+        XML_TAG_LAST_BUILD_DATE,
+        XML_TAG_PUB_DATE,
+        XML_TAG_PUBLISHED,
+        XML_TAG_TITLE,
+        XML_TAG_UPDATED,
+    }
+)
+STREAMING_CHUNK_SIZE = 64 * 1024
+SHARED_PARSER_CACHE_SIZE = 64
 
 
 class XmlParser:
     """Built-in XML parser."""
 
-    def __init__(self, additional_namespaces: dict | None = None):
-        """Initialise the XML parser."""
-        self._namespaces = DEFAULT_NAMESPACES
-        if additional_namespaces:
-            self._namespaces.update(additional_namespaces)
+    def __init__(
+        self,
+        additional_namespaces: Mapping[str, str | None] | None = None,
+        *,
+        fields: Collection[str] | None = None,
+    ):
+        """Initialise the XML parser.
 
-    @staticmethod
-    def postprocessor(
-        path: list[str], key: str, value: str
-    ) -> tuple[str, str | float | int | datetime | tuple]:
-        """Conduct type conversion for selected keys."""
-        try:
-            if key in KEYS_DATE and value:
-                # Check if value is a dict -> need to extract #text attribute
-                if isinstance(value, dict):
-                    value = value["#text"]
-                return key, dateutil.parser.parse(value)
-            if key in KEYS_FLOAT and value:
-                return key, float(value)
-            if key in KEYS_FLOAT_LIST and value:
-                # Check if value is a dict -> need to extract #text attribute
-                if isinstance(value, dict):
-                    value = value["#text"]
-                # Turn white-space separated list of numbers into
-                # list of floats.
-                coordinate_values = value.split()
-                point_coordinates: list[float] = [
-                    float(coordinate_values[i]) for i in range(len(coordinate_values))
-                ]
-                return key, tuple(point_coordinates)
-            if key in KEYS_INT and value:
-                return key, int(value)
-        except (ValueError, TypeError) as error:
-            _LOGGER.warning("Unable to process (%s/%s): %s", key, value, error)
-        return key, value
-
-    def parse(self, xml: str) -> Feed | None:
-        """Parse the provided xml."""
+        If `fields` are provided, only these fields of the feed items are
+        parsed, in addition to the `REQUIRED_FIELDS`, and everything else is
+        skipped. The parser does not change after initialisation, and can be
+        used by many threads at the same time.
+        """
+        self._namespaces: Mapping[str, str | None] = MappingProxyType(
+            {**DEFAULT_NAMESPACES, **(additional_namespaces or {})}
+        )
+        self._fields: frozenset[str] | None = (
+            REQUIRED_FIELDS.union(fields) if fields is not None else None
+        )
+
+    def __repr__(self):
+        """Return string representation of this parser."""
+        return f"<{self.__class__.__name__}(namespaces={len(self._namespaces)}, fields={len(self._fields) if self._fields is not None else None})>"
+
+    @property
+    def namespaces(self) -> Mapping[str, str | None]:
+        """Return the namespaces of this parser."""
+        return self._namespaces
+
+    @property
+    def fields(self) -> frozenset[str] | None:
+        """Return the parsed fields of feed items, or None for all fields."""
+        return self._fields
+
+    def parse(
+        self,
+        xml: str | bytes,
+        *,
+        encoding: str | None = None,
+        max_items: int | None = None,
+    ) -> Feed | None:
+        """Parse the provided xml.
+
+        A byte order mark decides the encoding of bytes, followed by the
+        `encoding`, for example from the HTTP headers, and then the encoding
+        declared in the document. Items after the first `max_items` are
+        skipped.
+        """
+        if xml and (self._fields is not None or max_items is not None):
+            # Only the streaming parser can skip elements while parsing.
+            parser = self.streaming_parser(
+                retain_items=True, max_items=max_items, encoding=encoding
+            )
+            parser.feed(xml)
+            return parser.close()
         if xml:
+            codec = detect_encoding(xml, encoding) if isinstance(xml, bytes) else None
+            expat_encoding = None
+            if codec is not None:
+                expat_encoding = EXPAT_ENCODINGS.get(codec.name)
+                if expat_encoding is None:
+                    # Not supported by expat, so decode before parsing.
+                    xml = codec.decode(xml, "replace")[0]
             parsed_dict = xmltodict.parse(
                 xml,
+                encoding=expat_encoding,
                 process_namespaces=True,
                 namespaces=self._namespaces,
-                postprocessor=XmlParser.postprocessor,
             )
             if XML_TAG_RSS in parsed_dict:
                 rss = parsed_dict.get(XML_TAG_RSS)
@@ -121,3 +169,72 @@ class XmlParser:
             if XML_TAG_FEED in parsed_dict:
                 return Feed(parsed_dict.get(XML_TAG_FEED))
         return None
+
+    def streaming_parser(
+        self,
+        *,
+        retain_items: bool = False,
+        max_items: int | None = None,
+        encoding: str | None = None,
+    ) -> StreamingParser:
+        """Create a parser that can be fed the document in chunks."""
+        return StreamingParser(
+            self._namespaces,
+            retain_items=retain_items,
+            max_items=max_items,
+            fields=self._fields,
+            encoding=encoding,
+        )
+
+    def iterparse(
+        self, xml: str | bytes | IO | Iterable[str | bytes]
+    ) -> Iterator[FeedItem]:
+        """Parse the provided xml and yield each feed item once it is complete.
+
+        The xml can be provided as string, bytes, file-like object or as an
+        iterable of chunks. Only the item currently being parsed is kept in
+        memory, not the whole document.
+        """
+        parser = self.streaming_parser()
+        for chunk in XmlParser._chunks(xml):
+            parser.feed(chunk)
+            yield from parser.read_items()
+        parser.close()
+        yield from parser.read_items()
+
+    @staticmethod
+    def _chunks(
+        xml: str | bytes | IO | Iterable[str | bytes],
+    ) -> Iterator[str | bytes]:
+        """Split the provided xml into chunks."""
+        if isinstance(xml, (str, bytes)):
+            for i in range(0, len(xml), STREAMING_CHUNK_SIZE):
+                yield xml[i : i + STREAMING_CHUNK_SIZE]
+        elif hasattr(xml, "read"):
+            while chunk := xml.read(STREAMING_CHUNK_SIZE):
+                yield chunk
+        else:
+            yield from xml
+
+
+@lru_cache(maxsize=SHARED_PARSER_CACHE_SIZE)
+def _shared_parser(
+    additional_namespaces: frozenset, fields: frozenset | None
+) -> XmlParser:
+    """Create the parser shared by all users of the namespaces and fields."""
+    return XmlParser(dict(additional_namespaces), fields=fields)
+
+
+def shared_parser(
+    additional_namespaces: Mapping[str, str | None] | None = None,
+    fields: Collection[str] | None = None,
+) -> XmlParser:
+    """Return a parser shared by all users of the same namespaces and fields.
+
+    Feeds of the same type use the same namespaces and fields, so each type
+    of feed only builds its parser once.
+    """
+    return _shared_parser(
+        frozenset((additional_namespaces or {}).items()),
+        frozenset(fields) if fields is not None else None,
+    )
@@ -0,0 +1,115 @@
+"""Type conversion of parsed values.
+
+Values are kept as parsed text in the feed dicts, and are converted when a
+feed or feed item property reads them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import datetime
+import logging
+from types import MappingProxyType
+
+from georss_client.consts import (
+    XML_CDATA,
+    XML_TAG_DC_DATE,
+    XML_TAG_GEO_LAT,
+    XML_TAG_GEO_LONG,
+    XML_TAG_GEORSS_POINT,
+    XML_TAG_GEORSS_POLYGON,
+    XML_TAG_GML_POS,
+    XML_TAG_GML_POS_LIST,
+    XML_TAG_HEIGHT,
+    XML_TAG_LAST_BUILD_DATE,
+    XML_TAG_PUB_DATE,
+    XML_TAG_PUBLISHED,
+    XML_TAG_TTL,
+    XML_TAG_UPDATED,
+    XML_TAG_WIDTH,
+)
+from georss_client.xml_parser.date_parser import parse_date
+
+_LOGGER = logging.getLogger(__name__)
+
+KEYS_DATE = [
+    XML_TAG_DC_DATE,
+    XML_TAG_LAST_BUILD_DATE,
+    XML_TAG_PUB_DATE,
+    XML_TAG_PUBLISHED,
+    XML_TAG_UPDATED,
+]
+KEYS_FLOAT = [XML_TAG_GEO_LAT, XML_TAG_GEO_LONG]
+KEYS_FLOAT_LIST = [
+    XML_TAG_GEORSS_POLYGON,
+    XML_TAG_GML_POS_LIST,
+    XML_TAG_GML_POS,
+    XML_TAG_GEORSS_POINT,
+]
+KEYS_INT = [XML_TAG_HEIGHT, XML_TAG_TTL, XML_TAG_WIDTH]
+
+
+def _text(value):
+    """Return the text of the value, extracting the #text attribute of a dict."""
+    if isinstance(value, dict):
+        return value[XML_CDATA]
+    return value
+
+
+def _to_date(value) -> datetime:
+    """Convert the value to a date."""
+    return parse_date(_text(value))
+
+
+def _to_float_tuple(value) -> tuple[float, ...]:
+    """Convert the white-space separated list of numbers to a tuple of floats."""
+    return tuple(float(coordinate) for coordinate in _text(value).split())
+
+
+# Converter of each typed key, shared by all parsers and never modified.
+CONVERTERS: Mapping[str, Callable] = MappingProxyType(
+    dict.fromkeys(KEYS_DATE, _to_date)
+    | dict.fromkeys(KEYS_FLOAT, float)
+    | dict.fromkeys(KEYS_FLOAT_LIST, _to_float_tuple)
+    | dict.fromkeys(KEYS_INT, int)
+)
+KEYS_CONVERTED = frozenset(CONVERTERS)
+
+
+def convert_value(key: str, value):
+    """Convert the value if the key is one of the typed keys.
+
+    Repeated elements are parsed as a list, and each of their values is
+    converted separately.
+    """
+    converter = CONVERTERS.get(key)
+    if converter is None or not value:
+        return value
+    if isinstance(value, list):
+        return [_convert_single_value(converter, key, entry) for entry in value]
+    return _convert_single_value(converter, key, value)
+
+
+def convert_nested_value(key: str, value):
+    """Convert the value of the key and all typed keys nested within it."""
+    if key in CONVERTERS:
+        return convert_value(key, value)
+    if isinstance(value, dict):
+        return {
+            nested_key: convert_nested_value(nested_key, nested_value)
+            for nested_key, nested_value in value.items()
+        }
+    if isinstance(value, list):
+        return [convert_nested_value(key, entry) for entry in value]
+    return value
+
+
+def _convert_single_value(converter: Callable, key: str, value):
+    """Convert a single value of the key."""
+    if not value:
+        return value
+    try:
+        return converter(value)
+    except (KeyError, ValueError, TypeError) as error:
+        _LOGGER.warning("Unable to process (%s/%s): %s", key, value, error)
+    return value
@@ -0,0 +1,125 @@
+"""Date parser.
+
+Parses the RFC 822 and ISO 8601 dates used in feeds directly, and falls back
+to `dateutil` for anything else.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta, timezone
+from functools import lru_cache
+import re
+
+import dateutil.parser
+
+# Number of recently parsed date strings kept in the cache.
+DATE_CACHE_SIZE = 4096
+
+MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+# Example: Sun, 09 Dec 2018 07:40:00 GMT
+RFC_822_DATE = re.compile(
+    r"(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?"
+    r"(?:\s*(?:(GMT|UTC|Z)|([+-])(\d{2})(\d{2})))?",
+    re.IGNORECASE,
+)
+# Example: 2018-12-09T07:45:00+00:00
+ISO_8601_DATE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?)?"
+    r"(?:\s*(?:(Z)|([+-])(\d{2})(?::?(\d{2}))?))?",
+    re.IGNORECASE,
+)
+
+
+def _timezone(
+    utc: str | None, sign: str | None, hours: str | None, minutes: str | None
+) -> timezone | None:
+    """Return the timezone of the matched groups, or None if not provided."""
+    if utc:
+        return UTC
+    if sign:
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        if not offset:
+            return UTC
+        return timezone(-offset if sign == "-" else offset)
+    return None
+
+
+def _parse_rfc_822(value: str) -> datetime | None:
+    """Parse an RFC 822 date, or return None if the format does not match."""
+    match = RFC_822_DATE.fullmatch(value)
+    if not match:
+        return None
+    day, month, year, hour, minute, second, utc, sign, hours, minutes = match.groups()
+    month_number = MONTHS.get(month.lower())
+    if month_number is None:
+        return None
+    return datetime(
+        int(year),
+        month_number,
+        int(day),
+        int(hour),
+        int(minute),
+        int(second or 0),
+        tzinfo=_timezone(utc, sign, hours, minutes),
+    )
+
+
+def _parse_iso_8601(value: str) -> datetime | None:
+    """Parse an ISO 8601 date, or return None if the format does not match."""
+    match = ISO_8601_DATE.fullmatch(value)
+    if not match:
+        return None
+    (
+        year,
+        month,
+        day,
+        hour,
+        minute,
+        second,
+        fraction,
+        utc,
+        sign,
+        hours,
+        minutes,
+    ) = match.groups()
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        # Microseconds are truncated, as by dateutil.
+        int(fraction[:6].ljust(6, "0")) if fraction else 0,
+        tzinfo=_timezone(utc, sign, hours, minutes),
+    )
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> datetime:
+    """Parse the date, raising ValueError if it is not a valid date."""
+    value = value.strip()
+    try:
+        parsed_date = _parse_iso_8601(value) or _parse_rfc_822(value)
+    except ValueError:
+        # Matched the format but with values out of range.
+        parsed_date = None
+    if parsed_date is not None:
+        return parsed_date
+    return dateutil.parser.parse(value)
@@ -26,6 +26,11 @@ _LOGGER = logging.getLogger(__name__)
 class Feed(FeedOrFeedItem):
     """Represents a feed."""
 
+    def __init__(self, source: dict, entries: list[FeedItem] | None = None):
+        """Initialise feed, with its entries if already created."""
+        super().__init__(source)
+        self._entries: list[FeedItem] | None = entries
+
     @property
     def subtitle(self) -> str | None:
         """Return the subtitle of this feed."""
@@ -71,7 +76,13 @@ class Feed(FeedOrFeedItem):
 
     @property
     def entries(self) -> list[FeedItem]:
-        """Return the entries of this feed."""
+        """Return the entries of this feed, created once."""
+        if self._entries is None:
+            self._entries = self._create_entries()
+        return self._entries
+
+    def _create_entries(self) -> list[FeedItem]:
+        """Create the entries from the source of this feed."""
         items = self._attribute([XML_TAG_ITEM, XML_TAG_ENTRY])
         entries = []
         if items and isinstance(items, list):
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Collection
 from typing import Optional
 
 from georss_client.consts import (
@@ -13,6 +14,11 @@ from georss_client.consts import (
     XML_TAG_SUMMARY,
     XML_TAG_TITLE,
 )
+from georss_client.xml_parser.conversion import (
+    KEYS_CONVERTED,
+    convert_nested_value,
+    convert_value,
+)
 
 
 class FeedDictSource:
@@ -21,6 +27,8 @@ class FeedDictSource:
     def __init__(self, source: dict):
         """Initialise feed."""
         self._source: dict = source
+        # Converted values, kept separately so that the source stays as parsed.
+        self._converted_values: dict = {}
 
     def __repr__(self):
         """Return string representation of this feed item."""
@@ -31,11 +39,21 @@ class FeedDictSource:
         if self._source and names:
             # Try each name, and return the first value that is not None.
             for name in names:
-                value = self._source.get(name, None)
+                value = self._converted_value(name)
                 if value:
                     return value
         return None
 
+    def _converted_value(self, name: str) -> Optional:
+        """Get the value of an attribute, converted on first access."""
+        if name not in KEYS_CONVERTED:
+            return self._source.get(name, None)
+        if name not in self._converted_values:
+            self._converted_values[name] = convert_value(
+                name, self._source.get(name, None)
+            )
+        return self._converted_values[name]
+
     def _attribute_with_text(self, names: list[str]) -> Optional:
         """Get an attribute with text from this feed or feed item."""
         value = self._attribute(names)
@@ -52,10 +70,15 @@ class FeedDictSource:
             return (
                 FeedDictSource._attribute_in_structure(obj[key], keys)
                 if keys
-                else obj[key]
+                else convert_nested_value(key, obj[key])
             )
         return None
 
+    @property
+    def fingerprint(self) -> int:
+        """Return a fingerprint of the content of this feed or feed item."""
+        return hash(repr(self._source))
+
     @property
     def title(self) -> str | None:
         """Return the title of this feed or feed item."""
@@ -86,6 +109,21 @@ class FeedDictSource:
             link = link.get(XML_ATTR_HREF)
         return link
 
+    def source_without(self, keys: Collection[str]) -> dict | None:
+        """Return a copy of the source dict, without the keys."""
+        if self._source is None:
+            return None
+        return {key: value for key, value in self._source.items() if key not in keys}
+
     def get_additional_attribute(self, name: str) -> Optional:
-        """Get an additional attribute not provided as property."""
-        return self._attribute([name])
+        """Get an additional attribute not provided as property.
+
+        Typed keys nested within the attribute, like the position of a
+        geo:Point, are converted as well.
+        """
+        value = self._attribute([name])
+        if name in KEYS_CONVERTED or not isinstance(value, (dict, list)):
+            return value
+        if name not in self._converted_values:
+            self._converted_values[name] = convert_nested_value(name, value)
+        return self._converted_values[name]
@@ -19,6 +19,7 @@ from georss_client.consts import (
     XML_TAG_ID,
     XML_TAG_SOURCE,
 )
+from georss_client.xml_parser.conversion import convert_value
 from georss_client.xml_parser.feed_or_feed_item import FeedOrFeedItem
 from georss_client.xml_parser.geometry import Geometry, Point, Polygon
 
@@ -26,10 +27,24 @@ from georss_client.xml_parser.geometry import Geometry, Point, Polygon
 class FeedItem(FeedOrFeedItem):
     """Represents a feed item."""
 
+    def __init__(self, source: dict, geometries: list[Geometry] | None = None):
+        """Initialise feed item, with its geometries if already extracted."""
+        super().__init__(source)
+        self._geometries: list[Geometry] | None = geometries
+
     def __repr__(self):
         """Return string representation of this feed item."""
         return f"<{self.__class__.__name__}({self.guid})>"
 
+    @property
+    def fingerprint(self) -> int:
+        """Return a fingerprint of the content of this feed item.
+
+        Includes the geometries, which are not part of the source if they
+        were extracted by a worker process.
+        """
+        return hash((repr(self._source), tuple(self.geometries or ())))
+
     @property
     def guid(self) -> str | None:
         """Return the guid of this feed item."""
@@ -47,7 +62,16 @@ class FeedItem(FeedOrFeedItem):
 
     @property
     def geometries(self) -> list[Geometry] | None:
-        """Return all geometries of this feed item."""
+        """Return all geometries of this feed item.
+
+        The geometries are extracted once and then cached.
+        """
+        if self._geometries is None:
+            self._geometries = self._extract_geometries()
+        return self._geometries
+
+    def _extract_geometries(self) -> list[Geometry]:
+        """Extract all geometries from the source of this feed item."""
         geometries = []
         for entry in [
             self._geometry_georss_point(),
@@ -58,12 +82,8 @@ class FeedItem(FeedOrFeedItem):
         ]:
             if entry:
                 geometries.extend(entry)
-        # Filter out any duplicates.
-        unique_geometries = []
-        for i in geometries:
-            if i not in unique_geometries:
-                unique_geometries.append(i)
-        return unique_geometries
+        # Filter out any duplicates, keeping the original order.
+        return list(dict.fromkeys(geometries))
 
     def _geometry_georss_point(self) -> list[Point] | None:
         """Check for georss:point tag."""
@@ -140,8 +160,8 @@ class FeedItem(FeedOrFeedItem):
         # </geo:Point>
         point = self._attribute([XML_TAG_GEO_POINT])
         if point:
-            lat = point.get(XML_TAG_GEO_LAT)
-            long = point.get(XML_TAG_GEO_LONG)
+            lat = convert_value(XML_TAG_GEO_LAT, point.get(XML_TAG_GEO_LAT))
+            long = convert_value(XML_TAG_GEO_LONG, point.get(XML_TAG_GEO_LONG))
             if long and lat:
                 return [Point(lat, long)]
         return None
@@ -187,14 +207,7 @@ class FeedItem(FeedOrFeedItem):
         if len(polygon_data) % 2 != 0:
             # Not even number of coordinates - chop last entry.
             polygon_data = polygon_data[0 : len(polygon_data) - 1]
-        return [
-            Polygon(
-                [
-                    Point(polygon_data[i], polygon_data[i + 1])
-                    for i in range(0, len(polygon_data), 2)
-                ]
-            )
-        ]
+        return [Polygon.from_coordinates(polygon_data)]
 
     @staticmethod
     def _create_polygon_multiple(polygon_data: list) -> list[Polygon]:
@@ -207,4 +220,5 @@ class FeedItem(FeedOrFeedItem):
     @property
     def geometry(self) -> Geometry | None:
         """Return the first geometry of this feed item for backwards compatibility reasons."""
-        return self.geometries[0] if self.geometries else None
+        geometries = self.geometries
+        return geometries[0] if geometries else None
@@ -2,14 +2,142 @@
 
 from __future__ import annotations
 
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from math import asin, cos, degrees, radians, sin, sqrt
+
+
+def unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    """Return the unit vector of the coordinates on the sphere."""
+    latitude, longitude = radians(latitude), radians(longitude)
+    cos_latitude = cos(latitude)
+    return cos_latitude * cos(longitude), cos_latitude * sin(longitude), sin(latitude)
+
+
+def _edge_extreme_latitude(
+    start: tuple[float, float, float], end: tuple[float, float, float]
+) -> float | None:
+    """Return the extreme latitude between the end points of a great-circle edge.
+
+    Returns None if the edge is monotonic in latitude between its end points.
+    """
+    ax, ay, az = start
+    bx, by, bz = end
+    nx, ny, nz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+    horizontal = nx * nx + ny * ny
+    if not horizontal:
+        # Degenerate edge, or an edge along the equator.
+        return None
+    # Northernmost point of the great circle, the southernmost is opposite.
+    vx, vy, vz = -nx * nz, -ny * nz, horizontal
+    after_start = (
+        nx * (ay * vz - az * vy) + ny * (az * vx - ax * vz) + nz * (ax * vy - ay * vx)
+    )
+    before_end = (
+        nx * (vy * bz - vz * by) + ny * (vz * bx - vx * bz) + nz * (vx * by - vy * bx)
+    )
+    latitude = degrees(asin(min(1.0, vz / sqrt(vx * vx + vy * vy + vz * vz))))
+    if after_start > 0 and before_end > 0:
+        return latitude
+    if after_start < 0 and before_end < 0:
+        return -latitude
+    return None
+
+
+class BoundingBox:
+    """Represents a bounding box.
+
+    If `west` is greater than `east`, the box crosses the antimeridian.
+    """
+
+    __slots__ = ("_east", "_north", "_south", "_west")
+
+    def __init__(self, south: float, west: float, north: float, east: float):
+        """Initialise bounding box."""
+        self._south: float = south
+        self._west: float = west
+        self._north: float = north
+        self._east: float = east
+
+    def __repr__(self):
+        """Return string representation of this bounding box."""
+        return f"<{self.__class__.__name__}(south={self.south}, west={self.west}, north={self.north}, east={self.east})>"
+
+    def __eq__(self, other: object) -> bool:
+        """Return if this object is equal to other object."""
+        return self.__class__ == other.__class__ and (
+            self.south,
+            self.west,
+            self.north,
+            self.east,
+        ) == (other.south, other.west, other.north, other.east)
+
+    def __hash__(self) -> int:
+        """Return unique hash of this bounding box."""
+        return hash((self.south, self.west, self.north, self.east))
+
+    @property
+    def south(self) -> float:
+        """Return the southern latitude of this bounding box."""
+        return self._south
+
+    @property
+    def west(self) -> float:
+        """Return the western longitude of this bounding box."""
+        return self._west
+
+    @property
+    def north(self) -> float:
+        """Return the northern latitude of this bounding box."""
+        return self._north
+
+    @property
+    def east(self) -> float:
+        """Return the eastern longitude of this bounding box."""
+        return self._east
+
+    def longitude_ranges(self) -> tuple[tuple[float, float], ...]:
+        """Return the longitude ranges, split at the antimeridian."""
+        if self.west <= self.east:
+            return ((self.west, self.east),)
+        return ((self.west, 180.0), (-180.0, self.east))
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """Return if the coordinates are inside this bounding box."""
+        if not self.south <= latitude <= self.north:
+            return False
+        longitude = (longitude + 180.0) % 360.0 - 180.0
+        if self.west <= self.east:
+            return self.west <= longitude <= self.east
+        return longitude >= self.west or longitude <= self.east
+
+    def intersects(self, other: BoundingBox) -> bool:
+        """Return if this bounding box overlaps with the other bounding box."""
+        if self.south > other.north or self.north < other.south:
+            return False
+        return any(
+            west <= other_east and other_west <= east
+            for west, east in self.longitude_ranges()
+            for other_west, other_east in other.longitude_ranges()
+        )
+
 
 class Geometry:
     """Represents a geometry."""
 
+    __slots__ = ()
+
+    @property
+    def bounding_box(self) -> BoundingBox | None:
+        """Return the bounding box of this geometry."""
+        return None
+
 
 class Point(Geometry):
     """Represents a point."""
 
+    __slots__ = ("_latitude", "_longitude")
+
     def __init__(self, latitude, longitude):
         """Initialise point."""
         self._latitude = latitude
@@ -41,13 +169,83 @@ class Point(Geometry):
         """Return the longitude of this point."""
         return self._longitude
 
+    @property
+    def bounding_box(self) -> BoundingBox:
+        """Return the bounding box of this point."""
+        return BoundingBox(self.latitude, self.longitude, self.latitude, self.longitude)
+
+
+class PolygonPoints(Sequence[Point]):
+    """Read-only view of the points of a polygon, created on access."""
+
+    __slots__ = ("_coordinates",)
+
+    def __init__(self, coordinates: array):
+        """Initialise view on flat latitude/longitude pairs."""
+        self._coordinates: array = coordinates
+
+    def __repr__(self):
+        """Return string representation of these points."""
+        return repr(list(self))
+
+    def __len__(self) -> int:
+        """Return the number of points."""
+        return len(self._coordinates) // 2
+
+    def __getitem__(self, index):
+        """Return the point (or list of points) at the index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("polygon point index out of range")
+        return Point(self._coordinates[2 * index], self._coordinates[2 * index + 1])
+
+    def __iter__(self) -> Iterator[Point]:
+        """Iterate over the points."""
+        coordinates = iter(self._coordinates)
+        return (
+            Point(latitude, longitude)
+            for latitude, longitude in zip(coordinates, coordinates, strict=True)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Return if these points are equal to other points."""
+        if isinstance(other, PolygonPoints):
+            return self._coordinates == other._coordinates
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Return unique hash of these points."""
+        return hash(tuple(self._coordinates))
+
 
 class Polygon(Geometry):
-    """Represents a polygon."""
+    """Represents a polygon.
 
-    def __init__(self, points: list[Point]):
+    The coordinates are stored in a flat array of latitude/longitude pairs
+    instead of one object per point.
+    """
+
+    __slots__ = ("_bounding_box", "_coordinates")
+
+    def __init__(self, points: Iterable[Point]):
         """Initialise polygon."""
-        self._points: list[Point] = points
+        self._coordinates: array = array("d")
+        self._bounding_box: BoundingBox | None = None
+        for point in points:
+            self._coordinates.append(point.latitude)
+            self._coordinates.append(point.longitude)
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Iterable[float]) -> Polygon:
+        """Create polygon from flat latitude/longitude pairs."""
+        polygon = cls(())
+        polygon._coordinates = array("d", coordinates)
+        return polygon
 
     def __repr__(self):
         """Return string representation of this polygon."""
@@ -55,23 +253,56 @@ class Polygon(Geometry):
 
     def __hash__(self) -> int:
         """Return unique hash of this geometry."""
-        return hash(self.points)
+        return hash(tuple(self._coordinates))
 
     def __eq__(self, other: object) -> bool:
         """Return if this object is equal to other object."""
-        return self.__class__ == other.__class__ and self.points == other.points
+        return (
+            self.__class__ == other.__class__
+            and self._coordinates == other._coordinates
+        )
+
+    @property
+    def coordinates(self) -> array:
+        """Return the flat latitude/longitude pairs of this polygon."""
+        return self._coordinates
+
+    @property
+    def bounding_box(self) -> BoundingBox | None:
+        """Return the bounding box of this polygon, calculated once.
+
+        The edges are great-circle segments, which bow towards the pole
+        between their end points, so the box covers the extreme latitude of
+        each edge rather than only its vertices.
+        """
+        if self._bounding_box is None and self._coordinates:
+            latitudes = self._coordinates[0::2]
+            longitudes = self._coordinates[1::2]
+            south, north = min(latitudes), max(latitudes)
+            vertices = [
+                unit_vector(latitude, longitude)
+                for latitude, longitude in zip(latitudes, longitudes, strict=True)
+            ]
+            for start, end in zip(vertices, vertices[1:] + vertices[:1], strict=True):
+                latitude = _edge_extreme_latitude(start, end)
+                if latitude is not None:
+                    south, north = min(south, latitude), max(north, latitude)
+            west, east = min(longitudes), max(longitudes)
+            if east - west > 180.0:
+                # Most likely crossing the antimeridian; cover all longitudes.
+                west, east = -180.0, 180.0
+            self._bounding_box = BoundingBox(south, west, north, east)
+        return self._bounding_box
 
     @property
-    def points(self) -> list[Point] | None:
+    def points(self) -> Sequence[Point] | None:
         """Return the points of this polygon."""
-        return self._points
+        return PolygonPoints(self._coordinates)
 
     @property
     def centroid(self) -> Point:
         """Find the polygon's centroid as a best approximation."""
-        longitudes_list: list[float] = [point.longitude for point in self.points]
-        latitudes_list: list[float] = [point.latitude for point in self.points]
-        number_of_points: int = len(self.points)
-        longitude: float = sum(longitudes_list) / number_of_points
-        latitude: float = sum(latitudes_list) / number_of_points
+        number_of_points: int = len(self._coordinates) // 2
+        longitude: float = sum(self._coordinates[1::2]) / number_of_points
+        latitude: float = sum(self._coordinates[0::2]) / number_of_points
         return Point(latitude, longitude)
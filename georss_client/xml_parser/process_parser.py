@@ -0,0 +1,160 @@
+"""Process pool XML parser.
+
+Parses documents in worker processes, so that parsing many large feeds can
+use all cores instead of competing for the GIL. Workers return a compact
+representation of the feed: plain dicts with the parsed values and the
+geometries of each item as flat coordinates, which are turned back into
+`Feed` and `FeedItem` objects without parsing anything again. The geometry
+elements are left out of the item dicts, since they are only needed to
+extract the geometries.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Collection, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from georss_client.consts import (
+    XML_TAG_ENTRY,
+    XML_TAG_GEO_LAT,
+    XML_TAG_GEO_LONG,
+    XML_TAG_GEO_POINT,
+    XML_TAG_GEORSS_POINT,
+    XML_TAG_GEORSS_POLYGON,
+    XML_TAG_GEORSS_WHERE,
+    XML_TAG_ITEM,
+)
+from georss_client.xml_parser import shared_parser
+from georss_client.xml_parser.feed import Feed
+from georss_client.xml_parser.feed_item import FeedItem
+from georss_client.xml_parser.geometry import Geometry, Point, Polygon
+
+# Geometry as latitude/longitude tuple (point) or flat array (polygon).
+CompactGeometry = tuple[float, float] | array
+# Feed source without items, and each item source with its geometries.
+CompactFeed = tuple[dict, list[tuple[dict | None, list[CompactGeometry] | None]]]
+
+# Keys of the items in the feed source, shipped as separate item sources.
+ITEM_KEYS = frozenset((XML_TAG_ENTRY, XML_TAG_ITEM))
+# Keys of the geometries in the item source, shipped as flat coordinates.
+GEOMETRY_KEYS = frozenset(
+    (
+        XML_TAG_GEO_LAT,
+        XML_TAG_GEO_LONG,
+        XML_TAG_GEO_POINT,
+        XML_TAG_GEORSS_POINT,
+        XML_TAG_GEORSS_POLYGON,
+        XML_TAG_GEORSS_WHERE,
+    )
+)
+
+
+def _compact_geometry(geometry: Geometry) -> CompactGeometry:
+    """Return the compact representation of the geometry."""
+    if isinstance(geometry, Polygon):
+        return geometry.coordinates
+    return geometry.latitude, geometry.longitude
+
+
+def _geometry(compact_geometry: CompactGeometry) -> Geometry:
+    """Return the geometry of the compact representation."""
+    if isinstance(compact_geometry, array):
+        return Polygon.from_coordinates(compact_geometry)
+    return Point(*compact_geometry)
+
+
+def parse_compact(
+    xml: str | bytes,
+    additional_namespaces: dict | None = None,
+    fields: Collection[str] | None = None,
+    encoding: str | None = None,
+    max_items: int | None = None,
+) -> CompactFeed | None:
+    """Parse the provided xml into its compact representation."""
+    feed = shared_parser(additional_namespaces, fields).parse(
+        xml, encoding=encoding, max_items=max_items
+    )
+    if feed is None:
+        return None
+    items = []
+    for item in feed.entries:
+        geometries = item.geometries
+        items.append(
+            (
+                item.source_without(GEOMETRY_KEYS),
+                [_compact_geometry(geometry) for geometry in geometries]
+                if geometries is not None
+                else None,
+            )
+        )
+    return feed.source_without(ITEM_KEYS), items
+
+
+def rebuild_feed(compact_feed: CompactFeed | None) -> Feed | None:
+    """Return the feed of the compact representation."""
+    if compact_feed is None:
+        return None
+    source, compact_items = compact_feed
+    # Use the geometries extracted by the worker instead of extracting them
+    # again from the item sources, which no longer contain them.
+    entries = [
+        FeedItem(
+            item_source,
+            [_geometry(geometry) for geometry in compact_geometries]
+            if compact_geometries is not None
+            else None,
+        )
+        for item_source, compact_geometries in compact_items
+    ]
+    return Feed(source, entries)
+
+
+class ProcessPoolParser:
+    """Parser running on a pool of worker processes."""
+
+    def __init__(
+        self, max_workers: int | None = None, executor: Executor | None = None
+    ):
+        """Initialise the parser with its own or the provided process pool."""
+        self._executor: Executor = executor or ProcessPoolExecutor(max_workers)
+        self._owns_executor: bool = executor is None
+
+    def __repr__(self):
+        """Return string representation of this parser."""
+        return f"<{self.__class__.__name__}(executor={self._executor})>"
+
+    def parse(
+        self,
+        xml: str | bytes,
+        additional_namespaces: dict | None = None,
+        *,
+        fields: Collection[str] | None = None,
+        encoding: str | None = None,
+        max_items: int | None = None,
+    ) -> Feed | None:
+        """Parse the provided xml in a worker process."""
+        return rebuild_feed(
+            self._executor.submit(
+                parse_compact, xml, additional_namespaces, fields, encoding, max_items
+            ).result()
+        )
+
+    def parse_many(
+        self,
+        documents: Iterable[str | bytes],
+        additional_namespaces: dict | None = None,
+        *,
+        fields: Collection[str] | None = None,
+    ) -> list[Feed | None]:
+        """Parse many documents in parallel, in the given order."""
+        futures = [
+            self._executor.submit(parse_compact, xml, additional_namespaces, fields)
+            for xml in documents
+        ]
+        return [rebuild_feed(future.result()) for future in futures]
+
+    def shutdown(self):
+        """Shut down the process pool if it is owned by this parser."""
+        if self._owns_executor:
+            self._executor.shutdown()
@@ -0,0 +1,344 @@
+"""Streaming XML parser.
+
+Parses a feed document incrementally and emits each feed item as soon as its
+element is closed, without building the dict tree of the whole document.
+The resulting dicts are structured in the same way as those produced by
+`xmltodict`.
+"""
+
+from __future__ import annotations
+
+import codecs
+from collections import deque
+from collections.abc import Callable, Collection, Iterator, Mapping
+import logging
+import re
+from xml.parsers import expat
+
+from georss_client.consts import (
+    XML_CDATA,
+    XML_TAG_CHANNEL,
+    XML_TAG_ENTRY,
+    XML_TAG_FEED,
+    XML_TAG_ITEM,
+    XML_TAG_RSS,
+)
+from georss_client.xml_parser.feed import Feed
+from georss_client.xml_parser.feed_item import FeedItem
+
+_LOGGER = logging.getLogger(__name__)
+
+NAMESPACE_SEPARATOR = ":"
+XML_ATTR_PREFIX = "@"
+XML_ATTR_XMLNS = "xmlns"
+
+# Paths from the document root to the elements emitted as feed items.
+ITEM_PATHS = {
+    (XML_TAG_RSS, XML_TAG_CHANNEL, XML_TAG_ITEM),
+    (XML_TAG_FEED, XML_TAG_ENTRY),
+}
+ITEM_PATH_MAX_DEPTH = max(len(path) for path in ITEM_PATHS)
+# Encodings that expat decodes itself, by the name of their Python codec.
+EXPAT_ENCODINGS = {
+    "ascii": "US-ASCII",
+    "iso8859-1": "ISO-8859-1",
+    "utf-16": "UTF-16",
+    "utf-8": "UTF-8",
+}
+
+
+# Byte order marks that expat detects itself.
+BYTE_ORDER_MARKS = (codecs.BOM_UTF8, codecs.BOM_UTF16_BE, codecs.BOM_UTF16_LE)
+# Encoding in the XML declaration at the start of a document.
+XML_DECLARATION = b"<?xml"
+XML_DECLARATION_ENCODING = re.compile(
+    rb"<\?xml[^>]*?\sencoding\s*=\s*[\"']([A-Za-z][A-Za-z0-9._-]*)[\"']"
+)
+# Number of bytes at the start of a document searched for its encoding.
+ENCODING_DETECTION_MAX_BYTES = 1024
+
+
+def lookup_encoding(encoding: str | None) -> codecs.CodecInfo | None:
+    """Return the codec of the encoding, or None if not provided or unknown."""
+    if encoding is None:
+        return None
+    try:
+        return codecs.lookup(encoding)
+    except LookupError:
+        _LOGGER.debug("Ignoring unknown encoding %s", encoding)
+        return None
+
+
+def detect_encoding(
+    head: bytes, encoding: str | None = None
+) -> codecs.CodecInfo | None:
+    """Return the codec of the document starting with the bytes.
+
+    A byte order mark takes precedence over the provided encoding, for
+    example from the HTTP headers, which in turn overrides the encoding
+    declared in the document. Returns None if expat detects the encoding.
+    """
+    if head.startswith(BYTE_ORDER_MARKS):
+        return None
+    if encoding is None:
+        match = XML_DECLARATION_ENCODING.match(head[:ENCODING_DETECTION_MAX_BYTES])
+        if match is None:
+            return None
+        encoding = match.group(1).decode("ascii")
+    return lookup_encoding(encoding)
+
+
+def _forbid_entities(*args, **kwargs):
+    """Reject entity declarations."""
+    raise ValueError("entities are disabled")
+
+
+class StreamingParser:
+    """Incremental XML parser emitting feed items one at a time."""
+
+    def __init__(
+        self,
+        namespaces: Mapping[str, str | None],
+        postprocessor: Callable | None = None,
+        *,
+        retain_items: bool = False,
+        max_items: int | None = None,
+        fields: Collection[str] | None = None,
+        encoding: str | None = None,
+    ):
+        """Initialise the streaming parser.
+
+        With `retain_items` the feed items are kept in the feed returned by
+        `close` instead of being emitted one at a time. Items after the first
+        `max_items` are skipped. If `fields` are provided, all other child
+        elements of the feed items are skipped without building their values.
+        An `encoding` of the bytes fed into the parser, for example from the
+        HTTP headers, overrides the encoding declared in the document, but not
+        a byte order mark.
+        """
+        self._namespaces: Mapping[str, str | None] = namespaces
+        self._postprocessor: Callable | None = postprocessor
+        self._retain_items: bool = retain_items
+        self._max_items: int | None = max_items
+        self._item_count: int = 0
+        self._fields: Collection[str] | None = fields
+        # Depth of the currently skipped element, 0 if not skipping.
+        self._skip_depth: int = 0
+        self._encoding: str | None = encoding
+        # Start of the document, until its encoding can be determined.
+        self._head: bytes = b""
+        # Encodings not supported by expat are decoded before parsing.
+        self._decoder: codecs.IncrementalDecoder | None = None
+        self._parser = None
+        self._path: list[str] = []
+        self._stack: list[tuple] = []
+        self._item: dict | None = None
+        self._data: list[str] = []
+        self._namespace_declarations: dict = {}
+        self._items: deque[FeedItem] = deque()
+
+    def _create_parser(self, encoding: str | None):
+        """Create the underlying expat parser."""
+        parser = expat.ParserCreate(encoding, NAMESPACE_SEPARATOR)
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartNamespaceDeclHandler = self._start_namespace_declaration
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._characters
+        parser.EntityDeclHandler = _forbid_entities
+        return parser
+
+    def feed(self, data: bytes | str):
+        """Feed the next chunk of the document into the parser."""
+        if self._parser is None:
+            if isinstance(data, str):
+                # Text has already been decoded, so ignore the declared encoding.
+                self._parser = self._create_parser("utf-8")
+            else:
+                self._head += data
+                if not self._head_complete():
+                    return
+                data, self._head = self._head, b""
+                self._start(data)
+        self._parse(data, False)
+
+    def _head_complete(self) -> bool:
+        """Return if the start of the document determines its encoding."""
+        head = self._head
+        if len(head) >= ENCODING_DETECTION_MAX_BYTES:
+            return True
+        if len(head) < len(codecs.BOM_UTF8):
+            return False
+        if self._encoding is not None:
+            return True
+        if len(head) < len(XML_DECLARATION):
+            return not XML_DECLARATION.startswith(head)
+        return not head.startswith(XML_DECLARATION) or b"?>" in head
+
+    def _start(self, head: bytes):
+        """Create the expat parser for the encoding of the document."""
+        codec = detect_encoding(head, self._encoding)
+        if codec is None:
+            self._parser = self._create_parser(None)
+        elif codec.name in EXPAT_ENCODINGS:
+            self._parser = self._create_parser(EXPAT_ENCODINGS[codec.name])
+        else:
+            self._decoder = codec.incrementaldecoder("replace")
+            self._parser = self._create_parser("utf-8")
+
+    def _parse(self, data: bytes | str, final: bool):
+        """Parse the chunk, decoding it first if expat cannot."""
+        if self._decoder is not None and isinstance(data, bytes):
+            data = self._decoder.decode(data, final)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._parser.Parse(data, final)
+
+    def close(self) -> Feed | None:
+        """Finish parsing and return the feed, without items unless retained."""
+        if self._parser is None and self._head:
+            head, self._head = self._head, b""
+            self._start(head)
+            self._parse(head, True)
+        elif self._parser is not None:
+            self._parse(b"", True)
+        return self._root_feed()
+
+    def _root_feed(self) -> Feed | None:
+        """Return the feed of the completely parsed document."""
+        if self._item:
+            if XML_TAG_RSS in self._item:
+                rss = self._item.get(XML_TAG_RSS)
+                if rss and XML_TAG_CHANNEL in rss:
+                    return Feed(rss.get(XML_TAG_CHANNEL))
+            if XML_TAG_FEED in self._item:
+                return Feed(self._item.get(XML_TAG_FEED))
+        return None
+
+    def abort(self) -> Feed | None:
+        """Stop parsing and return the feed with what has been parsed so far.
+
+        Elements that are still open, like an incomplete item, are left out.
+        """
+        self._parser = None
+        if not self._path:
+            return self._root_feed()
+        if self._path[:1] == [XML_TAG_FEED]:
+            depth = 1
+        elif self._path[:2] == [XML_TAG_RSS, XML_TAG_CHANNEL]:
+            depth = 2
+        else:
+            return None
+        # The stack holds the parent of each open element.
+        source = self._stack[depth][0] if depth < len(self._stack) else self._item
+        return Feed(source) if source else None
+
+    @property
+    def item_count(self) -> int:
+        """Return the number of feed items parsed so far."""
+        return self._item_count
+
+    @property
+    def max_items_reached(self) -> bool:
+        """Return if the maximum number of feed items has been parsed."""
+        return self._max_items is not None and self._item_count >= self._max_items
+
+    def read_items(self) -> Iterator[FeedItem]:
+        """Return the feed items completed so far."""
+        while self._items:
+            yield self._items.popleft()
+
+    def _build_name(self, full_name: str) -> str:
+        """Replace the namespace of a name with its short form."""
+        i = full_name.rfind(NAMESPACE_SEPARATOR)
+        if i == -1:
+            return full_name
+        namespace, name = full_name[:i], full_name[i + 1 :]
+        short_namespace = self._namespaces.get(namespace, namespace)
+        if not short_namespace:
+            return name
+        return f"{short_namespace}{NAMESPACE_SEPARATOR}{name}"
+
+    def _start_namespace_declaration(self, prefix: str | None, uri: str):
+        """Record a namespace declaration of the next element."""
+        self._namespace_declarations[prefix or ""] = uri
+
+    def _start_element(self, full_name: str, attrs: list[str]):
+        """Handle the start of an element."""
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        name = self._build_name(full_name)
+        if (
+            self._fields is not None
+            and name not in self._fields
+            and len(self._path) <= ITEM_PATH_MAX_DEPTH
+            and tuple(self._path) in ITEM_PATHS
+        ):
+            # Child element of a feed item that is not projected.
+            self._skip_depth = 1
+            self._namespace_declarations = {}
+            return
+        self._path.append(name)
+        self._stack.append((self._item, self._data))
+        attributes = dict(zip(attrs[0::2], attrs[1::2], strict=True))
+        if self._namespace_declarations:
+            attributes[XML_ATTR_XMLNS] = self._namespace_declarations
+            self._namespace_declarations = {}
+        item = None
+        for key, value in attributes.items():
+            item = self._push_data(item, XML_ATTR_PREFIX + self._build_name(key), value)
+        self._item = item
+        self._data = []
+
+    def _end_element(self, full_name: str):
+        """Handle the end of an element."""
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        data = None
+        if self._data:
+            data = "".join(self._data).strip() or None
+        item = self._item
+        self._item, self._data = self._stack.pop()
+        if item is not None:
+            if data:
+                item = self._push_data(item, XML_CDATA, data)
+            value = item
+        else:
+            value = data
+        if len(self._path) <= ITEM_PATH_MAX_DEPTH and tuple(self._path) in ITEM_PATHS:
+            if not self.max_items_reached:
+                self._item_count += 1
+                if self._retain_items:
+                    self._item = self._push_data(self._item, self._path[-1], value)
+                else:
+                    self._items.append(FeedItem(value))
+        else:
+            self._item = self._push_data(self._item, self._path[-1], value)
+        self._path.pop()
+
+    def _characters(self, data: str):
+        """Handle character data."""
+        if not self._skip_depth:
+            self._data.append(data)
+
+    def _push_data(self, item: dict | None, key: str, data) -> dict | None:
+        """Add a value to the dict of the current element."""
+        if self._postprocessor is not None:
+            result = self._postprocessor(self._path, key, data)
+            if result is None:
+                return item
+            key, data = result
+        if item is None:
+            item = {}
+        if key in item:
+            value = item[key]
+            if isinstance(value, list):
+                value.append(data)
+            else:
+                item[key] = [value, data]
+        else:
+            item[key] = data
+        return item
@@ -0,0 +1,67 @@
+"""Test utilities for asynchronous feeds."""
+
+import contextlib
+import gzip
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from georss_client.async_feed import AsyncGeoRssFeed
+from tests import MockGeoRssFeed
+
+
+class MockAsyncGeoRssFeed(AsyncGeoRssFeed, MockGeoRssFeed):
+    """Mock asynchronous GeoRSS feed."""
+
+
+class FeedServer:
+    """Local HTTP server serving a configurable feed document."""
+
+    def __init__(self):
+        """Initialise the server."""
+        self.body: bytes = b""
+        self.status: int = 200
+        self.etag: str | None = None
+        self.compress: bool = False
+        self.content_type: str | None = None
+        # Repeat the body in chunks until the client disconnects.
+        self.endless: bool = False
+        self.requests: list[web.Request] = []
+        app = web.Application()
+        app.router.add_get("/{name}", self._handle)
+        self._server = TestServer(app)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve the current feed document."""
+        self.requests.append(request)
+        headers = {"ETag": self.etag} if self.etag else {}
+        if self.content_type:
+            headers["Content-Type"] = self.content_type
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers=headers)
+        body = self.body
+        if self.compress and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        if self.endless:
+            response = web.StreamResponse(status=self.status, headers=headers)
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            with contextlib.suppress(ConnectionError):
+                while True:
+                    await response.write(body)
+            return response
+        return web.Response(status=self.status, body=body, headers=headers)
+
+    def url(self, name: str = "feed") -> str:
+        """Return the URL of a feed on this server."""
+        return str(self._server.make_url(f"/{name}"))
+
+    async def __aenter__(self):
+        """Start the server."""
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, *args):
+        """Stop the server."""
+        await self._server.close()
@@ -0,0 +1,300 @@
+"""Tests for asynchronous feed."""
+
+from unittest import mock
+from xml.parsers.expat import ExpatError
+
+import aiohttp
+import pytest
+
+from georss_client.async_feed import AsyncGeoRssFeed
+from georss_client.consts import UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
+from tests import MockGeoRssFeed
+from tests.aio_utils import FeedServer, MockAsyncGeoRssFeed
+from tests.utils import load_fixture_bytes
+
+HOME_COORDINATES_1 = (-31.0, 151.0)
+HOME_COORDINATES_2 = (-37.0, 150.0)
+
+
+@pytest.mark.asyncio
+async def test_update_ok():
+    """Test updating feed is ok."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        status, entries = await feed.update()
+        websession = feed.websession
+        # Closing synchronously leaves the session to `async_close`.
+        assert feed.close() is None
+        assert not websession.closed
+        await feed.async_close()
+        assert websession.closed
+
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+    feed_entry = entries[0]
+    assert feed_entry.title == "Title 1"
+    assert feed_entry.external_id == "1234"
+    assert feed_entry.coordinates == (-37.2345, 149.1234)
+    assert feed_entry.distance_to_home == pytest.approx(714.4, 0.1)
+
+
+@pytest.mark.asyncio
+async def test_update_ok_with_filtering_in_executor():
+    """Test updating feed with parsing offloaded to an executor."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feed = MockAsyncGeoRssFeed(
+            HOME_COORDINATES_2,
+            server.url(),
+            filter_radius=90.0,
+            filter_categories=["Category 2"],
+            parse_in_executor=True,
+        )
+        status, entries = await feed.update()
+        await feed.async_close()
+
+    assert status == UPDATE_OK
+    assert len(entries) == 1
+    assert entries[0].distance_to_home == pytest.approx(77.0, 0.1)
+
+
+@pytest.mark.asyncio
+async def test_update_bom():
+    """Test updating feed with BOM (byte order mark) is ok."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("xml_parser_bom_1.xml")
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        status, entries = await feed.update()
+        await feed.async_close()
+
+    assert status == UPDATE_OK
+    assert entries is not None
+    assert len(entries) == 0
+
+
+@pytest.mark.asyncio
+async def test_update_not_modified():
+    """Test updating feed that has not been modified since the last update."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        server.etag = '"abc123"'
+        async with aiohttp.ClientSession() as websession:
+            feed = MockAsyncGeoRssFeed(
+                HOME_COORDINATES_1, server.url(), websession=websession
+            )
+            status, entries = await feed.update()
+            assert status == UPDATE_OK
+            assert len(entries) == 5
+
+            status, entries = await feed.update()
+            assert status == UPDATE_OK_NO_DATA
+            assert entries is None
+            assert server.requests[1].headers["If-None-Match"] == '"abc123"'
+
+            # A shared session is not closed by the feed.
+            await feed.async_close()
+            assert not websession.closed
+
+
+@pytest.mark.asyncio
+async def test_update_error():
+    """Test updating feed results in error."""
+    async with FeedServer() as server:
+        server.status = 500
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        status, entries = await feed.update()
+        await feed.async_close()
+
+    assert status == UPDATE_ERROR
+    assert entries is None
+
+
+@pytest.mark.asyncio
+async def test_update_with_client_error():
+    """Test updating feed when the server cannot be reached."""
+    async with FeedServer() as server:
+        url = server.url()
+    feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, url)
+    status, entries = await feed.update()
+    await feed.async_close()
+
+    assert status == UPDATE_ERROR
+    assert entries is None
+
+
+@pytest.mark.asyncio
+async def test_update_subscriptions():
+    """Test filtering one feed update for many subscriptions."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        feed.subscribe("all", HOME_COORDINATES_1)
+        feed.subscribe("radius", HOME_COORDINATES_2, filter_radius=90.0)
+        results = await feed.update_subscriptions()
+        await feed.async_close()
+        assert len(server.requests) == 1
+
+    status, entries = results["all"]
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+    status, entries = results["radius"]
+    assert status == UPDATE_OK
+    assert len(entries) == 4
+
+
+@pytest.mark.asyncio
+async def test_update_unchanged_body():
+    """Test that an unchanged body is not parsed again."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        status, entries = await feed.update()
+        assert status == UPDATE_OK_NO_DATA
+        assert entries is None
+        server.body = load_fixture_bytes("generic_feed_4.xml")
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 3
+        await feed.async_close()
+
+
+@pytest.mark.asyncio
+async def test_update_invalid_body_parsed_again():
+    """Test that a body that fails to parse is not treated as unchanged."""
+    async with FeedServer() as server:
+        server.body = b"<rss><channel><item>"
+        server.etag = '"abc123"'
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        for _ in range(2):
+            with pytest.raises(ExpatError):
+                await feed.update()
+        assert "If-None-Match" not in server.requests[-1].headers
+        await feed.async_close()
+
+
+class MockLatin1AsyncGeoRssFeed(MockAsyncGeoRssFeed):
+    """Mock asynchronous GeoRSS feed that overrides the encoding of responses."""
+
+    def _pre_process_response(self, response):
+        """Override the encoding provided by the server."""
+        response.encoding = "iso-8859-1"
+
+
+@pytest.mark.parametrize(
+    ("feed_class", "content_type"),
+    [
+        (MockAsyncGeoRssFeed, "application/rss+xml; charset=ISO-8859-1"),
+        (MockLatin1AsyncGeoRssFeed, "application/rss+xml; charset=utf-8"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_update_encoding(feed_class, content_type):
+    """Test that the encoding of the response overrides the document."""
+    async with FeedServer() as server:
+        server.body = (
+            "<rss><channel><item><title>Zürich</title>"
+            "<georss:point xmlns:georss='http://www.georss.org/georss'>-31.0 151.0"
+            "</georss:point></item></channel></rss>"
+        ).encode("iso-8859-1")
+        server.content_type = content_type
+        feed = feed_class(HOME_COORDINATES_1, server.url())
+        status, entries = await feed.update()
+        await feed.async_close()
+
+    assert status == UPDATE_OK
+    assert [entry.title for entry in entries] == ["Zürich"]
+
+
+@pytest.mark.asyncio
+async def test_update_limits():
+    """Test that the body size and number of items are limited."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url(), max_items=2)
+        status, entries = await feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 2
+        await feed.async_close()
+        feed = MockAsyncGeoRssFeed(
+            HOME_COORDINATES_1, server.url(), max_body_size=10, max_items=1
+        )
+        status, entries = await feed.update()
+        assert status == UPDATE_ERROR
+        assert entries is None
+        # Without a content length, the download stops at the limit.
+        server.endless = True
+        status, entries = await feed.update()
+        assert status == UPDATE_ERROR
+        assert entries is None
+        await feed.async_close()
+
+
+def test_stream_not_supported():
+    """Test that streaming is rejected by asynchronous feeds."""
+    with pytest.raises(ValueError):
+        MockAsyncGeoRssFeed(HOME_COORDINATES_1, "http://test.url/feed", stream=True)
+
+
+@pytest.mark.asyncio
+async def test_update_compressed():
+    """Test updating a compressed feed records the compression ratio."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        server.compress = True
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        status, entries = await feed.update()
+        await feed.async_close()
+
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+    statistics = feed.transfer_statistics
+    assert statistics.responses == 1
+    assert statistics.content_encoding == "gzip"
+    assert statistics.body_size == len(server.body)
+    assert 0 < statistics.transferred_size < statistics.body_size
+    assert statistics.compression_ratio > 1.0
+
+
+class MockFixedUrlGeoRssFeed(MockGeoRssFeed):
+    """Mock feed with a fixed URL, like most concrete feeds."""
+
+    URL = "http://test.url/feed"
+
+    def __init__(self, home_coordinates, filter_radius=None, filter_categories=None):
+        """Initialise the feed with its fixed URL."""
+        super().__init__(
+            home_coordinates,
+            self.URL,
+            filter_radius=filter_radius,
+            filter_categories=filter_categories,
+        )
+
+
+class MockAsyncFixedUrlGeoRssFeed(AsyncGeoRssFeed, MockFixedUrlGeoRssFeed):
+    """Asynchronous version of the feed with a fixed URL."""
+
+
+@pytest.mark.asyncio
+async def test_update_fixed_url_feed():
+    """Test that arguments are passed on to the constructor of the feed."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        url = server.url()
+        async with aiohttp.ClientSession() as websession:
+            with mock.patch.object(MockFixedUrlGeoRssFeed, "URL", url):
+                feed = MockAsyncFixedUrlGeoRssFeed(
+                    HOME_COORDINATES_2,
+                    filter_radius=90.0,
+                    websession=websession,
+                    parse_in_executor=True,
+                )
+            status, entries = await feed.update()
+            await feed.async_close()
+            assert not websession.closed
+
+    assert feed.url == url
+    assert status == UPDATE_OK
+    assert len(entries) == 4
@@ -0,0 +1,83 @@
+"""Test for the asynchronous Feed Manager."""
+
+from unittest import mock
+
+import pytest
+
+from georss_client.async_feed_manager import AsyncFeedManagerBase, update_feed_managers
+from georss_client.consts import UPDATE_ERROR, UPDATE_OK
+from tests.aio_utils import FeedServer, MockAsyncGeoRssFeed
+from tests.utils import load_fixture_bytes
+
+HOME_COORDINATES_1 = (-31.0, 151.0)
+
+
+@pytest.mark.asyncio
+async def test_feed_manager():
+    """Test the asynchronous feed manager."""
+    generated_entity_external_ids = []
+    updated_entity_external_ids = []
+    removed_entity_external_ids = []
+
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feed = MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url())
+        feed_manager = AsyncFeedManagerBase(
+            feed,
+            generated_entity_external_ids.append,
+            updated_entity_external_ids.append,
+            removed_entity_external_ids.append,
+        )
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 5
+        assert len(generated_entity_external_ids) == 5
+        assert feed_manager.last_update is not None
+
+        server.body = load_fixture_bytes("generic_feed_4.xml")
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 3
+        assert len(generated_entity_external_ids) == 6
+        assert len(updated_entity_external_ids) == 2
+        assert len(removed_entity_external_ids) == 3
+
+        server.status = 500
+        await feed_manager.update()
+        assert len(feed_manager.feed_entries) == 0
+        assert len(removed_entity_external_ids) == 6
+        await feed.async_close()
+
+
+@pytest.mark.asyncio
+async def test_update_feed_managers():
+    """Test updating many feed managers concurrently."""
+    generated_entity_external_ids = []
+
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        feeds = [
+            MockAsyncGeoRssFeed(HOME_COORDINATES_1, server.url(f"feed{i}"))
+            for i in range(20)
+        ]
+        feed_managers = [
+            AsyncFeedManagerBase(feed, generated_entity_external_ids.append, None, None)
+            for feed in feeds
+        ]
+        # A failing feed does not affect the others.
+        feeds[3].update = mock.AsyncMock(side_effect=ValueError)
+        results = await update_feed_managers(feed_managers, max_concurrency=5)
+        for feed in feeds:
+            await feed.async_close()
+
+    assert len(server.requests) == 19
+    assert len(generated_entity_external_ids) == 95
+    assert [result.feed_manager for result in results] == feed_managers
+    for i, (feed_manager, result) in enumerate(
+        zip(feed_managers, results, strict=True)
+    ):
+        if i == 3:
+            assert result.status == UPDATE_ERROR
+            assert feed_manager.feed_entries == {}
+        else:
+            assert result.status == UPDATE_OK
+            assert len(feed_manager.feed_entries) == 5
+        assert result.fetch_duration >= 0.0
@@ -0,0 +1,70 @@
+"""Tests for the date parser."""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import dateutil.parser
+import pytest
+
+from georss_client.xml_parser.date_parser import parse_date
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Sun, 09 Dec 2018 07:40:00 GMT",
+        "Sun, 30 Sep 2018 21:36:48 +1000",
+        "Sun, 7 Oct 2018 19:52:00 -0200",
+        "Mon, 10 Dec 2018 01:02 UTC",
+        "10 dec 2018 01:02:03 z",
+        "10 Dec 2018 01:02:03",
+        "Sun, 09 Dec 2018 07:40:00 +0000",
+        "2018-12-09T09:00:00+00:00",
+        "2018-12-09T09:00:00Z",
+        "2018-12-09T09:00:00.123+05:30",
+        "2018-12-09T09:00:00.1234567-0330",
+        "2018-12-09T09:00:00+10",
+        "2018-09-23 08:30:00",
+        "2018-09-23T08:30:00",
+        "2018-09-23T08:30",
+        "2018-09-23",
+        " 2018-09-23T08:30:00Z ",
+        "Sun, 09 Dec 2018 07:40:00 AEST",
+        "December 9, 2018 7:40 am",
+    ],
+)
+def test_parse_date(value):
+    """Test that parsed dates match dateutil."""
+    parsed_date = parse_date(value)
+    expected = dateutil.parser.parse(value)
+    assert parsed_date == expected
+    assert parsed_date.utcoffset() == expected.utcoffset()
+
+
+def test_parse_date_time_zones():
+    """Test the time zones of parsed dates."""
+    assert parse_date("Sun, 09 Dec 2018 07:40:00 GMT").tzinfo is UTC
+    assert parse_date("2018-12-09T09:00:00+00:00").tzinfo is UTC
+    assert parse_date("2018-12-09T09:00:00-02:30").tzinfo == timezone(
+        -timedelta(hours=2, minutes=30)
+    )
+    assert parse_date("2018-09-23 08:30:00").tzinfo is None
+
+
+def test_parse_date_invalid():
+    """Test parsing invalid dates."""
+    with pytest.raises(ValueError):
+        parse_date("INVALID DATE")
+    with pytest.raises(ValueError):
+        parse_date("2018-13-45T09:00:00Z")
+    with pytest.raises(ValueError):
+        parse_date("Sun, 09 Foo 2018 07:40:00 GMT")
+
+
+def test_parse_date_cache():
+    """Test that recently parsed dates are cached."""
+    parse_date.cache_clear()
+    first = parse_date("Sun, 09 Dec 2018 07:40:00 GMT")
+    second = parse_date("Sun, 09 Dec 2018 07:40:00 GMT")
+    assert first is second
+    assert first == datetime(2018, 12, 9, 7, 40, tzinfo=UTC)
+    assert parse_date.cache_info().hits == 1
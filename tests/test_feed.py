@@ -1,15 +1,23 @@
 """Tests for feed."""
 
+import asyncio
+import codecs
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 from unittest import mock
+from xml.parsers.expat import ExpatError
 
 import pytest
 import requests
 
-from georss_client.consts import UPDATE_ERROR, UPDATE_OK
+from georss_client.consts import UPDATE_ERROR, UPDATE_OK, UPDATE_OK_NO_DATA
 from georss_client.feed import GeoRssFeed
+from georss_client.geo_rss_distance_helper import GeoRssDistanceHelper
+from georss_client.xml_parser import XmlParser
+from georss_client.xml_parser.process_parser import ProcessPoolParser
 from tests import MockGeoRssFeed
-from tests.utils import load_fixture
+from tests.aio_utils import FeedServer
+from tests.utils import load_fixture_bytes
 
 HOME_COORDINATES_1 = (-31.0, 151.0)
 HOME_COORDINATES_2 = (-37.0, 150.0)
@@ -19,9 +27,9 @@ HOME_COORDINATES_2 = (-37.0, 150.0)
 @mock.patch("requests.Session")
 def test_update_ok(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_1.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -61,14 +69,19 @@ def test_update_ok(mock_session, mock_request):
     assert feed_entry.title == "Title 5"
     assert feed_entry.external_id == "5678"
 
+    # Feeds of the same type share their parser.
+    other_feed = MockGeoRssFeed(HOME_COORDINATES_2, None)
+    other_feed.update()
+    assert other_feed.parser is feed.parser
+
 
 @mock.patch("requests.Request")
 @mock.patch("requests.Session")
 def test_update_ok_feed_2(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_2.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_2.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -89,9 +102,9 @@ def test_update_ok_feed_2(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_update_ok_feed_3(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_3.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_3.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -126,9 +139,9 @@ def test_update_ok_feed_3(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_update_ok_feed_6(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_6.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_6.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -149,9 +162,9 @@ def test_update_ok_feed_6(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_update_ok_with_radius_filtering(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_1.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_2, None, filter_radius=90.0)
@@ -168,9 +181,9 @@ def test_update_ok_with_radius_filtering(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_update_ok_with_radius_and_category_filtering(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_1.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
     )
 
     feed = MockGeoRssFeed(
@@ -201,7 +214,7 @@ def test_update_ok_with_radius_and_category_filtering(mock_session, mock_request
 @mock.patch("requests.Session")
 def test_update_error(mock_session, mock_request):
     """Test updating feed results in error."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = False
+    mock_session.return_value.send.return_value.ok = False
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
     status, entries = feed.update()
@@ -212,9 +225,7 @@ def test_update_error(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_update_with_request_exception(mock_session, mock_request):
     """Test updating feed raises exception."""
-    mock_session.return_value.__enter__.return_value.send.side_effect = (
-        requests.exceptions.RequestException
-    )
+    mock_session.return_value.send.side_effect = requests.exceptions.RequestException
 
     feed = GeoRssFeed(HOME_COORDINATES_1, None)
     status, entries = feed.update()
@@ -226,9 +237,9 @@ def test_update_with_request_exception(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_update_bom(mock_session, mock_request):
     """Test updating feed with BOM (byte order mark) is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("xml_parser_bom_1.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "xml_parser_bom_1.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -240,3 +251,618 @@ def test_update_bom(mock_session, mock_request):
     assert status == UPDATE_OK
     assert entries is not None
     assert len(entries) == 0
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_declared_encoding(mock_session, mock_request):
+    """Test that the raw body is parsed using the encoding it declares."""
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.content = (
+        "<?xml version='1.0' encoding='ISO-8859-1'?>"
+        "<rss version='2.0' xmlns:georss='http://www.georss.org/georss'>"
+        "<channel><item><title>Zürich</title>"
+        "<georss:point>-31.5 151.5</georss:point></item></channel></rss>"
+    ).encode("iso-8859-1")
+    type(response).text = mock.PropertyMock(side_effect=AssertionError)
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert [entry.title for entry in entries] == ["Zürich"]
+
+
+@mock.patch("requests.Session")
+def test_update_conditional_request(mock_session):
+    """Test updating feed sends validators and handles not modified."""
+    mock_send = mock_session.return_value.send
+    mock_send.return_value.ok = True
+    mock_send.return_value.status_code = 200
+    mock_send.return_value.headers = {
+        "ETag": '"abc123"',
+        "Last-Modified": "Sun, 23 Sep 2018 08:30:00 GMT",
+    }
+    mock_send.return_value.content = load_fixture_bytes("generic_feed_1.xml")
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, "http://test.url/feed")
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+    request = mock_send.call_args[0][0]
+    assert "If-None-Match" not in request.headers
+    assert "If-Modified-Since" not in request.headers
+
+    # Server indicates that the feed has not changed.
+    mock_send.return_value.status_code = 304
+    status, entries = feed.update()
+    assert status == UPDATE_OK_NO_DATA
+    assert entries is None
+    request = mock_send.call_args[0][0]
+    assert request.headers["If-None-Match"] == '"abc123"'
+    assert request.headers["If-Modified-Since"] == "Sun, 23 Sep 2018 08:30:00 GMT"
+    assert feed.last_timestamp == datetime.datetime(2018, 9, 23, 9, 10)
+
+    # After an error the validators are discarded.
+    mock_send.return_value.ok = False
+    mock_send.return_value.status_code = 500
+    status, entries = feed.update()
+    assert status == UPDATE_ERROR
+    mock_send.return_value.ok = True
+    mock_send.return_value.status_code = 200
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    request = mock_send.call_args[0][0]
+    assert "If-None-Match" not in request.headers
+
+
+def test_update_with_shared_session():
+    """Test updating feeds sharing the same session."""
+    session = mock.MagicMock()
+    session.send.return_value.ok = True
+    session.send.return_value.content = load_fixture_bytes("generic_feed_1.xml")
+
+    feed_1 = MockGeoRssFeed(
+        HOME_COORDINATES_1, "http://test.url/feed1", session=session
+    )
+    feed_2 = MockGeoRssFeed(
+        HOME_COORDINATES_2, "http://test.url/feed2", session=session
+    )
+    assert feed_1.session is session
+    assert feed_2.session is session
+    status, _ = feed_1.update()
+    assert status == UPDATE_OK
+    status, _ = feed_2.update()
+    assert status == UPDATE_OK
+    assert session.send.call_count == 2
+
+    # A shared session is not closed by the feed.
+    feed_1.close()
+    session.close.assert_not_called()
+
+
+@mock.patch("requests.Session")
+def test_session_owned_by_feed(mock_session):
+    """Test that the feed creates, reuses and closes its own session."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
+    )
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, "http://test.url/feed")
+    feed.update()
+    feed.update()
+    assert mock_session.call_count == 1
+    assert mock_session.return_value.send.call_count == 2
+
+    feed.close()
+    mock_session.return_value.close.assert_called_once()
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_radius_filtering_in_one_batch(mock_session, mock_request):
+    """Test that the distances of all entries are calculated in one batch."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_3.xml"
+    )
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None, filter_radius=500.0)
+    with (
+        mock.patch(
+            "georss_client.geo_rss_distance_helper.GeoRssDistanceHelper.distances_to_coordinates",
+            wraps=GeoRssDistanceHelper.distances_to_coordinates,
+        ) as mock_distances,
+        mock.patch(
+            "georss_client.geo_rss_distance_helper.GeoRssDistanceHelper.distance_to_geometry",
+            wraps=GeoRssDistanceHelper.distance_to_geometry,
+        ) as mock_distance,
+    ):
+        status, entries = feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 3
+        # One batch for all points, and one calculation per polygon.
+        assert mock_distances.call_count == 1
+        assert mock_distance.call_count == 2
+        # Distances are cached in the entries.
+        assert entries[0].distance_to_home == pytest.approx(491.7, 0.1)
+        assert entries[1].distance_to_home == pytest.approx(491.8, 0.1)
+        assert entries[2].distance_to_home == pytest.approx(176.5, 0.1)
+        assert mock_distances.call_count == 1
+        assert mock_distance.call_count == 2
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_radius_filtering_with_bounding_box(mock_session, mock_request):
+    """Test that distant entries are discarded without calculating distances."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_3.xml"
+    )
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None, filter_radius=200.0)
+    with mock.patch(
+        "georss_client.geo_rss_distance_helper.GeoRssDistanceHelper.distance_to_geometry",
+        wraps=GeoRssDistanceHelper.distance_to_geometry,
+    ) as mock_distance:
+        status, entries = feed.update()
+        assert status == UPDATE_OK
+        assert len(entries) == 1
+        assert entries[0].external_id == "3456"
+        # Only the polygon within the bounding box is measured.
+        assert mock_distance.call_count == 1
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_subscriptions(mock_session, mock_request):
+    """Test filtering one feed update for many subscriptions."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
+    )
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    feed.subscribe("all", HOME_COORDINATES_1)
+    feed.subscribe("radius", HOME_COORDINATES_2, filter_radius=90.0)
+    subscription = feed.subscribe(
+        "category",
+        HOME_COORDINATES_2,
+        filter_radius=90.0,
+        filter_categories=["Category 2"],
+    )
+    feed.subscribe("removed", HOME_COORDINATES_2)
+    feed.unsubscribe("removed")
+    assert list(feed.subscriptions) == ["all", "radius", "category"]
+    assert (
+        repr(subscription) == "<FeedSubscription(home=(-37.0, 150.0), "
+        "radius=90.0, categories=['Category 2'])>"
+    )
+
+    results = feed.update_subscriptions()
+    assert mock_session.return_value.send.call_count == 1
+    assert set(results) == {"all", "radius", "category"}
+    status, entries = results["all"]
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+    assert entries[0].distance_to_home == pytest.approx(714.4, 0.1)
+    status, entries = results["radius"]
+    assert status == UPDATE_OK
+    assert len(entries) == 4
+    assert entries[0].distance_to_home == pytest.approx(82.0, 0.1)
+    status, entries = results["category"]
+    assert status == UPDATE_OK
+    assert len(entries) == 1
+    assert entries[0].distance_to_home == pytest.approx(77.0, 0.1)
+    assert subscription.last_timestamp is not None
+
+    mock_session.return_value.send.return_value.ok = False
+    results = feed.update_subscriptions()
+    assert results == {
+        "all": (UPDATE_ERROR, None),
+        "radius": (UPDATE_ERROR, None),
+        "category": (UPDATE_ERROR, None),
+    }
+    assert subscription.last_timestamp is None
+
+
+@pytest.mark.parametrize(
+    ("fixture", "headers", "update_interval"),
+    [
+        ("generic_feed_1.xml", {}, None),
+        ("xml_parser_complex_1.xml", {}, 42 * 60.0),
+        ("xml_parser_complex_2.xml", {}, None),
+        ("xml_parser_complex_1.xml", {"Cache-Control": "public, max-age=120"}, 120.0),
+        ("xml_parser_complex_1.xml", {"Cache-Control": "no-cache"}, 42 * 60.0),
+        (
+            "generic_feed_1.xml",
+            {
+                "Date": "Sun, 23 Sep 2018 08:30:00 GMT",
+                "Expires": "Sun, 23 Sep 2018 08:45:00 GMT",
+            },
+            900.0,
+        ),
+        ("generic_feed_1.xml", {"Expires": "0"}, None),
+    ],
+)
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_interval(mock_session, mock_request, fixture, headers, update_interval):
+    """Test the update interval suggested by the feed."""
+    mock_send = mock_session.return_value.send
+    mock_send.return_value.ok = True
+    mock_send.return_value.status_code = 200
+    mock_send.return_value.headers = headers
+    mock_send.return_value.content = load_fixture_bytes(fixture)
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, "http://test.url/feed")
+    assert feed.url == "http://test.url/feed"
+    assert feed.update_interval is None
+    feed.update()
+    assert feed.update_interval == update_interval
+
+    # After an error only the time to live of the feed is kept.
+    mock_send.return_value.ok = False
+    mock_send.return_value.status_code = 500
+    feed.update()
+    assert feed.update_interval == (
+        42 * 60.0 if fixture == "xml_parser_complex_1.xml" else None
+    )
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_unchanged_body(mock_session, mock_request):
+    """Test that an unchanged body is not parsed again."""
+    mock_send = mock_session.return_value.send
+    mock_send.return_value.ok = True
+    mock_send.return_value.status_code = 200
+    mock_send.return_value.headers = {}
+    mock_send.return_value.content = load_fixture_bytes("generic_feed_1.xml")
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, "http://test.url/feed")
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+
+    with mock.patch.object(XmlParser, "parse") as mock_parse:
+        status, entries = feed.update()
+        assert status == UPDATE_OK_NO_DATA
+        assert entries is None
+        mock_parse.assert_not_called()
+
+    # The subscriptions have not received the body yet.
+    feed.subscribe("home", HOME_COORDINATES_2)
+    status, entries = feed.update_subscriptions()["home"]
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+
+    with mock.patch.object(XmlParser, "parse") as mock_parse:
+        assert feed.update_subscriptions() == {"home": (UPDATE_OK_NO_DATA, None)}
+        assert feed.update() == (UPDATE_OK_NO_DATA, None)
+        mock_parse.assert_not_called()
+
+    # A new subscription needs the feed to be parsed again.
+    feed.subscribe("work", HOME_COORDINATES_1)
+    results = feed.update_subscriptions()
+    assert results["work"][0] == UPDATE_OK
+    assert len(results["work"][1]) == 5
+
+    # A changed body is parsed.
+    mock_send.return_value.content = load_fixture_bytes("generic_feed_4.xml")
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert len(entries) == 3
+
+    # After an error the body is parsed again.
+    mock_send.return_value.ok = False
+    mock_send.return_value.status_code = 500
+    status, entries = feed.update()
+    assert status == UPDATE_ERROR
+    mock_send.return_value.ok = True
+    mock_send.return_value.status_code = 200
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert len(entries) == 3
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_invalid_body_parsed_again(mock_session, mock_request, stream):
+    """Test that a body that fails to parse is not treated as unchanged."""
+    content = b"<rss><channel><item>"
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.status_code = 200
+    response.headers = {"ETag": '"abc123"'}
+    response.content = content
+    response.iter_content.side_effect = lambda chunk_size: iter(_chunks(content))
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, "http://test.url/feed", stream=stream)
+    for _ in range(2):
+        with pytest.raises(ExpatError):
+            feed.update()
+        request = mock_session.return_value.send.call_args[0][0]
+        assert "If-None-Match" not in request.headers
+
+
+def _chunks(content, size=100):
+    """Split the content into chunks as returned by `iter_content`."""
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+@pytest.mark.parametrize(("max_items", "expected_count"), [(None, 5), (2, 2), (10, 5)])
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_stream(mock_session, mock_request, max_items, expected_count):
+    """Test parsing the feed while it is downloaded."""
+    content = load_fixture_bytes("generic_feed_1.xml")
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.status_code = 200
+    response.headers = {"Content-Length": str(len(content))}
+    response.content = content
+    response.iter_content.side_effect = lambda chunk_size: iter(_chunks(content))
+    _, expected_entries = MockGeoRssFeed(HOME_COORDINATES_1, None).update()
+
+    feed = MockGeoRssFeed(
+        HOME_COORDINATES_1,
+        "http://test.url/feed",
+        stream=True,
+        max_body_size=len(content),
+        max_items=max_items,
+    )
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert [entry.external_id for entry in entries] == [
+        entry.external_id for entry in expected_entries[:expected_count]
+    ]
+    assert entries[0].published == datetime.datetime(2018, 9, 23, 8, 30)
+    assert mock_session.return_value.send.call_args[1]["stream"] is True
+    response.close.assert_called_once()
+
+    # An unchanged body is not processed again.
+    status, entries = feed.update()
+    assert status == UPDATE_OK_NO_DATA
+    assert entries is None
+
+
+@pytest.mark.parametrize("use_process_parser", [False, True])
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_limits_without_stream(mock_session, mock_request, use_process_parser):
+    """Test that the limits also apply if the feed is not streamed."""
+    content = load_fixture_bytes("generic_feed_1.xml")
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.status_code = 200
+    response.headers = {}
+    response.content = content
+    process_parser = (
+        ProcessPoolParser(executor=ThreadPoolExecutor(1))
+        if use_process_parser
+        else None
+    )
+
+    feed = MockGeoRssFeed(
+        HOME_COORDINATES_1, None, process_parser=process_parser, max_items=2
+    )
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert [entry.external_id for entry in entries] == ["1234", "2345"]
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None, max_body_size=10, max_items=1)
+    status, entries = feed.update()
+    assert status == UPDATE_ERROR
+    assert entries is None
+    if process_parser is not None:
+        process_parser.shutdown()
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_stream_max_body_size(mock_session, mock_request):
+    """Test that the download stops once the body is too large."""
+    content = load_fixture_bytes("generic_feed_1.xml")
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.status_code = 200
+    response.headers = {"Content-Length": str(len(content))}
+    response.iter_content.side_effect = lambda chunk_size: iter(_chunks(content))
+
+    feed = MockGeoRssFeed(
+        HOME_COORDINATES_1, None, stream=True, max_body_size=len(content) - 1
+    )
+    status, entries = feed.update()
+    assert status == UPDATE_ERROR
+    assert entries is None
+    response.iter_content.assert_not_called()
+
+    # Without a content length, the download stops while reading.
+    response.headers = {}
+    status, entries = feed.update()
+    assert status == UPDATE_ERROR
+    assert entries is None
+    response.iter_content.assert_called_once()
+    assert response.close.call_count == 2
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_stream_connection_error(mock_session, mock_request):
+    """Test a connection error while the feed is downloaded."""
+    content = load_fixture_bytes("generic_feed_1.xml")
+
+    def _iter_content(chunk_size):
+        """Fail after the first chunk."""
+        yield content[:100]
+        raise requests.exceptions.ChunkedEncodingError
+
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.status_code = 200
+    response.headers = {}
+    response.iter_content.side_effect = _iter_content
+
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None, stream=True)
+    status, entries = feed.update()
+    assert status == UPDATE_ERROR
+    assert entries is None
+    response.close.assert_called_once()
+
+
+LATIN_1_FEED = (
+    "<rss><channel><item><title>Zürich</title>"
+    "<georss:point xmlns:georss='http://www.georss.org/georss'>-31.0 151.0"
+    "</georss:point></item></channel></rss>"
+).encode("iso-8859-1")
+
+
+class MockLatin1GeoRssFeed(MockGeoRssFeed):
+    """Mock GeoRSS feed that overrides the encoding of its responses."""
+
+    def _pre_process_response(self, response):
+        """Override the encoding provided by the server."""
+        response.encoding = "iso-8859-1"
+
+
+UTF_8_BOM_FEED = codecs.BOM_UTF8 + LATIN_1_FEED.decode("iso-8859-1").encode("utf-8")
+SHIFT_JIS_FEED = (
+    "<?xml version='1.0' encoding='Shift_JIS'?>"
+    + LATIN_1_FEED.decode("iso-8859-1").replace("Zürich", "東京")
+).encode("shift_jis")
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize(
+    ("feed_class", "body", "content_type", "title"),
+    [
+        (
+            MockGeoRssFeed,
+            LATIN_1_FEED,
+            "application/rss+xml; charset=ISO-8859-1",
+            "Zürich",
+        ),
+        (
+            MockLatin1GeoRssFeed,
+            LATIN_1_FEED,
+            "application/rss+xml; charset=utf-8",
+            "Zürich",
+        ),
+        (MockGeoRssFeed, UTF_8_BOM_FEED, "text/xml; charset=windows-1252", "Zürich"),
+        (MockGeoRssFeed, SHIFT_JIS_FEED, "application/rss+xml", "東京"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_update_encoding(stream, feed_class, body, content_type, title):
+    """Test that the encoding of the response overrides the document."""
+    async with FeedServer() as server:
+        server.body = body
+        server.content_type = content_type
+        feed = feed_class(HOME_COORDINATES_1, server.url(), stream=stream)
+        status, entries = await asyncio.get_running_loop().run_in_executor(
+            None, feed.update
+        )
+        feed.close()
+
+    assert status == UPDATE_OK
+    assert [entry.title for entry in entries] == [title]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.asyncio
+async def test_update_compressed(stream):
+    """Test negotiating compression and recording the compression ratio."""
+    async with FeedServer() as server:
+        server.body = load_fixture_bytes("generic_feed_1.xml")
+        server.compress = True
+        feed = MockGeoRssFeed(HOME_COORDINATES_1, server.url(), stream=stream)
+        assert feed.transfer_statistics.compression_ratio is None
+        # The blocking update runs in a thread, while the server is served
+        # by the event loop.
+        status, entries = await asyncio.get_running_loop().run_in_executor(
+            None, feed.update
+        )
+        feed.close()
+
+    assert "gzip" in server.requests[0].headers["Accept-Encoding"]
+    assert status == UPDATE_OK
+    assert len(entries) == 5
+    statistics = feed.transfer_statistics
+    assert repr(statistics).startswith("<TransferStatistics(responses=1,")
+    assert statistics.responses == 1
+    assert statistics.content_encoding == "gzip"
+    assert statistics.body_size == len(server.body)
+    assert 0 < statistics.transferred_size < statistics.body_size
+    assert statistics.compression_ratio > 1.0
+
+
+class MockProjectedGeoRssFeed(MockGeoRssFeed):
+    """Mock GeoRSS feed using only some fields of its items."""
+
+    def _fields(self):
+        """Provide the fields of feed items used by this feed."""
+        return ["author"]
+
+
+def _entry_values(entries):
+    """Return the values of the entries read by the base classes."""
+    return [
+        (
+            entry.external_id,
+            entry.title,
+            entry.category,
+            entry.published,
+            entry.distance_to_home,
+        )
+        for entry in entries
+    ]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_fields(mock_session, mock_request, stream):
+    """Test that feeds only parse the fields they use."""
+    content = load_fixture_bytes("generic_feed_1.xml")
+    response = mock_session.return_value.send.return_value
+    response.ok = True
+    response.status_code = 200
+    response.headers = {}
+    response.content = content
+    response.iter_content.side_effect = lambda chunk_size: iter(_chunks(content))
+    _, expected_entries = MockGeoRssFeed(HOME_COORDINATES_1, None).update()
+
+    feed = MockProjectedGeoRssFeed(HOME_COORDINATES_1, None, stream=stream)
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert "category" not in feed.parser.fields
+    # Identifiers, titles and dates are always parsed.
+    assert [values[:2] + values[3:] for values in _entry_values(entries)] == [
+        values[:2] + values[3:] for values in _entry_values(expected_entries)
+    ]
+    assert all(entry.category is None for entry in entries)
+    assert all(entry.description is None for entry in entries)
+    assert feed.last_timestamp == datetime.datetime(2018, 9, 23, 9, 10)
+
+    # Categories are parsed to filter by category.
+    _, expected_entries = MockGeoRssFeed(
+        HOME_COORDINATES_1, None, filter_categories=["Category 1"]
+    ).update()
+    feed = MockProjectedGeoRssFeed(
+        HOME_COORDINATES_1, None, filter_categories=["Category 1"], stream=stream
+    )
+    status, entries = feed.update()
+    assert status == UPDATE_OK
+    assert len(entries) == 1
+    assert _entry_values(entries) == _entry_values(expected_entries)
+
+    # Also for subscriptions filtering by category.
+    feed = MockProjectedGeoRssFeed(HOME_COORDINATES_1, None, stream=stream)
+    feed.subscribe("home", HOME_COORDINATES_1, filter_categories=["Category 1"])
+    status, entries = feed.update_subscriptions()["home"]
+    assert status == UPDATE_OK
+    assert _entry_values(entries) == _entry_values(expected_entries)
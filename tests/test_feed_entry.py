@@ -3,7 +3,10 @@
 import datetime
 from unittest import mock
 
+import pytest
+
 from georss_client import FeedEntry
+from georss_client.xml_parser.geometry import Point
 
 
 def test_simple_feed_entry():
@@ -56,3 +59,31 @@ def test_feed_entry_search_in_attributes():
     assert feed_entry.category == "Category 1"
     assert feed_entry.description == "Description 123"
     assert feed_entry.updated == updated
+
+
+def test_calculate_distances_to_home():
+    """Test calculating the distances of many entries in one batch."""
+
+    class CustomDistanceFeedEntry(FeedEntry):
+        """Feed entry with its own distance."""
+
+        @property
+        def distance_to_home(self) -> float:
+            """Return a fixed distance."""
+            return 42.0
+
+    home_coordinates = (-31.0, 150.0)
+    rss_entry_1 = mock.MagicMock(geometry=Point(-30.0, 151.0))
+    rss_entry_2 = mock.MagicMock(geometry=Point(-32.0, 151.0))
+    feed_entry_1 = FeedEntry(home_coordinates, rss_entry_1)
+    feed_entry_2 = FeedEntry(home_coordinates, rss_entry_2)
+    feed_entry_3 = CustomDistanceFeedEntry(home_coordinates, rss_entry_1)
+
+    FeedEntry.calculate_distances_to_home([feed_entry_1, feed_entry_2, feed_entry_3])
+    with mock.patch(
+        "georss_client.geo_rss_distance_helper.GeoRssDistanceHelper.distance_to_geometry"
+    ) as mock_distance:
+        assert feed_entry_1.distance_to_home == pytest.approx(146.8, 0.1)
+        assert feed_entry_2.distance_to_home == pytest.approx(146.4, 0.1)
+        assert feed_entry_3.distance_to_home == 42.0
+        mock_distance.assert_not_called()
@@ -1,13 +1,18 @@
 """Test for the Feed Manager."""
 
 import datetime
+import threading
 from unittest import mock
 
 import pytest
 
-from georss_client.feed_manager import FeedManagerBase
+from georss_client.consts import UPDATE_ERROR, UPDATE_OK
+from georss_client.feed_manager import FeedManagerBase, update_feed_managers
+from georss_client.geo_rss_distance_helper import GeoRssDistanceHelper
+from georss_client.spatial_index import SpatialIndex
+from georss_client.xml_parser.geometry import BoundingBox
 from tests import MockGeoRssFeed
-from tests.utils import load_fixture
+from tests.utils import load_fixture_bytes
 
 HOME_COORDINATES_1 = (-31.0, 151.0)
 HOME_COORDINATES_2 = (-37.0, 150.0)
@@ -17,9 +22,9 @@ HOME_COORDINATES_2 = (-37.0, 150.0)
 @mock.patch("requests.Session")
 def test_feed_manager(mock_session, mock_request):
     """Test the feed manager."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_1.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -89,8 +94,8 @@ def test_feed_manager(mock_session, mock_request):
     updated_entity_external_ids.clear()
     removed_entity_external_ids.clear()
 
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_4.xml")
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_4.xml"
     )
 
     feed_manager.update()
@@ -115,7 +120,7 @@ def test_feed_manager(mock_session, mock_request):
     updated_entity_external_ids.clear()
     removed_entity_external_ids.clear()
 
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = False
+    mock_session.return_value.send.return_value.ok = False
 
     feed_manager.update()
     entries = feed_manager.feed_entries
@@ -130,9 +135,9 @@ def test_feed_manager(mock_session, mock_request):
 @mock.patch("requests.Session")
 def test_feed_manager_no_timestamp(mock_session, mock_request):
     """Test updating feed is ok."""
-    mock_session.return_value.__enter__.return_value.send.return_value.ok = True
-    mock_session.return_value.__enter__.return_value.send.return_value.text = (
-        load_fixture("generic_feed_5.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_5.xml"
     )
 
     feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
@@ -168,3 +173,253 @@ def test_feed_manager_no_timestamp(mock_session, mock_request):
     assert entries is not None
     assert len(entries) == 1
     assert feed_manager.last_timestamp is None
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_feed_manager_process_update(mock_session, mock_request):
+    """Test processing a feed update fetched by the caller."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
+    )
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    generate_entity = mock.Mock()
+    remove_entity = mock.Mock()
+    feed_manager = FeedManagerBase(feed, generate_entity, mock.Mock(), remove_entity)
+
+    status, feed_entries = feed.update()
+    feed_manager.process_update(status, feed_entries)
+    assert list(feed_manager.feed_entries) == [
+        entry.external_id for entry in feed_entries
+    ]
+    assert generate_entity.call_count == 5
+
+    # An error removes all entities.
+    feed_manager.process_update(UPDATE_ERROR, None)
+    assert feed_manager.feed_entries == {}
+    assert remove_entity.call_count == 5
+
+
+def _brute_force_within_radius(feed_manager, coordinates, radius):
+    """Return the external ids within the radius by checking every entry."""
+    return {
+        external_id
+        for external_id, entry in feed_manager.feed_entries.items()
+        if entry.geometry
+        and GeoRssDistanceHelper.distance_to_geometry(coordinates, entry.geometry)
+        <= radius
+    }
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_feed_manager_spatial_queries(mock_session, mock_request):
+    """Test querying the feed entries by location."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
+    )
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    feed_manager = FeedManagerBase(feed, mock.Mock(), mock.Mock(), mock.Mock())
+    feed_manager.update()
+
+    entries = feed_manager.entries_within_radius((-37.2345, 149.1234), 1.0)
+    assert [entry.external_id for entry in entries] == ["1234"]
+    entries = feed_manager.entries_within_bounding_box(
+        BoundingBox(-37.7, 149.5, -37.6, 149.6)
+    )
+    assert {entry.external_id for entry in entries} == {"Title 3", "5678"}
+    for coordinates, radius in [((-37.5, 149.5), 30.0), ((-31.0, 151.0), 800.0)]:
+        entries = feed_manager.entries_within_radius(coordinates, radius)
+        assert {entry.external_id for entry in entries} == _brute_force_within_radius(
+            feed_manager, coordinates, radius
+        )
+
+    # The index follows added, updated and removed entries.
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_4.xml"
+    )
+    feed_manager.update()
+    entries = feed_manager.entries_within_radius((-31.0, 151.0), 2000.0)
+    assert {entry.external_id for entry in entries} == _brute_force_within_radius(
+        feed_manager, (-31.0, 151.0), 2000.0
+    )
+    assert entries
+
+    mock_session.return_value.send.return_value.ok = False
+    feed_manager.update()
+    assert feed_manager.entries_within_radius((-31.0, 151.0), 2000.0) == []
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_feed_manager_spatial_index_lazy(mock_session, mock_request):
+    """Test that the spatial index is only updated when queried."""
+    content = load_fixture_bytes("generic_feed_1.xml")
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = content
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    feed_manager = FeedManagerBase(feed, mock.Mock(), mock.Mock(), mock.Mock())
+    with mock.patch.object(
+        SpatialIndex, "insert", autospec=True, side_effect=SpatialIndex.insert
+    ) as mock_insert:
+        feed_manager.update()
+        mock_insert.assert_not_called()
+        assert feed_manager.entries_within_radius((-37.2345, 149.1234), 1.0)
+        assert mock_insert.call_count == 5
+
+        # Entries with unchanged geometries are not indexed again.
+        mock_session.return_value.send.return_value.content = content + b"\n"
+        feed_manager.update()
+        assert feed_manager.entries_within_radius((-37.2345, 149.1234), 1.0)
+        assert mock_insert.call_count == 5
+
+
+def test_update_feed_managers():
+    """Test updating many feed managers concurrently."""
+    fixture = load_fixture_bytes("generic_feed_1.xml")
+    # All feeds are fetched at the same time, or waiting for each other fails.
+    barrier = threading.Barrier(5, timeout=5.0)
+
+    def _send(request, timeout=None, stream=False):
+        """Return a response once all feeds are fetched, or an error."""
+        barrier.wait()
+        response = mock.MagicMock()
+        response.ok = "error" not in request.url
+        response.status_code = 200 if response.ok else 500
+        response.headers = {}
+        response.content = fixture
+        return response
+
+    session = mock.MagicMock()
+    session.send.side_effect = _send
+    callbacks = []
+    feed_managers = []
+    for name in ["feed1", "error", "feed2", "feed3", "feed4"]:
+        feed = MockGeoRssFeed(
+            HOME_COORDINATES_1, f"http://test.url/{name}", session=session
+        )
+        feed_managers.append(
+            FeedManagerBase(
+                feed,
+                lambda external_id, name=name: callbacks.append((name, external_id)),
+                mock.Mock(),
+                mock.Mock(),
+            )
+        )
+    broken_feed_manager = FeedManagerBase(
+        mock.MagicMock(), mock.Mock(), mock.Mock(), mock.Mock()
+    )
+    broken_feed_manager.feed.update.side_effect = ValueError
+    feed_managers.append(broken_feed_manager)
+
+    results = update_feed_managers(feed_managers, max_workers=5)
+
+    assert [result.feed_manager for result in results] == feed_managers
+    assert [result.status for result in results] == [
+        UPDATE_OK,
+        UPDATE_ERROR,
+        UPDATE_OK,
+        UPDATE_OK,
+        UPDATE_OK,
+        UPDATE_ERROR,
+    ]
+    assert results[0].fetch_duration > 0.0
+    assert results[0].process_duration >= 0.0
+    assert repr(results[1]).startswith("<FeedManagerUpdate(feed_manager=")
+    # Callbacks are called one feed manager at a time, in the given order,
+    # and in the order of the feed entries.
+    entry_ids = list(feed_managers[0].feed_entries)
+    assert callbacks == [
+        (name, external_id)
+        for name in ["feed1", "feed2", "feed3", "feed4"]
+        for external_id in entry_ids
+    ]
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_feed_manager_skip_unchanged(mock_session, mock_request):
+    """Test that unchanged entries are not updated."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
+    )
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    update_callback = mock.Mock()
+    feed_manager = FeedManagerBase(
+        feed, mock.Mock(), update_callback, mock.Mock(), skip_unchanged=True
+    )
+    feed_manager.update()
+    feed_manager.update()
+    update_callback.assert_not_called()
+
+    # Only the entry with a changed title is updated.
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_4.xml"
+    )
+    feed_manager.update()
+    assert update_callback.call_args_list == [mock.call("1234")]
+
+    # After an error the entries are generated again, but not updated.
+    mock_session.return_value.send.return_value.ok = False
+    feed_manager.update()
+    mock_session.return_value.send.return_value.ok = True
+    feed_manager.update()
+    feed_manager.update()
+    assert update_callback.call_count == 1
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_feed_manager_batch_callbacks(mock_session, mock_request):
+    """Test the batch callbacks."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_1.xml"
+    )
+    feed = MockGeoRssFeed(HOME_COORDINATES_1, None)
+    calls = []
+    feed_manager = FeedManagerBase(
+        feed,
+        None,
+        None,
+        None,
+        generate_batch_callback=lambda entries: calls.append(("generate", entries)),
+        update_batch_callback=lambda entries: calls.append(("update", entries)),
+        remove_batch_callback=lambda entries: calls.append(("remove", entries)),
+    )
+    feed_manager.update()
+    assert len(calls) == 1
+    action, entries = calls[0]
+    assert action == "generate"
+    assert list(entries) == list(feed_manager.feed_entries)
+    assert entries["1234"] is feed_manager.feed_entries["1234"]
+
+    calls.clear()
+    previous_entries = feed_manager.feed_entries
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_4.xml"
+    )
+    feed_manager.update()
+    # Removed first, then updated and generated.
+    assert [action for action, _ in calls] == ["remove", "update", "generate"]
+    removed = calls[0][1]
+    assert list(removed) == [
+        external_id
+        for external_id in previous_entries
+        if external_id not in feed_manager.feed_entries
+    ]
+    assert all(removed[key] is previous_entries[key] for key in removed)
+    assert list(calls[1][1]) == ["1234", "2345"]
+    assert list(calls[2][1]) == ["6789"]
+
+    calls.clear()
+    mock_session.return_value.send.return_value.ok = False
+    feed_manager.update()
+    assert len(calls) == 1
+    action, entries = calls[0]
+    assert action == "remove"
+    assert list(entries) == ["1234", "2345", "6789"]
+    assert feed_manager.feed_entries == {}
@@ -0,0 +1,147 @@
+"""Tests for the feed scheduler."""
+
+import threading
+import time
+from unittest import mock
+
+from georss_client.feed_scheduler import FeedScheduler
+
+# Upper bound for waiting on the scheduler, only reached if a test fails.
+TIMEOUT = 5.0
+
+
+class MockFeedManager:
+    """Feed manager recording its updates."""
+
+    def __init__(
+        self, url, update_interval=None, duration=0.0, tracker=None, error=None
+    ):
+        """Initialise the mock feed manager."""
+        self.feed = mock.Mock(url=url, update_interval=update_interval)
+        self.updates = 0
+        self._duration = duration
+        self._tracker = tracker
+        self._error = error
+        self._condition = threading.Condition()
+
+    def update(self):
+        """Record an update."""
+        with self._condition:
+            self.updates += 1
+            self._condition.notify_all()
+        if self._tracker is not None:
+            self._tracker.enter(self.feed.url)
+        time.sleep(self._duration)
+        if self._tracker is not None:
+            self._tracker.exit(self.feed.url)
+        if self._error is not None:
+            raise self._error
+
+    def wait_for_updates(self, count):
+        """Wait until the feed manager has been updated count times."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.updates >= count, TIMEOUT)
+
+
+class ConcurrencyTracker:
+    """Track the highest number of concurrent updates."""
+
+    def __init__(self):
+        """Initialise the tracker."""
+        self._condition = threading.Condition()
+        self._running = {}
+        self.max_total = 0
+        self.max_per_url = {}
+
+    def enter(self, url):
+        """Record the start of an update."""
+        with self._condition:
+            self._running[url] = self._running.get(url, 0) + 1
+            self.max_total = max(self.max_total, sum(self._running.values()))
+            self.max_per_url[url] = max(
+                self.max_per_url.get(url, 0), self._running[url]
+            )
+            self._condition.notify_all()
+
+    def exit(self, url):
+        """Record the end of an update."""
+        with self._condition:
+            self._running[url] -= 1
+
+    def wait_for_concurrency(self, count):
+        """Wait until count updates have been running at the same time."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.max_total >= count, TIMEOUT)
+
+
+def test_scheduler_updates_repeatedly():
+    """Test that all feed managers are updated repeatedly."""
+    scheduler = FeedScheduler(0.02, min_interval=0.01)
+    feed_managers = [MockFeedManager(f"http://host{i}/feed") for i in range(5)]
+    for feed_manager in feed_managers:
+        scheduler.add(feed_manager)
+        scheduler.add(feed_manager)
+    assert repr(scheduler) == "<FeedScheduler(feeds=5, default_interval=0.02)>"
+    scheduler.start()
+    try:
+        for feed_manager in feed_managers:
+            assert feed_manager.wait_for_updates(3)
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_uses_update_interval():
+    """Test that the update interval of the feed overrides the default."""
+    scheduler = FeedScheduler(0.02, min_interval=0.01, jitter=0.0)
+    default = MockFeedManager("http://host1/feed")
+    slow = MockFeedManager("http://host2/feed", update_interval=10.0)
+    scheduler.add(default)
+    scheduler.add(slow)
+    scheduler.start()
+    try:
+        assert slow.wait_for_updates(1)
+        assert default.wait_for_updates(5)
+    finally:
+        scheduler.stop()
+    assert slow.updates == 1
+
+
+def test_scheduler_limits_concurrency():
+    """Test the global and per host limits of concurrent updates."""
+    tracker = ConcurrencyTracker()
+    scheduler = FeedScheduler(
+        0.01, min_interval=0.01, jitter=0.0, max_workers=3, max_per_host=1
+    )
+    feed_managers = []
+    for i in range(4):
+        feed_managers.append(MockFeedManager("http://host1/feed", 0.01, 0.03, tracker))
+        feed_managers.append(
+            MockFeedManager(f"http://host{i + 2}/feed", 0.01, 0.03, tracker)
+        )
+    for feed_manager in feed_managers:
+        scheduler.add(feed_manager)
+    scheduler.start()
+    try:
+        assert tracker.wait_for_concurrency(3)
+        for feed_manager in feed_managers:
+            assert feed_manager.wait_for_updates(2)
+    finally:
+        scheduler.stop()
+    assert tracker.max_per_url["http://host1/feed"] == 1
+    assert tracker.max_total == 3
+
+
+def test_scheduler_remove_and_errors():
+    """Test removing feed managers and failing updates."""
+    scheduler = FeedScheduler(0.02, min_interval=0.01)
+    failing = MockFeedManager("http://host1/feed", error=ValueError)
+    removed = MockFeedManager("http://host2/feed")
+    scheduler.add(failing)
+    scheduler.add(removed)
+    scheduler.remove(removed)
+    scheduler.start()
+    try:
+        assert failing.wait_for_updates(3)
+    finally:
+        scheduler.stop()
+    assert removed.updates == 0
@@ -1,9 +1,12 @@
 """Tests for georss distance helper."""
 
+import math
 from unittest.mock import MagicMock
 
+from haversine import haversine, inverse_haversine
 import pytest
 
+from georss_client import geo_rss_distance_helper
 from georss_client.geo_rss_distance_helper import GeoRssDistanceHelper
 from georss_client.xml_parser.geometry import Point, Polygon
 
@@ -74,3 +77,131 @@ def test_distance_to_unsupported_geometry():
         home_coordinates, mock_unsupported_geometry
     )
     assert distance == float("inf")
+
+
+def _large_polygon_coordinates(number_of_points):
+    """Return flat coordinates of a polygon with many points."""
+    coordinates = []
+    for i in range(number_of_points):
+        angle = 2 * math.pi * i / number_of_points
+        coordinates.extend((-30.0 + math.sin(angle), 151.0 + math.cos(angle)))
+    return coordinates
+
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+@pytest.mark.parametrize("number_of_points", [1, 5, 1000])
+def test_distances_to_coordinates(monkeypatch, with_numpy, number_of_points):
+    """Test calculating distances to many coordinates in one batch."""
+    if not with_numpy:
+        monkeypatch.setattr(geo_rss_distance_helper, "np", None)
+    home_coordinates = (-31.0, 150.0)
+    coordinates = _large_polygon_coordinates(number_of_points)
+    expected = [
+        haversine((coordinates[i], coordinates[i + 1]), home_coordinates)
+        for i in range(0, len(coordinates), 2)
+    ]
+    distances = GeoRssDistanceHelper.distances_to_coordinates(
+        home_coordinates, coordinates
+    )
+    assert distances == pytest.approx(expected)
+    polygon = Polygon.from_coordinates(coordinates)
+    assert GeoRssDistanceHelper.distance_to_geometry(
+        home_coordinates, polygon
+    ) == pytest.approx(min(expected))
+
+
+@pytest.mark.parametrize(
+    "home_coordinates",
+    [(-31.0, 150.0), (0.0, 179.5), (0.0, -179.9), (-85.0, 20.0), (60.0, -100.0)],
+)
+@pytest.mark.parametrize("radius", [10.0, 200.0, 1500.0])
+def test_bounding_box_contains_circle(home_coordinates, radius):
+    """Test that the bounding box contains all points within the radius."""
+    bounding_box = GeoRssDistanceHelper.bounding_box(home_coordinates, radius)
+    for bearing in range(0, 360, 5):
+        latitude, longitude = inverse_haversine(
+            home_coordinates, radius * 0.9999, math.radians(bearing)
+        )
+        assert bounding_box.contains(latitude, longitude)
+    assert bounding_box.contains(*home_coordinates)
+
+
+def test_bounding_box():
+    """Test bounding box of a radius around home coordinates."""
+    bounding_box = GeoRssDistanceHelper.bounding_box((-31.0, 150.0), 100.0)
+    assert bounding_box.south == pytest.approx(-31.9, 0.01)
+    assert bounding_box.north == pytest.approx(-30.1, 0.01)
+    assert bounding_box.west == pytest.approx(148.95, 0.01)
+    assert bounding_box.east == pytest.approx(151.05, 0.01)
+    assert not bounding_box.contains(-31.0, 152.0)
+    assert not bounding_box.contains(-29.0, 150.0)
+
+
+def test_bounding_box_across_antimeridian():
+    """Test bounding box crossing the antimeridian."""
+    bounding_box = GeoRssDistanceHelper.bounding_box((0.0, 179.5), 200.0)
+    assert bounding_box.west > bounding_box.east
+    assert bounding_box.contains(0.0, -179.5)
+    assert bounding_box.contains(0.0, 180.5)
+    assert not bounding_box.contains(0.0, 170.0)
+    assert bounding_box.intersects(Point(0.5, -179.8).bounding_box)
+    assert not bounding_box.intersects(Point(0.5, -170.0).bounding_box)
+
+
+def test_bounding_box_including_pole():
+    """Test bounding box including a pole."""
+    bounding_box = GeoRssDistanceHelper.bounding_box((89.0, 10.0), 200.0)
+    assert bounding_box.north == 90.0
+    assert bounding_box.west == -180.0
+    assert bounding_box.east == 180.0
+    assert bounding_box.contains(89.5, -170.0)
+
+
+def test_outside_bounding_box():
+    """Test checking geometries against a bounding box."""
+    bounding_box = GeoRssDistanceHelper.bounding_box((-31.0, 150.0), 150.0)
+    polygon = Polygon(
+        [
+            Point(-30.0, 151.0),
+            Point(-30.0, 151.5),
+            Point(-30.5, 151.5),
+            Point(-30.5, 151.0),
+            Point(-30.0, 151.0),
+        ]
+    )
+    # The southern edge bows towards the south pole between its vertices.
+    assert polygon.bounding_box.south == pytest.approx(-30.5002, abs=1e-4)
+    assert (polygon.bounding_box.west, polygon.bounding_box.north) == (151.0, -30.0)
+    assert polygon.bounding_box.east == 151.5
+    assert not GeoRssDistanceHelper.outside_bounding_box(polygon, bounding_box)
+    assert GeoRssDistanceHelper.outside_bounding_box(Point(-35.0, 150.0), bounding_box)
+    assert not GeoRssDistanceHelper.outside_bounding_box(
+        Point(-31.5, 150.5), bounding_box
+    )
+    # Unsupported geometries are never rejected.
+    assert not GeoRssDistanceHelper.outside_bounding_box(MagicMock(), bounding_box)
+
+
+def test_polygon_bounding_box_across_antimeridian():
+    """Test bounding box of a polygon crossing the antimeridian."""
+    polygon = Polygon.from_coordinates(
+        (-16.0, 179.5, -16.0, -179.5, -17.0, -179.5, -17.0, 179.5, -16.0, 179.5)
+    )
+    assert polygon.bounding_box.south == pytest.approx(-17.0, abs=1e-3)
+    assert (polygon.bounding_box.west, polygon.bounding_box.east) == (-180.0, 180.0)
+    assert polygon.bounding_box.north == -16.0
+    bounding_box = GeoRssDistanceHelper.bounding_box((-16.5, 179.9), 20.0)
+    assert not GeoRssDistanceHelper.outside_bounding_box(polygon, bounding_box)
+
+
+def test_polygon_bounding_box_covers_great_circle_edges():
+    """Test that polygons near the edge of their bounding box are not skipped."""
+    polygon = Polygon.from_coordinates((60.0, 0.0, 60.0, 90.0, 50.0, 90.0, 50.0, 0.0))
+    home_coordinates = (68.0, 45.0)
+    # The northern edge peaks at about 67.8 at longitude 45.
+    assert polygon.bounding_box.north == pytest.approx(67.79, abs=0.01)
+    assert GeoRssDistanceHelper.distance_to_geometry(
+        home_coordinates, polygon
+    ) == pytest.approx(haversine(home_coordinates, (67.79, 45.0)), 0.05)
+    bounding_box = GeoRssDistanceHelper.bounding_box(home_coordinates, 100.0)
+    assert not GeoRssDistanceHelper.outside_bounding_box(polygon, bounding_box)
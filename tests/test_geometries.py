@@ -1,5 +1,7 @@
 """Test geometries."""
 
+import pytest
+
 from georss_client.xml_parser.geometry import Point, Polygon
 
 
@@ -59,3 +61,50 @@ def test_polygon_equality():
         ]
     )
     assert polygon1 == polygon2
+
+
+def test_polygon_hash():
+    """Test hashing polygons."""
+    polygon1 = Polygon([Point(30.0, 30.0), Point(30.0, 35.0), Point(35.0, 35.0)])
+    polygon2 = Polygon([Point(30.0, 30.0), Point(30.0, 35.0), Point(35.0, 35.0)])
+    polygon3 = Polygon([Point(30.0, 30.0), Point(35.0, 35.0), Point(30.0, 35.0)])
+    assert hash(polygon1) == hash(polygon2)
+    assert len({polygon1, polygon2, polygon3}) == 2
+
+
+def test_polygon_from_coordinates():
+    """Test creating a polygon from flat coordinates."""
+    polygon = Polygon.from_coordinates(
+        (-30.1, 150.1, -30.2, 150.2, -30.4, 150.4, -30.8, 150.8, -30.1, 150.1)
+    )
+    assert polygon == Polygon(
+        [
+            Point(-30.1, 150.1),
+            Point(-30.2, 150.2),
+            Point(-30.4, 150.4),
+            Point(-30.8, 150.8),
+            Point(-30.1, 150.1),
+        ]
+    )
+    assert list(polygon.coordinates[:4]) == [-30.1, 150.1, -30.2, 150.2]
+    points = polygon.points
+    assert len(points) == 5
+    assert points[1] == Point(-30.2, 150.2)
+    assert points[-1] == Point(-30.1, 150.1)
+    assert points[1:3] == [Point(-30.2, 150.2), Point(-30.4, 150.4)]
+    assert list(points)[3] == Point(-30.8, 150.8)
+    assert points == [
+        Point(-30.1, 150.1),
+        Point(-30.2, 150.2),
+        Point(-30.4, 150.4),
+        Point(-30.8, 150.8),
+        Point(-30.1, 150.1),
+    ]
+    with pytest.raises(IndexError):
+        points[5]  # noqa: B018
+
+
+def test_geometries_are_slotted():
+    """Test that geometries do not have a per-instance dict."""
+    assert not hasattr(Point(10.0, 15.0), "__dict__")
+    assert not hasattr(Polygon.from_coordinates((10.0, 15.0)), "__dict__")
@@ -0,0 +1,126 @@
+"""Tests for geometry engine."""
+
+import math
+
+from haversine import haversine, inverse_haversine
+import pytest
+
+from georss_client import geometry_engine
+from georss_client.geo_rss_distance_helper import EARTH_RADIUS_KM, GeoRssDistanceHelper
+from georss_client.geometry_engine import PreparedPolygon, prepare_polygon
+from georss_client.xml_parser.geometry import Point, Polygon
+
+SQUARE = Polygon(
+    [
+        Point(-30.0, 151.0),
+        Point(-30.0, 152.0),
+        Point(-31.0, 152.0),
+        Point(-31.0, 151.0),
+        Point(-30.0, 151.0),
+    ]
+)
+
+
+def _circle(center, radius, number_of_points):
+    """Return a polygon approximating a circle."""
+    points = []
+    for i in range(number_of_points):
+        latitude, longitude = inverse_haversine(
+            center, radius, 2 * math.pi * i / number_of_points
+        )
+        points.append(Point(latitude, longitude))
+    return Polygon([*points, points[0]])
+
+
+def test_contains():
+    """Test point in polygon check."""
+    polygon = PreparedPolygon(SQUARE)
+    assert polygon.contains(-30.5, 151.5)
+    assert not polygon.contains(-29.5, 151.5)
+    assert not polygon.contains(-30.5, 152.5)
+
+
+def test_contains_across_antimeridian():
+    """Test point in polygon check for a polygon crossing the antimeridian."""
+    polygon = PreparedPolygon(
+        Polygon(
+            [
+                Point(-10.0, 179.0),
+                Point(-10.0, -179.0),
+                Point(-11.0, -179.0),
+                Point(-11.0, 179.0),
+            ]
+        )
+    )
+    assert polygon.contains(-10.5, 179.5)
+    assert polygon.contains(-10.5, -179.5)
+    assert not polygon.contains(-10.5, 0.0)
+
+
+def test_contains_great_circle_edges():
+    """Test that containment follows the great-circle edges of the polygon."""
+    polygon = Polygon.from_coordinates((60.0, 0.0, 60.0, 90.0, 50.0, 90.0, 50.0, 0.0))
+    prepared_polygon = PreparedPolygon(polygon)
+    # The edges between the vertices at 60 and 50 peak at about 67.8 and 59.3.
+    assert prepared_polygon.contains(61.0, 45.0)
+    assert prepared_polygon.contains(67.5, 45.0)
+    assert not prepared_polygon.contains(68.0, 45.0)
+    assert not prepared_polygon.contains(55.0, 45.0)
+    assert GeoRssDistanceHelper.distance_to_geometry((61.0, 45.0), polygon) == 0.0
+    # Outside the polygon, the distance is measured to the southern edge.
+    assert GeoRssDistanceHelper.distance_to_geometry(
+        (55.0, 45.0), polygon
+    ) == pytest.approx(haversine((55.0, 45.0), (59.32, 45.0)), 0.01)
+
+
+def test_distance_inside_polygon():
+    """Test that the distance to a polygon containing home is 0."""
+    distance = GeoRssDistanceHelper.distance_to_geometry((-30.5, 151.5), SQUARE)
+    assert distance == 0.0
+
+
+def test_distance_to_edge():
+    """Test that the distance is measured to the closest point on an edge."""
+    home_coordinates = (-29.5, 151.5)
+    distance = GeoRssDistanceHelper.distance_to_geometry(home_coordinates, SQUARE)
+    closest_vertex = min(
+        haversine(home_coordinates, (point.latitude, point.longitude))
+        for point in SQUARE.points
+    )
+    assert distance < closest_vertex
+    # The edge along the parallel at -30.0 is closest near its middle.
+    assert distance == pytest.approx(haversine(home_coordinates, (-30.0, 151.5)), 0.01)
+
+
+def test_distance_beyond_end_of_edge():
+    """Test the distance to a vertex if no edge is closer."""
+    home_coordinates = (-29.0, 150.0)
+    distance = GeoRssDistanceHelper.distance_to_geometry(home_coordinates, SQUARE)
+    assert distance == pytest.approx(haversine(home_coordinates, (-30.0, 151.0)))
+
+
+def test_distance_empty_polygon():
+    """Test the distance to a polygon without points."""
+    polygon = PreparedPolygon(Polygon([]))
+    assert polygon.distance(-30.0, 151.0) == float("inf")
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_distance_to_circle(monkeypatch, use_numpy):
+    """Test that the distance to a large polygon is the same with and without NumPy."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(geometry_engine, "np", None)
+    center = (-30.0, 151.0)
+    polygon = PreparedPolygon(_circle(center, 50.0, 360))
+    assert polygon.number_of_edges == 360
+    distance = EARTH_RADIUS_KM * polygon.distance(-31.0, 151.0)
+    assert distance == pytest.approx(haversine(center, (-31.0, 151.0)) - 50.0, 0.001)
+    assert polygon.distance(-30.1, 151.1) == 0.0
+
+
+def test_prepare_polygon_cached():
+    """Test that equal polygons share their prepared polygon."""
+    polygon = Polygon.from_coordinates(SQUARE.coordinates)
+    assert prepare_polygon(polygon) is prepare_polygon(SQUARE)
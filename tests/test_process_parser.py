@@ -0,0 +1,130 @@
+"""Tests for process pool XML parser."""
+
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+from unittest import mock
+
+import pytest
+
+from georss_client.consts import UPDATE_OK
+from georss_client.xml_parser import XmlParser
+from georss_client.xml_parser.process_parser import (
+    GEOMETRY_KEYS,
+    ProcessPoolParser,
+    parse_compact,
+    rebuild_feed,
+)
+from tests import MockGeoRssFeed
+from tests.utils import load_fixture, load_fixture_bytes
+
+HOME_COORDINATES = (-31.0, 151.0)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "generic_feed_1.xml",
+        "generic_feed_3.xml",
+        "xml_parser_complex_1.xml",
+        "xml_parser_complex_3.xml",
+        "xml_parser_geometries_1.xml",
+        "xml_parser_geometries_2.xml",
+        "xml_parser_simple_2.xml",
+    ],
+)
+def test_rebuild_feed(filename):
+    """Test that the rebuilt feed matches the parsed feed."""
+    xml = load_fixture_bytes(filename)
+    expected = XmlParser().parse(xml)
+    compact_feed = pickle.loads(pickle.dumps(parse_compact(xml)))
+    # Geometries are only shipped as flat coordinates.
+    for item_source, _ in compact_feed[1]:
+        assert not GEOMETRY_KEYS.intersection(item_source or ())
+    feed = rebuild_feed(compact_feed)
+
+    assert feed.title == expected.title
+    assert feed.ttl == expected.ttl
+    assert feed.author == expected.author
+    assert len(feed.entries) == len(expected.entries)
+    assert feed.entries is feed.entries
+    for item, expected_item in zip(feed.entries, expected.entries, strict=True):
+        assert item.guid == expected_item.guid
+        assert item.title == expected_item.title
+        assert item.category == expected_item.category
+        assert item.published_date == expected_item.published_date
+        assert item.geometries == expected_item.geometries
+
+
+def test_rebuild_feed_fields():
+    """Test that the worker only parses the projected fields."""
+    xml = load_fixture_bytes("generic_feed_1.xml")
+    feed = rebuild_feed(parse_compact(xml, None, ["title"]))
+    expected = XmlParser().parse(xml)
+    assert [item.title for item in feed.entries] == [
+        item.title for item in expected.entries
+    ]
+    assert all(item.category is None for item in feed.entries)
+
+
+def test_rebuild_feed_fingerprint():
+    """Test that the fingerprint of rebuilt items covers their geometries."""
+    xml = (
+        "<rss xmlns:georss='http://www.georss.org/georss'><channel><item>"
+        "<title>Title 1</title><georss:point>{}</georss:point>"
+        "</item></channel></rss>"
+    )
+    fingerprints = [
+        rebuild_feed(parse_compact(xml.format(point))).entries[0].fingerprint
+        for point in ["-31.0 151.0", "-31.0 151.0", "-32.0 151.0"]
+    ]
+    assert fingerprints[0] == fingerprints[1]
+    assert fingerprints[0] != fingerprints[2]
+
+
+def test_rebuild_no_feed():
+    """Test parsing a document without feed."""
+    xml = load_fixture("xml_parser_simple_3.xml")
+    assert parse_compact(xml) is None
+    assert rebuild_feed(None) is None
+
+
+def test_process_pool_parser():
+    """Test parsing many documents in worker processes."""
+    parser = ProcessPoolParser(max_workers=2)
+    try:
+        feeds = parser.parse_many(
+            [
+                load_fixture_bytes("generic_feed_1.xml"),
+                load_fixture_bytes("xml_parser_simple_3.xml"),
+                load_fixture_bytes("generic_feed_3.xml"),
+            ]
+        )
+        feed = parser.parse(load_fixture_bytes("generic_feed_2.xml"))
+    finally:
+        parser.shutdown()
+    assert len(feeds[0].entries) == 6
+    assert feeds[1] is None
+    assert len(feeds[2].entries) == 3
+    assert feed is not None
+
+
+@mock.patch("requests.Request")
+@mock.patch("requests.Session")
+def test_update_with_process_parser(mock_session, mock_request):
+    """Test updating a feed parsed by the process pool parser."""
+    mock_session.return_value.send.return_value.ok = True
+    mock_session.return_value.send.return_value.content = load_fixture_bytes(
+        "generic_feed_3.xml"
+    )
+    with ThreadPoolExecutor() as executor:
+        parser = ProcessPoolParser(executor=executor)
+        assert repr(parser).startswith("<ProcessPoolParser(executor=")
+        feed = MockGeoRssFeed(HOME_COORDINATES, None, process_parser=parser)
+        status, entries = feed.update()
+        parser.shutdown()
+    assert status == UPDATE_OK
+    assert len(entries) == 3
+    expected_status, expected_entries = MockGeoRssFeed(HOME_COORDINATES, None).update()
+    assert [entry.distance_to_home for entry in entries] == [
+        entry.distance_to_home for entry in expected_entries
+    ]
@@ -0,0 +1,69 @@
+"""Tests for session."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from georss_client.session import CloseConnectionAdapter, create_session
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Request handler recording the headers of each request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        """Record the headers and respond with an empty body."""
+        self.server.recorded_headers.append(dict(self.headers))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        """Do not log requests."""
+
+
+@pytest.fixture
+def server():
+    """Run a local HTTP server recording request headers."""
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    http_server.recorded_headers = []
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def test_create_session():
+    """Test creating a session with a connection pool."""
+    session = create_session(pool_connections=5, pool_maxsize=20)
+    adapter = session.get_adapter("https://test.url/feed")
+    assert type(adapter) is HTTPAdapter
+    assert adapter._pool_connections == 5  # noqa: SLF001
+    assert adapter._pool_maxsize == 20  # noqa: SLF001
+    assert "Connection" not in session.headers or (
+        session.headers["Connection"] != "close"
+    )
+    session.close()
+
+
+@pytest.mark.parametrize("keep_alive", [True, False])
+def test_create_session_keep_alive(server, keep_alive):
+    """Test the connection header sent with prepared requests."""
+    session = create_session(keep_alive=keep_alive)
+    assert isinstance(
+        session.get_adapter("http://test.url/feed"), CloseConnectionAdapter
+    ) is (not keep_alive)
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed"
+    request = requests.Request(method="GET", url=url).prepare()
+    session.send(request, timeout=10)
+    session.send(request, timeout=10)
+    session.close()
+
+    assert len(server.recorded_headers) == 2
+    for headers in server.recorded_headers:
+        assert (headers.get("Connection") == "close") is (not keep_alive)
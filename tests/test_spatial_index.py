@@ -0,0 +1,60 @@
+"""Tests for the spatial index."""
+
+from georss_client.spatial_index import SpatialIndex
+from georss_client.xml_parser.geometry import BoundingBox
+
+
+def test_insert_and_query():
+    """Test querying inserted bounding boxes."""
+    index = SpatialIndex()
+    index.insert("a", BoundingBox(-30.0, 150.0, -30.0, 150.0))
+    index.insert("b", BoundingBox(-31.5, 150.5, -30.5, 152.5))
+    index.insert("c", BoundingBox(10.0, 20.0, 10.0, 20.0))
+    index.insert("d", None)
+    assert len(index) == 3
+    assert "d" not in index
+    assert index.query(BoundingBox(-30.1, 149.9, -29.9, 150.1)) == {"a"}
+    assert index.query(BoundingBox(-31.0, 152.0, -31.0, 152.0)) == {"b"}
+    assert index.query(BoundingBox(-32.0, 149.0, -29.0, 153.0)) == {"a", "b"}
+    assert index.query(BoundingBox(-90.0, -180.0, 90.0, 180.0)) == {"a", "b", "c"}
+    assert index.query(BoundingBox(0.0, 0.0, 1.0, 1.0)) == set()
+    assert repr(index) == "<SpatialIndex(entries=3, cell_size=1.0)>"
+
+
+def test_replace_and_remove():
+    """Test replacing and removing bounding boxes."""
+    index = SpatialIndex()
+    index.insert("a", BoundingBox(-30.0, 150.0, -30.0, 150.0))
+    index.insert("a", BoundingBox(10.0, 20.0, 10.0, 20.0))
+    assert index.query(BoundingBox(-30.1, 149.9, -29.9, 150.1)) == set()
+    assert index.query(BoundingBox(9.9, 19.9, 10.1, 20.1)) == {"a"}
+    index.remove("a")
+    index.remove("unknown")
+    assert len(index) == 0
+    assert index.query(BoundingBox(9.9, 19.9, 10.1, 20.1)) == set()
+
+
+def test_antimeridian():
+    """Test bounding boxes crossing the antimeridian."""
+    index = SpatialIndex()
+    index.insert("east", BoundingBox(-10.0, 179.5, -10.0, 179.5))
+    index.insert("west", BoundingBox(-10.0, -179.5, -10.0, -179.5))
+    index.insert("wide", BoundingBox(-11.0, 170.0, -9.0, -170.0))
+    assert index.query(BoundingBox(-10.5, 179.0, -9.5, -179.0)) == {
+        "east",
+        "west",
+        "wide",
+    }
+    assert index.query(BoundingBox(-10.5, -179.8, -9.5, -179.0)) == {"west", "wide"}
+
+
+def test_oversized():
+    """Test bounding boxes covering many cells."""
+    index = SpatialIndex()
+    index.insert("large", BoundingBox(-60.0, -120.0, 60.0, 120.0))
+    index.insert("small", BoundingBox(-30.0, 150.0, -30.0, 150.0))
+    assert index.query(BoundingBox(0.0, 0.0, 1.0, 1.0)) == {"large"}
+    index.remove("large")
+    assert index.query(BoundingBox(0.0, 0.0, 1.0, 1.0)) == set()
+    index.clear()
+    assert len(index) == 0
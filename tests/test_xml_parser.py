@@ -1,13 +1,15 @@
 """Tests for XML parser."""
 
+import codecs
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 from pyexpat import ExpatError
 
 import pytest
 
-from georss_client.xml_parser import XmlParser
+from georss_client.xml_parser import DEFAULT_NAMESPACES, XmlParser, shared_parser
 from georss_client.xml_parser.geometry import Point, Polygon
-from tests.utils import load_fixture
+from tests.utils import load_fixture, load_fixture_bytes
 
 
 def test_simple_1():
@@ -351,3 +353,353 @@ def test_byte_order_mark():
     # This will raise an error because the parser can't handle
     with pytest.raises(ExpatError):
         xml_parser.parse(xml)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "generic_feed_1.xml",
+        "xml_parser_complex_1.xml",
+        "xml_parser_complex_3.xml",
+        "xml_parser_geometries_1.xml",
+        "xml_parser_geometries_2.xml",
+        "xml_parser_simple_2.xml",
+    ],
+)
+def test_iterparse(filename):
+    """Test that streaming items match the items of the parsed feed."""
+    xml_parser = XmlParser()
+    xml = load_fixture(filename)
+    feed = xml_parser.parse(xml)
+    entries = feed.entries
+
+    items = list(xml_parser.iterparse(xml))
+    assert len(items) == len(entries)
+    for item, entry in zip(items, entries, strict=True):
+        assert item.guid == entry.guid
+        assert item.title == entry.title
+        assert item.published_date == entry.published_date
+        assert item.geometries == entry.geometries
+
+    # Feed the document in small chunks of bytes.
+    data = xml.encode("utf-8")
+    chunks = (data[i : i + 7] for i in range(0, len(data), 7))
+    items = list(xml_parser.iterparse(chunks))
+    assert [item.geometries for item in items] == [
+        entry.geometries for entry in entries
+    ]
+
+
+@pytest.mark.parametrize(
+    "encoding", ["ISO-8859-1", "latin1", "cp1252", "gb18030", "utf-16"]
+)
+@pytest.mark.parametrize("fields", [None, ["title"]])
+def test_parse_with_encoding(encoding, fields):
+    """Test that a provided encoding overrides the declared encoding."""
+    xml_parser = XmlParser(fields=fields)
+    xml = "<rss><channel><item><title>Zürich</title></item></channel></rss>"
+    feed = xml_parser.parse(xml.encode(encoding), encoding=encoding)
+    assert feed.entries[0].title == "Zürich"
+    # Streamed in chunks splitting multi-byte characters.
+    parser = xml_parser.streaming_parser(retain_items=True, encoding=encoding)
+    for byte in xml.encode(encoding):
+        parser.feed(bytes([byte]))
+    assert parser.close().entries[0].title == "Zürich"
+    # An unknown encoding is ignored.
+    feed = xml_parser.parse(xml.encode("utf-8"), encoding="unknown")
+    assert feed.entries[0].title == "Zürich"
+
+
+@pytest.mark.parametrize("fields", [None, ["title"]])
+def test_parse_byte_order_mark_and_declared_encoding(fields):
+    """Test that a byte order mark and the declared encoding are honoured."""
+    xml_parser = XmlParser(fields=fields)
+    xml = "<rss><channel><item><title>東京</title></item></channel></rss>"
+    documents = [
+        # A byte order mark takes precedence over the provided encoding.
+        (codecs.BOM_UTF8 + xml.encode("utf-8"), "windows-1252"),
+        (xml.encode("utf-16"), "ISO-8859-1"),
+        # Encodings not supported by expat are decoded before parsing.
+        (
+            ("<?xml version='1.0' encoding='Shift_JIS'?>" + xml).encode("shift_jis"),
+            None,
+        ),
+        (('<?xml version="1.0" encoding="utf8" ?>' + xml).encode("utf-8"), None),
+    ]
+    for data, encoding in documents:
+        feed = xml_parser.parse(data, encoding=encoding)
+        assert feed.entries[0].title == "東京"
+        parser = xml_parser.streaming_parser(retain_items=True, encoding=encoding)
+        for byte in data:
+            parser.feed(bytes([byte]))
+        assert parser.close().entries[0].title == "東京"
+
+
+def test_iterparse_is_lazy():
+    """Test that items are yielded before the whole document is parsed."""
+    xml_parser = XmlParser()
+    chunks = iter(
+        [
+            "<rss version='2.0'><channel><title>Feed Title 1</title>",
+            "<item><title>Title 1</title></item>",
+            "<item><title>Title 2</title></item>",
+            "</channel></rss>",
+        ]
+    )
+    items = xml_parser.iterparse(chunks)
+    assert next(items).title == "Title 1"
+    # Only the chunks up to the end of the first item have been consumed.
+    assert next(chunks) == "<item><title>Title 2</title></item>"
+    assert list(items) == []
+
+
+def test_streaming_parser_feed_metadata():
+    """Test that the streaming parser returns the feed metadata."""
+    xml_parser = XmlParser()
+    parser = xml_parser.streaming_parser()
+    parser.feed(load_fixture_bytes("xml_parser_complex_1.xml"))
+    items = list(parser.read_items())
+    assert len(items) == 6
+    feed = parser.close()
+    assert feed.title == "Feed Title 1"
+    assert feed.ttl == 42
+    assert feed.author == "Feed Author 1"
+    # Items are not retained in the feed.
+    assert feed.get_additional_attribute("item") is None
+
+
+@pytest.mark.parametrize(
+    ("filename", "max_items", "expected_count"),
+    [
+        ("xml_parser_complex_1.xml", None, 6),
+        ("xml_parser_complex_1.xml", 4, 4),
+        ("xml_parser_complex_1.xml", 6, 6),
+        ("generic_feed_1.xml", 1, 1),
+        ("generic_feed_1.xml", 10, 6),
+    ],
+)
+def test_streaming_parser_retain_items(filename, max_items, expected_count):
+    """Test keeping the items in the feed, up to the maximum number."""
+    xml = load_fixture_bytes(filename)
+    expected = XmlParser().parse(xml)
+    parser = XmlParser().streaming_parser(retain_items=True, max_items=max_items)
+    for i in range(0, len(xml), 200):
+        parser.feed(xml[i : i + 200])
+        if parser.max_items_reached:
+            feed = parser.abort()
+            break
+    else:
+        feed = parser.close()
+    assert list(parser.read_items()) == []
+    assert parser.item_count == expected_count
+    assert feed.author == expected.author
+    assert [item.guid for item in feed.entries] == [
+        item.guid for item in expected.entries[:expected_count]
+    ]
+
+
+def test_streaming_parser_abort():
+    """Test aborting the streaming parser before the feed has started."""
+    parser = XmlParser().streaming_parser()
+    parser.feed("<rss version='2.0'>")
+    assert parser.abort() is None
+    parser = XmlParser().streaming_parser(retain_items=True)
+    parser.feed("<rss version='2.0'><channel><title>Title</title><item><title>")
+    feed = parser.abort()
+    assert feed.title == "Title"
+    assert feed.get_additional_attribute("item") is None
+
+
+def test_iterparse_atom():
+    """Test streaming items of an Atom feed."""
+    xml_parser = XmlParser()
+    xml = (
+        "<feed xmlns='http://www.w3.org/2005/Atom' "
+        "xmlns:georss='http://www.georss.org/georss'>"
+        "<title>Feed Title 1</title>"
+        "<entry><id>1</id><georss:point>-37.1 149.2</georss:point></entry>"
+        "<entry><id>2</id><georss:point>-37.3 149.4</georss:point></entry>"
+        "</feed>"
+    )
+    items = list(xml_parser.iterparse(xml))
+    assert [item.guid for item in items] == ["1", "2"]
+    assert items[1].geometry == Point(-37.3, 149.4)
+
+
+def test_geometries_cached():
+    """Test that geometries of an item are only extracted once."""
+    xml_parser = XmlParser()
+    xml = (
+        "<rss version='2.0' xmlns:georss='http://www.georss.org/georss' "
+        "xmlns:geo='http://www.w3.org/2003/01/geo/wgs84_pos#'>"
+        "<channel><item>"
+        "<georss:point>-37.1 149.2</georss:point>"
+        "<georss:polygon>-30.1 150.1 -30.2 150.2 -30.4 150.4 -30.1 150.1"
+        "</georss:polygon>"
+        "<geo:lat>-37.1</geo:lat><geo:long>149.2</geo:long>"
+        "</item></channel></rss>"
+    )
+    feed_entry = xml_parser.parse(xml).entries[0]
+    geometries = feed_entry.geometries
+    assert feed_entry.geometries is geometries
+    assert feed_entry.geometry is geometries[0]
+    # Duplicates are removed while keeping the order of the feed.
+    assert len(geometries) == 2
+    assert geometries[0] == Point(-37.1, 149.2)
+    assert isinstance(geometries[1], Polygon)
+
+
+def test_values_converted_lazily():
+    """Test that values are only converted when read."""
+    xml_parser = XmlParser()
+    xml = (
+        "<rss version='2.0'><channel><ttl>42</ttl>"
+        "<item><pubDate>Sun, 09 Dec 2018 07:30:00 GMT</pubDate>"
+        "<updated>INVALID DATE</updated></item>"
+        "</channel></rss>"
+    )
+    feed = xml_parser.parse(xml)
+    feed_entry = feed.entries[0]
+    # The source keeps the values as parsed.
+    assert feed._source["ttl"] == "42"  # noqa: SLF001
+    assert feed_entry._source["pubDate"] == "Sun, 09 Dec 2018 07:30:00 GMT"  # noqa: SLF001
+    assert feed.ttl == 42
+    published_date = feed_entry.published_date
+    assert published_date == datetime.datetime(2018, 12, 9, 7, 30, tzinfo=datetime.UTC)
+    assert feed_entry.published_date is published_date
+    assert feed_entry._source["pubDate"] == "Sun, 09 Dec 2018 07:30:00 GMT"  # noqa: SLF001
+    assert feed_entry.updated_date is None
+
+
+def test_nested_values_converted():
+    """Test that typed keys nested in additional attributes are converted."""
+    xml_parser = XmlParser()
+    xml = (
+        "<rss version='2.0' xmlns:georss='http://www.georss.org/georss' "
+        "xmlns:gml='http://www.opengis.net/gml' "
+        "xmlns:geo='http://www.w3.org/2003/01/geo/wgs84_pos#'>"
+        "<channel><item>"
+        "<georss:where><gml:Polygon><gml:exterior><gml:LinearRing>"
+        "<gml:posList>-30.0 150.0 -30.0 151.0 -31.0 151.0 -30.0 150.0</gml:posList>"
+        "</gml:LinearRing></gml:exterior></gml:Polygon></georss:where>"
+        "<geo:Point><geo:lat>-31.5</geo:lat><geo:long>151.5</geo:long></geo:Point>"
+        "</item></channel></rss>"
+    )
+    feed_entry = xml_parser.parse(xml).entries[0]
+    where = feed_entry.get_additional_attribute("georss:where")
+    assert where["gml:Polygon"]["gml:exterior"]["gml:LinearRing"]["gml:posList"] == (
+        -30.0,
+        150.0,
+        -30.0,
+        151.0,
+        -31.0,
+        151.0,
+        -30.0,
+        150.0,
+    )
+    assert feed_entry.get_additional_attribute("geo:Point") == {
+        "geo:lat": -31.5,
+        "geo:long": 151.5,
+    }
+    assert feed_entry.get_additional_attribute("georss:where") is where
+    # The source keeps the values as parsed.
+    assert feed_entry._source["geo:Point"]["geo:lat"] == "-31.5"  # noqa: SLF001
+
+
+def test_additional_namespaces():
+    """Test that additional namespaces only apply to their parser."""
+    xml_parser = XmlParser({"http://example.com/ns": "ex"})
+    assert xml_parser.namespaces["http://example.com/ns"] == "ex"
+    assert "http://example.com/ns" not in DEFAULT_NAMESPACES
+    assert "http://example.com/ns" not in XmlParser().namespaces
+    assert (
+        repr(XmlParser())
+        == f"<XmlParser(namespaces={len(DEFAULT_NAMESPACES)}, fields=None)>"
+    )
+    with pytest.raises(TypeError):
+        xml_parser.namespaces["http://example.com/other"] = "other"
+    with pytest.raises(TypeError):
+        DEFAULT_NAMESPACES["http://example.com/other"] = "other"
+
+
+def test_shared_parser():
+    """Test that parsers are shared by users of the same namespaces."""
+    parser = shared_parser({"http://example.com/ns": "ex"})
+    assert shared_parser({"http://example.com/ns": "ex"}) is parser
+    assert shared_parser() is shared_parser(None)
+    assert shared_parser() is not parser
+
+
+def test_shared_parser_threads():
+    """Test parsing with one parser in many threads."""
+    xml_parser = shared_parser()
+    documents = [
+        load_fixture_bytes(filename)
+        for filename in (
+            "generic_feed_1.xml",
+            "generic_feed_2.xml",
+            "generic_feed_3.xml",
+            "xml_parser_complex_1.xml",
+        )
+    ] * 8
+    expected = [
+        [item.geometries for item in XmlParser().parse(xml).entries]
+        for xml in documents
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        feeds = list(executor.map(xml_parser.parse, documents))
+    assert [[item.geometries for item in feed.entries] for feed in feeds] == expected
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "generic_feed_1.xml",
+        "xml_parser_complex_1.xml",
+        "xml_parser_complex_2.xml",
+        "xml_parser_geometries_1.xml",
+        "xml_parser_geometries_2.xml",
+    ],
+)
+def test_fields(filename):
+    """Test parsing only the projected fields of feed items."""
+    xml = load_fixture_bytes(filename)
+    expected = XmlParser().parse(xml)
+    xml_parser = XmlParser(fields=["title", "category"])
+    assert "title" in xml_parser.fields
+    assert "georss:point" in xml_parser.fields
+    feed = xml_parser.parse(xml)
+    # Metadata of the feed itself is not projected.
+    assert feed.title == expected.title
+    assert feed.ttl == expected.ttl
+    assert len(feed.entries) == len(expected.entries)
+    for item, expected_item in zip(feed.entries, expected.entries, strict=True):
+        assert item.guid == expected_item.guid
+        assert item.title == expected_item.title
+        assert item.category == expected_item.category
+        assert item.geometries == expected_item.geometries
+        assert item.published_date == expected_item.published_date
+        assert item.updated_date == expected_item.updated_date
+        assert item.description is None
+
+
+def test_fields_skip_subtree():
+    """Test that skipped elements leave no trace in the feed item."""
+    xml_parser = XmlParser(fields=["title"])
+    xml = (
+        "<rss version='2.0'><channel><item>Text"
+        "<description><p>Description <b>bold</b></p></description>"
+        "<title>Title 1</title>"
+        "<ex:extra xmlns:ex='http://example.com/ns'><ex:value>1</ex:value>"
+        "</ex:extra><guid>1</guid>"
+        "</item></channel></rss>"
+    )
+    feed = xml_parser.parse(xml)
+    assert feed.entries[0]._source == {  # noqa: SLF001
+        "#text": "Text",
+        "title": "Title 1",
+        "guid": "1",
+    }
+    assert shared_parser(fields=["title"]) is shared_parser(fields=("title",))
+    assert shared_parser(fields=["title"]) is not shared_parser()
+    assert repr(shared_parser(fields=[])).endswith(f"fields={len(xml_parser.fields)})>")
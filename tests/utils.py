@@ -8,3 +8,10 @@ def load_fixture(filename):
     path = os.path.join(os.path.dirname(__file__), "fixtures", filename)
     with open(path, encoding="utf-8") as fptr:
         return fptr.read()
+
+
+def load_fixture_bytes(filename):
+    """Load a fixture as raw bytes."""
+    path = os.path.join(os.path.dirname(__file__), "fixtures", filename)
+    with open(path, "rb") as fptr:
+        return fptr.read()